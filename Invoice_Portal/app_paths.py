@@ -0,0 +1,32 @@
+"""
+app_paths.py — The per-user data folder the app keeps its own files in:
+the updater's config, cache and log, instance.json, service.json, the
+cached card icons.
+
+Standard library only, and nothing else in here, so portal.py and
+single_instance.py can import it before anything that's allowed to fail
+— updater.py in particular, whose import the portal guards so an
+update-check problem never stops the app from opening.
+"""
+
+import os
+import sys
+
+
+def data_dir() -> str:
+    """Same persistent, per-user, always-writable directory used for the
+    airport database overrides — see airport_lookup.py's own comment on
+    why this location (not a PyInstaller temp extraction folder) is the
+    right choice for anything that needs to survive a restart."""
+    if sys.platform == "win32":
+        base = os.environ.get("APPDATA") or os.path.expanduser("~")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Application Support")
+    else:
+        base = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    d = os.path.join(base, "TravelWizards")
+    try:
+        os.makedirs(d, exist_ok=True)
+    except OSError:
+        pass
+    return d
@@ -0,0 +1,164 @@
+"""
+bench_adversarial.py — Hostile lines against state_parser, with a time
+budget per line.
+
+A garbled PDF page can come out of fitz as a handful of enormous lines —
+thousands of characters, mostly space padding, with a stray keyword here
+and there. Regexes shaped like "lazy text, whitespace, then an anchor"
+backtrack over every split of a long whitespace run, so one such line
+can cost seconds and one such file can hold a worker to its watchdog
+timeout. This builds lines aimed at exactly that (long space runs after
+each keyword a rule looks for, alternating letter/digit/space runs, dot
+leaders, repeated keywords), drives the parser into every state first
+so each state's rules see them, and times each line two ways:
+
+  rules   MAX_LINE_LEN lifted, lines of --length characters (default
+          5,000): every rule has to be linear in the line's length to
+          stay inside --budget-ms. A failure names the rule that took
+          the time, from parse_lines(profile=True).
+  guard   MAX_LINE_LEN in place, lines of --guard-length characters
+          (default 1,000,000): the long-line fast reject has to turn them
+          away inside the same budget.
+
+    python bench_adversarial.py
+    python bench_adversarial.py --check              exit 1 over budget
+    python bench_adversarial.py --length 20000 --budget-ms 50
+"""
+
+import os
+import sys
+import time
+import argparse
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+import state_parser                                  # noqa: E402
+
+LENGTH = 5000
+GUARD_LENGTH = 1_000_000
+BUDGET_MS = 25.0
+
+# Lines that put parse_lines() into each state before the hostile line
+PREAMBLES = {
+    "HEADER":    [],
+    "FLIGHT":    ["  ITIN NO: 1", "03 DEC 26 - THURSDAY",
+                  "  UNITED AIRLINES INC.      362   BUS/ FIRST XCPTNS"],
+    "CAR":       ["  ITIN NO: 1", "CAR RALEIGH/DURHAM HERTZ 1 INTERMED"],
+    "HOTEL":     ["  ITIN NO: 1", "03 DEC 26 - THURSDAY",
+                  "  HOTEL AVENIDA PALACE 01 NT/S - OUT 02JUN CONFIRMED"],
+    "CRUISE":    ["  ITIN NO: 1", "CRUISE ARRANGEMENTS"],
+    "TOUR":      ["  ITIN NO: 1", "03 DEC 26 - THURSDAY TOUR"],
+    "PACKAGE":   ["  ITIN NO: 1", "PACKAGE ARRANGEMENTS"],
+    "TICKETS":   ["  ITIN NO: 1", "TICKET NUMBER/S:"],
+    "FINANCIAL": ["  ITIN NO: 1", "AIR FARE USD 1.00"],
+    "BAGGAGE":   ["  ITIN NO: 1", "BAGGAGE ALLOWANCE"],
+}
+
+# What the rules anchor on — each gets a long space run, a long
+# letter/space run and a long digit/space run after it
+KEYWORDS = (
+    "", "AIR", "FLT:", "LV:", "AR:", "ARR:", "FREQ FLYER:", "HOTEL", "01 NT/S", "RATE-",
+    "GUARANTEE-", "PHONE", "FAX NO-", "FAX-", "CONFIRMATION-", "PICK UP-A", "DROP-A",
+    "PAYMENT BY", "USD", "AIR TICKET/S 12", "AB/C", "AB/C 0123456789", "**", "SHIP :",
+    "PORT :", "FLIGHT TIME -", "ELAPSED TIME-", "PER PERSON", "ROUNDTRIP FARE:",
+    "TOTAL COST OF", "APPROX TTL", "MEALS SERVED", "RESERVED SEATS SEAT-", "DATE:",
+    "SALES PERSON: A ITIN/INVOICE NO. 1", "FOR:", "TO:", "CAR", "03 DEC 26",
+)
+
+
+def hostile_lines(n: int) -> dict:
+    """{label: line} — every line about n characters long."""
+    lines = {}
+    for kw in KEYWORDS:
+        tag = kw or "bare"
+        lines[f"{tag} + spaces"] = f"  {kw} A" + " " * n + "Z"
+        lines[f"{tag} + 'A '"] = f"  {kw} " + "A " * (n // 2)
+        lines[f"{tag} + '1 '"] = f"  {kw} " + "1 " * (n // 2)
+        lines[f"{tag} + '1  '"] = f"  {kw} " + "1  " * (n // 3)
+    lines.update({
+        "padded airline": "  UNITED AIRLINES INC." + " " * (n // 2) + "362" + " " * (n // 2) + "X",
+        "padded hotel": "  WESTIN" + " " * (n // 2) + "02 NT/S" + " " * (n // 2) + "- OUT",
+        "dot leader": "  FARE" + "." * n,
+        "dots after TTL": "  APPROX TTL" + "." * n,
+        "letters": "  " + "A" * n,
+        "digits": "  " + "1" * n,
+        "slashes": "  " + "A/" * (n // 2),
+        "stars": "  **" + " *" * (n // 2),
+        "repeated PENALTY": "  " + "PENALTY " * (n // 8),
+        "repeated NT/S": "  H" + " 1 NT/S" * (n // 7),
+        "repeated USD": "  AB/C 0123456789" + " USD" * (n // 4),
+        "repeated colon": "  A:" * (n // 4),
+    })
+    return lines
+
+
+def time_line(preamble, line, repeat: int = 3) -> float:
+    """Seconds the hostile line adds to parsing preamble (best of repeat)."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        state_parser.parse_lines(preamble)
+        base = time.perf_counter() - started
+        started = time.perf_counter()
+        state_parser.parse_lines(preamble + [line])
+        best = min(best, time.perf_counter() - started - base)
+    return max(best, 0.0)
+
+
+def culprit(preamble, line) -> str:
+    profile = state_parser.parse_lines(preamble + [line], profile=True)["profile"]
+    slowest = max(profile["rules"], key=lambda r: r["seconds"])
+    return f"{slowest['seconds'] * 1000:.1f} ms in {slowest['pattern']}"
+
+
+def run_pass(name, length, budget, guard: bool) -> list:
+    """Time every (state, line); returns [(state, label, ms, why)] over budget."""
+    saved = state_parser.MAX_LINE_LEN
+    if not guard:
+        state_parser.MAX_LINE_LEN = float("inf")
+    over = []
+    worst = (0.0, "", "")
+    try:
+        lines = hostile_lines(length)
+        for state, preamble in PREAMBLES.items():
+            for label, line in lines.items():
+                ms = time_line(preamble, line, repeat=1 if guard else 3) * 1000
+                if ms > worst[0]:
+                    worst = (ms, state, label)
+                if ms > budget:
+                    over.append((state, label, ms, "" if guard else culprit(preamble, line)))
+        print(f"{name:<6}{len(lines) * len(PREAMBLES):>6} lines of {length:,} chars   "
+              f"worst {worst[0]:8.2f} ms ({worst[1]}, {worst[2]!r})   "
+              f"{len(over)} over {budget:g} ms")
+    finally:
+        state_parser.MAX_LINE_LEN = saved
+    return over
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Time state_parser on hostile lines.")
+    ap.add_argument("--length", type=int, default=LENGTH,
+                    help="line length for the rules pass (default: %(default)s)")
+    ap.add_argument("--guard-length", type=int, default=GUARD_LENGTH,
+                    help="line length for the guard pass (default: %(default)s)")
+    ap.add_argument("--budget-ms", type=float, default=BUDGET_MS,
+                    help="allowed milliseconds per line (default: %(default)s)")
+    ap.add_argument("--check", action="store_true", help="exit 1 if any line is over budget")
+    args = ap.parse_args(argv)
+
+    print(f"MAX_LINE_LEN = {state_parser.MAX_LINE_LEN}")
+    over = run_pass("rules", args.length, args.budget_ms, guard=False)
+    over += run_pass("guard", args.guard_length, args.budget_ms, guard=True)
+    for state, label, ms, why in sorted(over, key=lambda o: -o[2])[:40]:
+        print(f"  {ms:9.1f} ms  [{state}] {label!r}  {why}")
+    if args.check:
+        if over:
+            print(f"\nFAILED ({len(over)} line(s) over budget)")
+            return 1
+        print("\nOK — every hostile line within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,325 @@
+"""
+bench_airports.py — The airport lookup and search paths at world scale.
+
+The bundled database is a few hundred airports; a shop that has been
+adding every unknown airport for years, or that loads a full world list,
+could have tens of thousands of airports and aliases. This swaps
+airport_lookup's bundled tables for synthetic ones of that size — codes,
+"<City> Intl"-style names, and TRUNCATED aliases cut to the 23 characters
+the booking system prints ("SEATTLE/TACOMA INTERNAT") — plus an overrides
+file renaming, aliasing and removing a share of them, then times:
+
+  exact           lookup_airport() on a TRUNCATED key
+  prefix          lookup_airport() on a key that's only found by the
+                  first-8-characters fallback
+  miss            lookup_airport() on a key nothing matches
+  resolve         resolve_city() on a mix of the three
+  search          search_airports() for code, city, common and no-match
+                  substrings
+  matching        AirportManagerGUI._matching_codes(), the database
+                  editor's search box, with the same queries
+  add / alias     airport_resolver.add_airport() and link_alias() — load,
+                  save and reload the overrides file, the path the
+                  "unknown airport" prompt takes
+  reload          reload_overrides() on its own
+
+Each is reported as p50 / p95 / p99 / max per call. The last table shows
+how each operation's median grows from the smallest size to the largest
+as an exponent — ~0 is constant time, ~1 linear, 2 quadratic — and
+--check exits 1 if any grows faster than --max-exponent, so a change that
+makes the lookup path quietly go quadratic shows up here first.
+
+    python bench_airports.py
+    python bench_airports.py --sizes 1000 20000 60000 --aliases 3 --check
+
+The overrides file lives in a temporary folder (airport_lookup._data_dir
+is pointed at it for the run), so the real per-user file is never read
+or written. Sizes past 17,576 — every 3-letter code — continue with
+4-letter codes; add_airport only takes 3-letter ones, so its cycles stay
+on those.
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import random
+import shutil
+import string
+import argparse
+import itertools
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+import airport_lookup                                # noqa: E402
+import airport_resolver                              # noqa: E402
+from airport_manager import AirportManagerGUI        # noqa: E402
+
+SIZES = (500, 5000, 20000, 50000)
+ALIASES = 2               # TRUNCATED keys per airport
+OVERRIDE_SHARE = 0.05     # share of airports the overrides file touches
+SAMPLES = 2000            # timed calls per lookup kind
+SCAN_SAMPLES = 200        # timed calls per full-table operation
+CYCLES = 40               # add_airport / link_alias / reload rounds
+MAX_EXPONENT = 1.3        # --check: worst allowed growth of a median with size
+TRUNC_LEN = 23            # how many characters the booking system prints
+
+_SYLLABLES = ("AN", "BER", "CA", "DO", "EL", "FOR", "GA", "HAM", "IS", "JO", "KAL",
+              "LA", "MAR", "NOR", "O", "PAR", "QUI", "RO", "SAN", "TA", "UL", "VAL",
+              "WIN", "XI", "YOR", "ZA")
+_AIRPORT_WORDS = ("INTL", "INTERNATIONAL", "REGIONAL", "MUNICIPAL", "FIELD", "COUNTY",
+                  "METROPOLITAN", "AIRPORT", "NORTH", "SOUTH")
+
+
+# ---------------------------------------------------------------------------
+# Synthetic tables
+# ---------------------------------------------------------------------------
+def _codes(n: int, rng: random.Random) -> list:
+    three = ["".join(p) for p in itertools.product(string.ascii_uppercase, repeat=3)]
+    rng.shuffle(three)
+    if n <= len(three):
+        return three[:n]
+    four = itertools.product(string.ascii_uppercase, repeat=4)
+    return three + ["".join(p) for p in itertools.islice(four, n - len(three))]
+
+
+def make_tables(n: int, aliases: int = ALIASES, seed: int = 1):
+    """(iata, truncated) shaped like _BUILTIN_IATA / _BUILTIN_TRUNCATED,
+    with n airports and about n * aliases TRUNCATED keys."""
+    rng = random.Random(seed)
+    iata = {}
+    truncated = {}
+    for i, code in enumerate(_codes(n, rng)):
+        # The index keeps every city distinct without needing a retry loop
+        city = "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4)))
+        city = f"{city}{_SYLLABLES[i % len(_SYLLABLES)]} {i}"
+        words = rng.sample(_AIRPORT_WORDS, rng.randint(1, 3))
+        iata[code] = (f"{city.title()} {' '.join(w.title() for w in words)}", city.title())
+        truncated[city] = code
+        for _ in range(aliases - 1):
+            alias = f"{city}/{' '.join(rng.sample(_AIRPORT_WORDS, 3))}"[:TRUNC_LEN]
+            truncated[alias] = code
+    return iata, truncated
+
+
+def make_overrides(iata: dict, truncated: dict, share: float = OVERRIDE_SHARE,
+                   seed: int = 1) -> dict:
+    """An overrides file touching `share` of the airports: mostly renames
+    and extra aliases, a few removals — what years of the "unknown
+    airport" prompt and the database editor leave behind."""
+    rng = random.Random(seed + 1)
+    ov = airport_lookup._empty_overrides()
+    touched = rng.sample(sorted(iata), max(1, int(len(iata) * share)))
+    for i, code in enumerate(touched):
+        name, city = iata[code]
+        if i % 10 == 9:
+            ov["iata_removed"].append(code)
+            continue
+        ov["iata_updates"][code] = {"name": f"{name} (Renamed)", "city": city}
+        ov["truncated_updates"][f"{city.upper()}/ALIAS {i}"[:TRUNC_LEN]] = code
+    for key in rng.sample(sorted(truncated), max(1, len(truncated) // 100)):
+        ov["truncated_removed"].append(key)
+    return ov
+
+
+def install(iata, truncated, overrides) -> None:
+    """Make the synthetic tables the live ones, as if they were bundled."""
+    airport_lookup._BUILTIN_IATA = iata
+    airport_lookup._BUILTIN_TRUNCATED = truncated
+    if not airport_lookup.save_overrides(overrides):
+        raise OSError(f"could not write {airport_lookup.overrides_path()}")
+    airport_lookup.reload_overrides()
+
+
+# ---------------------------------------------------------------------------
+# Measuring
+# ---------------------------------------------------------------------------
+def percentiles(samples: list) -> dict:
+    ordered = sorted(samples)
+
+    def at(q):
+        return ordered[min(len(ordered) - 1, int(math.ceil(q * len(ordered))) - 1)]
+    return {"p50": at(0.50), "p95": at(0.95), "p99": at(0.99), "max": ordered[-1]}
+
+
+def sample(fn, args_list: list) -> list:
+    """Seconds per call, one call per entry of args_list."""
+    clock = time.perf_counter
+    out = []
+    for args in args_list:
+        started = clock()
+        fn(*args)
+        out.append(clock() - started)
+    return out
+
+
+def lookup_keys(rng: random.Random, count: int) -> dict:
+    """Keys for each lookup kind, drawn from the live (merged) tables."""
+    live = [k for k, code in airport_lookup.TRUNCATED.items() if code in airport_lookup.IATA]
+    exact = [rng.choice(live) for _ in range(count)]
+    # Not a key itself, but starts with some key's first 8 characters
+    prefix = []
+    while len(prefix) < count:
+        key = rng.choice(live)[:8] + " TERMINAL 9"
+        if key not in airport_lookup.TRUNCATED:
+            prefix.append(key)
+    # Synthetic keys are letters, digits, spaces and "/" — never "#"
+    miss = [f"#{i} NOWHERE/NO SUCH AIRPORT" for i in range(count)]
+    return {"exact": exact, "prefix": prefix, "miss": miss}
+
+
+def search_queries(rng: random.Random) -> list:
+    code = rng.choice(sorted(airport_lookup.IATA))
+    _, city = airport_lookup.IATA[code]
+    return [code.lower(), city.split()[0].lower()[:5], "intl", "xq#zz"]
+
+
+def _matcher():
+    """An AirportManagerGUI with just enough state for _matching_codes —
+    no Tk root, no window."""
+    class _Var:
+        value = ""
+
+        def get(self):
+            return self.value
+
+    gui = AirportManagerGUI.__new__(AirportManagerGUI)
+    gui.search_var = _Var()
+    gui.airports = gui._current_records()
+    return gui
+
+
+def bench_size(n: int, args, rng: random.Random) -> dict:
+    iata, truncated = make_tables(n, args.aliases, args.seed)
+    overrides = make_overrides(iata, truncated, args.override_share, args.seed)
+    install(iata, truncated, overrides)
+    ov_bytes = os.path.getsize(airport_lookup.overrides_path())
+    print(f"\n{n:,} airports, {len(airport_lookup.TRUNCATED):,} aliases live, "
+          f"overrides file {ov_bytes / 1024:,.0f} KB")
+
+    results = {}
+    keys = lookup_keys(rng, args.samples)
+    for kind in ("exact", "prefix", "miss"):
+        scan = kind != "exact"
+        chosen = keys[kind][:args.scan_samples] if scan else keys[kind]
+        results[kind] = sample(airport_lookup.lookup_airport, [(k,) for k in chosen])
+    mixed = [k for trio in zip(*keys.values()) for k in trio][:args.scan_samples]
+    results["resolve"] = sample(airport_lookup.resolve_city, [(k,) for k in mixed])
+
+    queries = search_queries(rng)
+    rounds = max(1, args.scan_samples // len(queries))
+    results["search"] = sample(airport_lookup.search_airports, [(q,) for q in queries] * rounds)
+
+    gui = _matcher()
+
+    def matching(query):
+        gui.search_var.value = query
+        return gui._matching_codes()
+    results["matching"] = sample(matching, [(q,) for q in queries] * max(1, rounds // 4))
+
+    three = [c for c in iata if len(c) == 3]
+    adds, aliases = [], []
+    for i in range(args.cycles):
+        code = rng.choice(three)
+        adds.append((code, f"Bench Field {i}", f"Bench City {i}", f"BENCH CITY {i}"))
+        aliases.append((code, f"BENCH ALIAS {i}/{code}"))
+    results["add"] = sample(airport_resolver.add_airport, adds)
+    results["alias"] = sample(airport_resolver.link_alias, aliases)
+    results["reload"] = sample(airport_lookup.reload_overrides, [()] * args.cycles)
+
+    print(f"  {'operation':<10}{'calls':>7}{'p50':>11}{'p95':>11}{'p99':>11}{'max':>11}")
+    summary = {}
+    for op, samples in results.items():
+        pct = percentiles(samples)
+        summary[op] = {k: round(v * 1e6, 2) for k, v in pct.items()}
+        summary[op]["calls"] = len(samples)
+        print(f"  {op:<10}{len(samples):>7}" + "".join(f"{_us(pct[k]):>11}" for k in pct))
+    return summary
+
+
+def _us(seconds: float) -> str:
+    if seconds >= 0.1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.1f} µs"
+
+
+def growth(by_size: dict) -> dict:
+    """Per operation, the exponent k in p50 ∝ size**k between the smallest
+    and the largest size."""
+    small, large = min(by_size), max(by_size)
+    if small == large:
+        return {}
+    out = {}
+    for op in by_size[small]:
+        a = max(by_size[small][op]["p50"], 0.01)
+        b = max(by_size[large][op]["p50"], 0.01)
+        out[op] = math.log(b / a) / math.log(large / small)
+    return out
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark airport lookup and search at scale.")
+    ap.add_argument("--sizes", type=int, nargs="+", default=list(SIZES),
+                    help="airports per synthetic table (default: %(default)s)")
+    ap.add_argument("--aliases", type=int, default=ALIASES,
+                    help="TRUNCATED keys per airport (default: %(default)s)")
+    ap.add_argument("--override-share", type=float, default=OVERRIDE_SHARE,
+                    help="share of airports the overrides file touches (default: %(default)s)")
+    ap.add_argument("--samples", type=int, default=SAMPLES,
+                    help="calls per exact-hit lookup run (default: %(default)s)")
+    ap.add_argument("--scan-samples", type=int, default=SCAN_SAMPLES,
+                    help="calls per full-table operation (default: %(default)s)")
+    ap.add_argument("--cycles", type=int, default=CYCLES,
+                    help="override write/reload rounds (default: %(default)s)")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--check", action="store_true",
+                    help="exit 1 if any median grows faster than --max-exponent")
+    ap.add_argument("--max-exponent", type=float, default=MAX_EXPONENT)
+    ap.add_argument("--json", help="also write the results to this file")
+    args = ap.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="tw_airports_bench_")
+    real_data_dir = airport_lookup._data_dir
+    airport_lookup._data_dir = lambda: workdir
+    rng = random.Random(args.seed)
+    by_size = {}
+    try:
+        for n in sorted(set(args.sizes)):
+            by_size[n] = bench_size(n, args, rng)
+    finally:
+        airport_lookup._data_dir = real_data_dir
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    exponents = growth(by_size)
+    failures = []
+    if exponents:
+        print(f"\nGrowth of the median, {min(by_size):,} → {max(by_size):,} airports "
+              f"(0 constant, 1 linear, 2 quadratic):")
+        for op, k in exponents.items():
+            flag = ""
+            if k > args.max_exponent:
+                flag = "  ← superlinear"
+                failures.append(f"{op}: exponent {k:.2f} > {args.max_exponent}")
+            print(f"  {op:<10}{k:>6.2f}{flag}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"params": vars(args), "microseconds": by_size,
+                       "growth": exponents}, f, indent=1)
+    if args.check:
+        if failures:
+            print(f"\nFAILED ({len(failures)}):")
+            for f in failures:
+                print(f"  {f}")
+            return 1
+        print("\nOK — every operation within the growth limit")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
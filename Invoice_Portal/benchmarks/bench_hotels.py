@@ -0,0 +1,255 @@
+"""
+bench_hotels.py — Where the hotel-invoice batch spends its time.
+
+Synthesizes Hotels report workbooks shaped like the real export — title
+block, a header row with Date / Account / Invoice / Traveler / Itinerary
+/ Total / Comm / Depart, "R T H P" data rows whose hotel names overflow
+the Itinerary column into the blank ones after it, a Grand Total row,
+and extra sheets after the first — from 40 to 5,000 data rows. Then
+times each piece of the batch separately:
+
+  read_excel      pandas reading sheet 0 alone (what load_hotels_data
+                  pays before it looks at a single row)
+  load            load_hotels_data() as a whole
+  fill            fill_invoice() per row — and, to tell openpyxl apart
+                  from everything else, load_workbook() and save() of
+                  the template on their own
+  flow            generate_invoices(), the headless HotelInvoiceGUI._process
+  export          invoice_pdf.build_pdf() per filled invoice, the
+                  editor's PDF export
+
+and reports rows/sec, peak Python memory per step (tracemalloc, in a
+separate untimed pass) and file sizes.
+
+Note load_hotels_data() only takes the 39 rows right after the header
+(Excel rows 9–47 of the real report — the rows after that are totals).
+Past 39 rows, a bigger report only changes what reading it costs, not
+how many invoices come out; the report says so in its "parsed" column.
+
+    python bench_hotels.py
+    python bench_hotels.py --sizes 40 5000 --fill-rows 100 --keep
+"""
+
+import os
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+import statistics
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from openpyxl import Workbook, load_workbook         # noqa: E402
+
+from hotel_invoice_processor import (               # noqa: E402
+    load_hotels_data, fill_invoice, generate_invoices, TEMPLATES,
+)
+
+SIZES = (40, 200, 1000, 5000)
+HEADER_ROW = 8            # Excel row of the column headers, as in the real report
+EXTRA_SHEETS = ("Air", "Summary")
+TEMPLATE = next(iter(TEMPLATES.values()))
+
+_HOTEL_WORDS = ("HOTEL", "GRAND", "PALACE", "MARRIOTT", "WESTIN", "RESORT", "AND", "SPA",
+                "LISBOA", "DOWNTOWN", "INTERCONTINENTAL", "PORTO", "HARBOR", "VIEW")
+_SURNAMES = ("WHEELER", "MORENO", "SMITH", "LIN", "OKAFOR", "NAKAMURA", "BERGSTROM",
+             "DUBOIS", "PATEL", "KOWALSKI")
+_FIRST = ("JOHN", "MARIA", "JANE", "RICHARD", "AKIKO", "LARS", "AMARA", "PIOTR")
+
+
+# ---------------------------------------------------------------------------
+# Synthetic Hotels report
+# ---------------------------------------------------------------------------
+def make_hotels_report(path: str, rows: int, overflow_share: float = 0.4,
+                       seed: int = 1) -> str:
+    """Write a Hotels-report-shaped workbook with rows data rows."""
+    rng = random.Random(seed)
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Hotels"
+    ws.cell(1, 1, "TRAVEL WIZARDS, INC.")
+    ws.cell(2, 1, "Hotels Commission Report")
+    ws.cell(3, 1, "01/01/26 - 01/31/26")
+    headers = ["Date", "Account", "Invoice", "Traveler", "Itinerary", None, None, None,
+               "Total", "Comm", "Depart"]
+    for ci, h in enumerate(headers, 1):
+        if h:
+            ws.cell(HEADER_ROW, ci, h)
+
+    for i in range(rows):
+        r = HEADER_ROW + 1 + i
+        day = i % 28 + 1
+        agent = rng.choice(("AB", "JK", "MT", "RS"))
+        ws.cell(r, 1, f"R T H P  01/{day:02d}/26  {agent}")
+        if rng.random() < 0.5:
+            ws.cell(r, 2, agent)
+        ws.cell(r, 3, f"{rng.randint(1, 99999):07d}")
+        ws.cell(r, 4, f"{rng.choice(_SURNAMES)}/{rng.choice(_FIRST)}")
+        name = " ".join(rng.choice(_HOTEL_WORDS) for _ in range(rng.randint(2, 9)))
+        if rng.random() < overflow_share:
+            # The export wraps long names into the next blank columns
+            words = name.split()
+            chunks = [" ".join(words[j:j + 3]) for j in range(0, len(words), 3)][:4]
+        else:
+            chunks = [name]
+        for j, chunk in enumerate(chunks):
+            ws.cell(r, 5 + j, chunk)
+        total = round(rng.uniform(150, 6000), 2)
+        ws.cell(r, 9, total)
+        ws.cell(r, 10, round(total * 0.1, 2))
+        ws.cell(r, 11, f"01/{min(28, day + rng.randint(1, 6)):02d}/26")
+    ws.cell(HEADER_ROW + rows + 2, 1, "Grand Total")
+
+    for title in EXTRA_SHEETS:
+        extra = wb.create_sheet(title)
+        for i in range(rows):
+            extra.cell(i + 1, 1, f"{title} row {i + 1}")
+            extra.cell(i + 1, 2, round(rng.uniform(10, 900), 2))
+    wb.save(path)
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Measuring
+# ---------------------------------------------------------------------------
+def timed(fn, *args, **kwargs):
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - started, result
+
+
+def peak_mb(fn, *args, **kwargs) -> float:
+    """Peak Python allocation while fn runs, in MB (untimed pass)."""
+    tracemalloc.start()
+    try:
+        fn(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def _ms(seconds):
+    return f"{seconds * 1000:9.1f} ms"
+
+
+def bench_load(workdir, sizes, seed):
+    import pandas as pd
+    print(f"\n{'rows':>6}{'file KB':>9}{'read_excel':>13}{'load':>13}{'parsed':>8}"
+          f"{'rows/sec':>11}{'peak MB':>9}")
+    reports = {}
+    for n in sizes:
+        path = make_hotels_report(os.path.join(workdir, f"hotels_{n}.xlsx"), n, seed=seed)
+        reports[n] = path
+        t_read, _ = timed(pd.read_excel, path, sheet_name=0, header=None)
+        t_load, df = timed(load_hotels_data, path)
+        mem = peak_mb(load_hotels_data, path)
+        print(f"{n:>6}{os.path.getsize(path) / 1024:>9.0f}{_ms(t_read):>13}{_ms(t_load):>13}"
+              f"{len(df):>8}{n / t_load:>11,.0f}{mem:>9.1f}")
+    return reports
+
+
+def bench_fill(workdir, report_path, fill_rows):
+    rows = load_hotels_data(report_path).to_dict("records")
+    out_dir = os.path.join(workdir, "fill")
+    os.makedirs(out_dir, exist_ok=True)
+    times = []
+    sizes = []
+    for i in range(fill_rows):
+        out = os.path.join(out_dir, f"{i}.xlsx")
+        t, _ = timed(fill_invoice, TEMPLATE, rows[i % len(rows)], out)
+        times.append(t)
+        sizes.append(os.path.getsize(out))
+    mem = peak_mb(fill_invoice, TEMPLATE, rows[0], os.path.join(out_dir, "mem.xlsx"))
+
+    # openpyxl's share: the template load and save on their own
+    loads, saves = [], []
+    for i in range(min(fill_rows, 20)):
+        t, wb = timed(load_workbook, TEMPLATE)
+        loads.append(t)
+        t, _ = timed(wb.save, os.path.join(out_dir, f"save_{i}.xlsx"))
+        saves.append(t)
+
+    mean = statistics.mean(times)
+    print(f"\nfill_invoice × {fill_rows}:  mean {_ms(mean).strip()}, "
+          f"p50 {_ms(statistics.median(times)).strip()}, "
+          f"p95 {_ms(sorted(times)[int(len(times) * 0.95) - 1]).strip()}, "
+          f"{1 / mean:,.1f} rows/sec, peak {mem:.1f} MB, "
+          f"output {statistics.mean(sizes) / 1024:.1f} KB each")
+    print(f"  of which openpyxl: load_workbook {_ms(statistics.mean(loads)).strip()}, "
+          f"save {_ms(statistics.mean(saves)).strip()} "
+          f"({(statistics.mean(loads) + statistics.mean(saves)) / mean:.0%} of a fill)")
+
+
+def bench_flow(workdir, report_path):
+    out_dir = os.path.join(workdir, "flow")
+    shutil.rmtree(out_dir, ignore_errors=True)
+    t, summary = timed(generate_invoices, report_path, TEMPLATE, out_dir)
+    out_bytes = sum(os.path.getsize(p) for p in summary["outputs"])
+    shutil.rmtree(out_dir, ignore_errors=True)
+    mem = peak_mb(generate_invoices, report_path, TEMPLATE, out_dir)
+    rate = summary["successful"] / t if t else 0
+    print(f"\ngenerate_invoices ({os.path.basename(report_path)}): {t:.2f} s for "
+          f"{summary['successful']} invoices ({rate:,.1f} rows/sec), "
+          f"peak {mem:.1f} MB, output {out_bytes / 1024:.0f} KB")
+    return summary["outputs"]
+
+
+def bench_export(workdir, xlsx_paths):
+    from hotel_invoice_editor import read_fields, _asset
+    from invoice_pdf import build_pdf
+    overlay = _asset("overlay.pdf")
+    out_dir = os.path.join(workdir, "pdf")
+    os.makedirs(out_dir, exist_ok=True)
+    reads, builds, sizes = [], [], []
+    for i, path in enumerate(xlsx_paths):
+        t, fields = timed(read_fields, path)
+        reads.append(t)
+        out = os.path.join(out_dir, f"{i}.pdf")
+        t, _ = timed(build_pdf, fields, overlay, out)
+        builds.append(t)
+        sizes.append(os.path.getsize(out))
+    if not builds:
+        return
+    mem = peak_mb(build_pdf, read_fields(xlsx_paths[0]), overlay, os.path.join(out_dir, "mem.pdf"))
+    # The first build registers fonts; report it apart from the steady state
+    steady = builds[1:] or builds
+    print(f"\nbuild_pdf × {len(builds)}:  first {_ms(builds[0]).strip()}, then mean "
+          f"{_ms(statistics.mean(steady)).strip()} ({1 / statistics.mean(steady):,.1f}/sec); "
+          f"read_fields {_ms(statistics.mean(reads)).strip()}; peak {mem:.1f} MB, "
+          f"{statistics.mean(sizes) / 1024:.1f} KB each")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark the hotel invoice batch.")
+    ap.add_argument("--sizes", type=int, nargs="+", default=list(SIZES),
+                    help="data rows per synthetic report (default: %(default)s)")
+    ap.add_argument("--fill-rows", type=int, default=40,
+                    help="fill_invoice calls to time (default: %(default)s)")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--keep", action="store_true", help="keep the work folder")
+    args = ap.parse_args(argv)
+
+    if not os.path.exists(TEMPLATE):
+        print(f"Template not found: {TEMPLATE}")
+        return 1
+    workdir = tempfile.mkdtemp(prefix="tw_hotels_bench_")
+    try:
+        reports = bench_load(workdir, args.sizes, args.seed)
+        smallest = reports[min(reports)]
+        bench_fill(workdir, smallest, args.fill_rows)
+        outputs = bench_flow(workdir, smallest)
+        bench_export(workdir, outputs)
+    finally:
+        if args.keep:
+            print(f"\nWork folder kept: {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""
+bench_parser.py — Throughput and output regression checks for
+state_parser, on the synthetic invoices from invoice_fixtures.py.
+
+Feeds each fixture's lines straight to state_parser.parse_lines() — no
+PDF, no fitz — so the numbers are the parser engine alone. For every
+fixture (ITIN and TIPITIN, 1 to 50 pages) it reports lines/sec and
+invoices/sec, best of --repeat timed rounds.
+
+    python bench_parser.py                   report only
+    python bench_parser.py --check           also compare against the
+                                             golden outputs and the saved
+                                             baseline, and the page-by-page
+                                             parse against the whole-list
+                                             one; exit 1 on any output
+                                             change or a throughput drop
+                                             past --tolerance
+    python bench_parser.py --save-baseline   record this machine's numbers
+                                             as parser_baseline.json
+    python bench_parser.py --update-golden   rewrite golden/*.json — only
+                                             after a parser change whose
+                                             new output you've reviewed
+    python bench_parser.py --profile         also print state_parser's
+                                             per-rule profile over all the
+                                             fixtures (untimed pass)
+
+The golden outputs are committed; the baseline isn't (throughput depends
+on the machine), so save one before the change you want to measure and
+--check after it.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from state_parser import (                           # noqa: E402
+    parse_lines, parse_pages, merge_profiles, format_profile,
+)
+from invoice_fixtures import fixtures, SIZES        # noqa: E402
+from invoice_records import json_default            # noqa: E402
+
+GOLDEN_DIR = os.path.join(HERE, "golden")
+BASELINE_PATH = os.path.join(HERE, "parser_baseline.json")
+TOLERANCE = 0.25     # a fixture this much slower than its baseline fails --check
+MIN_SECONDS = 0.2    # each timed round parses a fixture until at least this long
+
+
+def _normalized(data: dict):
+    """The parser's output as JSON would store it (tuples become lists,
+    records become the dicts they stand in for)."""
+    return json.loads(json.dumps(data, default=json_default))
+
+
+def _golden_path(name):
+    return os.path.join(GOLDEN_DIR, f"{name}.json")
+
+
+def time_fixture(lines, repeat: int) -> float:
+    """Best seconds per parse over repeat rounds."""
+    parse_lines(lines)                    # warm the re module's cache
+    n = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(n):
+            parse_lines(lines)
+        if time.perf_counter() - start >= MIN_SECONDS:
+            break
+        n *= 2
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(n):
+            parse_lines(lines)
+        best = min(best, (time.perf_counter() - start) / n)
+    return best
+
+
+def as_pages(lines) -> list:
+    """The fixture's lines back as page texts, split where each "PAGE:"
+    line starts a new page — what parse() would get from get_text()."""
+    pages = [[]]
+    for line in lines:
+        if line.startswith("PAGE:"):
+            pages.append([])
+        pages[-1].append(line)
+    return ["\n".join(page) for page in pages]
+
+
+def check_streaming(lines) -> list:
+    """parse_pages() over the fixture's pages, one at a time, must give
+    exactly what parse_lines() gives over the whole list; header_only
+    must stop with the same header."""
+    problems = []
+    whole = _normalized(parse_lines(lines))
+    streamed = _normalized(parse_pages(iter(as_pages(lines))))
+    for key in sorted(set(whole) | set(streamed)):
+        if whole.get(key) != streamed.get(key):
+            problems.append(f"streaming: '{key}' differs from the whole-list parse")
+    header = parse_pages(iter(as_pages(lines)), header_only=True)
+    for key in ("format", "passengers", "mailing_address", "booking"):
+        if _normalized(header[key]) != whole[key]:
+            problems.append(f"header_only: '{key}' differs from the full parse")
+    return problems
+
+
+def check_golden(name, lines) -> list:
+    """Differences between today's output and the stored one, as
+    readable strings (empty = identical)."""
+    path = _golden_path(name)
+    if not os.path.exists(path):
+        return [f"no golden output ({os.path.relpath(path, HERE)}) — run --update-golden"]
+    with open(path, "r", encoding="utf-8") as f:
+        expected = json.load(f)
+    actual = _normalized(parse_lines(lines))
+    problems = []
+    for key in sorted(set(expected) | set(actual)):
+        if expected.get(key) != actual.get(key):
+            problems.append(f"'{key}' changed: expected {json.dumps(expected.get(key))[:120]} "
+                            f"got {json.dumps(actual.get(key))[:120]}")
+    return problems
+
+
+def write_golden(name, lines):
+    os.makedirs(GOLDEN_DIR, exist_ok=True)
+    path = _golden_path(name)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(_normalized(parse_lines(lines)), f, indent=1, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--check", action="store_true",
+                    help="fail on golden-output changes or throughput regressions")
+    ap.add_argument("--save-baseline", action="store_true")
+    ap.add_argument("--update-golden", action="store_true")
+    ap.add_argument("--tolerance", type=float, default=TOLERANCE,
+                    help=f"allowed slowdown vs baseline (default {TOLERANCE:.0%}%)")
+    ap.add_argument("--profile", action="store_true",
+                    help="print the per-rule profile over every fixture")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--sizes", type=int, nargs="+", default=list(SIZES),
+                    help="page counts to run (default: %(default)s)")
+    args = ap.parse_args(argv)
+
+    baseline = {}
+    if args.check and os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    failures = []
+    results = {}
+    profile = None
+    print(f"{'fixture':<14}{'lines':>7}{'ms/invoice':>12}{'lines/sec':>12}"
+          f"{'invoices/sec':>14}{'vs baseline':>13}")
+    for name, fmt, pages, lines in fixtures(args.sizes):
+        if args.update_golden:
+            write_golden(name, lines)
+        seconds = time_fixture(lines, args.repeat)
+        lines_per_sec = len(lines) / seconds
+        results[name] = {"lines": len(lines), "lines_per_sec": round(lines_per_sec, 1)}
+
+        versus = ""
+        if name in baseline:
+            ratio = lines_per_sec / baseline[name]["lines_per_sec"]
+            versus = f"{ratio:.0%}"
+            if ratio < 1 - args.tolerance:
+                failures.append(f"{name}: {lines_per_sec:,.0f} lines/sec is {1 - ratio:.0%} "
+                                f"below the baseline's {baseline[name]['lines_per_sec']:,.0f}")
+        print(f"{name:<14}{len(lines):>7}{seconds * 1000:>12.2f}{lines_per_sec:>12,.0f}"
+              f"{1 / seconds:>14,.1f}{versus:>13}")
+
+        if args.check:
+            for problem in check_golden(name, lines) + check_streaming(lines):
+                failures.append(f"{name}: {problem}")
+        if args.profile:
+            profile = merge_profiles(profile, parse_lines(lines, profile=True)["profile"], name)
+
+    if profile:
+        print("\n" + format_profile(profile))
+    if args.update_golden:
+        print(f"\nGolden outputs written to {os.path.relpath(GOLDEN_DIR)}")
+    if args.save_baseline:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=1, sort_keys=True)
+        print(f"\nBaseline saved to {os.path.relpath(BASELINE_PATH)}")
+    if args.check:
+        if not baseline:
+            print("\n(no parser_baseline.json — throughput not checked; run --save-baseline first)")
+        if failures:
+            print(f"\nFAILED ({len(failures)}):")
+            for f in failures:
+                print(f"  {f}")
+            return 1
+        print("\nOK — outputs match golden/" + (", throughput within tolerance" if baseline else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+bench_pipeline.py — The customer-invoice batch end to end, over a
+synthetic corpus, with numbers.
+
+Builds (or reuses) a corpus with invoice_corpus.py, clears any earlier
+run's output folders, then runs invoice_pipeline.run_batch() over it —
+the same call PDFRenamerGUI._process_pdfs makes, minus the window (no
+airport prompts: unknown airports render as their fallback name, as they
+do when nobody answers). Reports:
+
+  * wall time and files/sec
+  * per-stage time (run_batch's stage_seconds — read wait, worker start,
+    analyze, airports, render, write wait, drain, writer-thread time)
+  * peak RSS of this process and of the largest worker process
+  * output bytes, and the batch's own ok / problem counts
+
+    python bench_pipeline.py --count 100
+    python bench_pipeline.py --count 10000 --corpus D:/bench/corpus --profile plain
+    python bench_pipeline.py --count 1000 --no-isolate --json run.json
+    python bench_pipeline.py --count 500 --bulk
+
+--bulk concatenates the corpus into one export PDF (in a "_bulk" folder
+next to the corpus) and runs the batch on that single file instead, so
+invoice_splitter has to find every invoice in it — the result should
+match the per-file run's, with the cutting under the "split" stage.
+
+Point --corpus at a folder on the SMB share to measure the share; the
+default is a folder under the system temp directory.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+import invoice_pipeline                                   # noqa: E402
+from invoice_processor import PROFILE_LABELS, PROFILE_BOTH  # noqa: E402
+from invoice_corpus import make_corpus                    # noqa: E402
+
+
+def peak_rss_mb():
+    """(this process, largest reaped child) peak resident memory in MB;
+    None where the platform can't say."""
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+            return psutil.Process().memory_info().peak_wset / 2**20, None
+        except (ImportError, AttributeError):
+            return None, None
+    # ru_maxrss is kilobytes on Linux, bytes on macOS
+    unit = 1 if sys.platform == "darwin" else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit / 2**20
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * unit / 2**20
+    return own, children
+
+
+def clear_outputs(folder):
+    for name in (invoice_pipeline.STYLED_FOLDER, invoice_pipeline.PLAIN_FOLDER,
+                 invoice_pipeline.ERRORED_FOLDER):
+        shutil.rmtree(os.path.join(folder, name), ignore_errors=True)
+
+
+def make_bulk(corpus, names) -> str:
+    """One PDF holding every corpus file in order, in a sibling folder;
+    returns that folder."""
+    import fitz
+    folder = corpus.rstrip("/\\") + "_bulk"
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, "export.pdf")
+    if not os.path.exists(path):
+        with fitz.open() as out:
+            for name in names:
+                with fitz.open(os.path.join(corpus, name)) as doc:
+                    out.insert_pdf(doc)
+            out.save(path + ".tmp", garbage=3, deflate=True)
+        os.replace(path + ".tmp", path)
+    return folder
+
+
+def run(args) -> dict:
+    corpus = args.corpus or os.path.join(
+        tempfile.gettempdir(), f"tw_corpus_{args.count}_{args.seed}")
+    print(f"Corpus: {corpus}")
+    started = time.perf_counter()
+    manifest = make_corpus(corpus, args.count, args.days, args.itin_share,
+                           args.mix, args.seed)
+    print(f"  {len(manifest['files'])} PDFs, {manifest['total_pages']} pages, "
+          f"{manifest['total_bytes'] / 1e6:.1f} MB "
+          f"(ready in {time.perf_counter() - started:.1f} s)")
+    clear_outputs(corpus)
+
+    files = [e["name"] for e in manifest["files"]]
+    if args.bulk:
+        started = time.perf_counter()
+        corpus = make_bulk(corpus, files)
+        clear_outputs(corpus)
+        files = ["export.pdf"]
+        print(f"Bulk export: {os.path.join(corpus, files[0])} "
+              f"(ready in {time.perf_counter() - started:.1f} s)")
+    print(f"Running: profile={args.profile} isolate={not args.no_isolate} "
+          f"read_ahead={args.read_ahead} max_pending_writes={args.max_pending_writes}")
+    started = time.perf_counter()
+    summary = invoice_pipeline.run_batch(
+        corpus, args.profile, log=print if args.verbose else None, files=files,
+        read_ahead=args.read_ahead, max_pending_writes=args.max_pending_writes,
+        isolate=not args.no_isolate, recycle_after=args.recycle_after)
+    wall = time.perf_counter() - started
+    own_mb, child_mb = peak_rss_mb()
+    if args.no_isolate:
+        child_mb = None
+
+    result = {
+        "params": manifest["params"], "profile": args.profile,
+        "isolate": not args.no_isolate, "bulk": args.bulk, "files": summary["total"],
+        "pages": manifest["total_pages"], "input_bytes": manifest["total_bytes"],
+        "wall_seconds": round(wall, 3), "files_per_sec": round(summary["total"] / wall, 2),
+        "stage_seconds": {k: round(v, 3) for k, v in summary["stage_seconds"].items()},
+        "peak_rss_mb": round(own_mb, 1) if own_mb is not None else None,
+        "peak_worker_rss_mb": round(child_mb, 1) if child_mb is not None else None,
+        "output_bytes": summary["bytes_written"],
+        "successful": summary["successful"], "failed": summary["failed"],
+        "unknown_variant": summary["unknown_variant"],
+        "write_failures": len(summary["write_failures"]),
+    }
+
+    print(f"\nWall time      {wall:10.2f} s   ({result['files_per_sec']:.1f} files/sec)")
+    print("Stages (seconds; 'writing' runs alongside the rest):")
+    for stage, seconds in summary["stage_seconds"].items():
+        share = f"{seconds / wall:6.1%}" if wall else ""
+        print(f"  {stage:<13}{seconds:10.2f}   {share}")
+    if own_mb is not None:
+        worker = f", worker {child_mb:.0f} MB" if child_mb else ""
+        print(f"Peak RSS       {own_mb:10.0f} MB (this process{worker})")
+    print(f"Output         {summary['bytes_written'] / 1e6:10.1f} MB")
+    print(f"Result         {summary['successful']} ok, {summary['failed']} problem(s), "
+          f"{summary['unknown_variant']} unknown variant(s), "
+          f"{len(summary['write_failures'])} write failure(s)")
+    if not args.keep_outputs:
+        clear_outputs(corpus)
+    return result
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark invoice_pipeline.run_batch on a synthetic corpus.")
+    ap.add_argument("--count", type=int, default=100, help="corpus size (100 to 10,000 is typical)")
+    ap.add_argument("--corpus", help="corpus folder (default: under the temp directory)")
+    ap.add_argument("--days", default="1-8")
+    ap.add_argument("--itin-share", type=float, default=0.5)
+    ap.add_argument("--mix", default="")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--profile", default=PROFILE_BOTH, choices=list(PROFILE_LABELS))
+    ap.add_argument("--no-isolate", action="store_true")
+    ap.add_argument("--bulk", action="store_true",
+                    help="run on the whole corpus concatenated into one export PDF")
+    ap.add_argument("--recycle-after", type=int, default=invoice_pipeline.RECYCLE_AFTER)
+    ap.add_argument("--read-ahead", type=int, default=invoice_pipeline.READ_AHEAD)
+    ap.add_argument("--max-pending-writes", type=int, default=invoice_pipeline.MAX_PENDING_WRITES)
+    ap.add_argument("--keep-outputs", action="store_true",
+                    help="leave the processed_*/errored_invoices folders for inspection")
+    ap.add_argument("--json", help="also write the results to this file")
+    ap.add_argument("--verbose", action="store_true", help="print the batch log")
+    args = ap.parse_args(argv)
+
+    result = run(args)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=1)
+    return 1 if result["write_failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
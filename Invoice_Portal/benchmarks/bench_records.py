@@ -0,0 +1,90 @@
+"""
+bench_records.py — What a batch's parsed data costs to hold and to ship
+between processes, as invoice_records vs. the plain dicts they replace.
+
+Parses --count synthetic invoices (invoice_fixtures.py, alternating
+TIPITIN and ITIN, --pages pages each) and keeps every result, the way a
+batch's summary and the GUI's review list do. Then, for the records as
+parsed and for the same results run through invoice_records.to_plain():
+
+  memory    Python memory the kept results hold (tracemalloc)
+  pickle    bytes per invoice and dumps/loads time — what the pipeline's
+            worker pays to send an analysis back to the parent
+  json      json.dumps() time, as processing_service sends a /parse
+
+    python bench_records.py
+    python bench_records.py --count 2000 --pages 20
+"""
+
+import os
+import sys
+import gc
+import json
+import time
+import pickle
+import argparse
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from state_parser import parse_lines                # noqa: E402
+from invoice_fixtures import make_invoice, FORMATS  # noqa: E402
+from invoice_records import to_plain, json_default  # noqa: E402
+
+
+def held_mb(build) -> tuple:
+    """(result, MB of Python memory still allocated once build() returns)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        gc.collect()
+        return result, tracemalloc.get_traced_memory()[0] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def best_of(fn, repeat=3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Memory and pickle cost of parsed invoices.")
+    ap.add_argument("--count", type=int, default=500, help="invoices to keep (default: %(default)s)")
+    ap.add_argument("--pages", type=int, default=5, help="pages per invoice (default: %(default)s)")
+    args = ap.parse_args(argv)
+
+    texts = [make_invoice(FORMATS[i % len(FORMATS)], args.pages) for i in range(len(FORMATS))]
+    records, rec_mb = held_mb(lambda: [parse_lines(texts[i % len(texts)])
+                                       for i in range(args.count)])
+    plain, plain_mb = held_mb(lambda: [to_plain(parse_lines(texts[i % len(texts)]))
+                                       for i in range(args.count)])
+    segments = sum(len(d[k]) for d in records
+                   for k in ("passengers", "flights", "cars", "hotels", "cruises",
+                             "packages", "tours", "tickets"))
+    print(f"{args.count} invoices × {args.pages} pages, {segments:,} segment records\n")
+    print(f"{'':<9}{'held MB':>9}{'pickle KB/inv':>15}{'dumps ms':>10}{'loads ms':>10}"
+          f"{'json ms':>9}")
+    for name, batch, mb in (("records", records, rec_mb), ("dicts", plain, plain_mb)):
+        blob = pickle.dumps(batch, protocol=pickle.HIGHEST_PROTOCOL)
+        dumps = best_of(lambda: pickle.dumps(batch, protocol=pickle.HIGHEST_PROTOCOL))
+        loads = best_of(lambda: pickle.loads(blob))
+        js = best_of(lambda: json.dumps(batch, default=json_default), repeat=1)
+        print(f"{name:<9}{mb:>9.1f}{len(blob) / args.count / 1024:>15.1f}"
+              f"{dumps * 1000:>10.1f}{loads * 1000:>10.1f}{js * 1000:>9.1f}")
+    # The per-file message the worker actually sends: one analysis at a time
+    one_rec = len(pickle.dumps(records[0], protocol=pickle.HIGHEST_PROTOCOL))
+    one_plain = len(pickle.dumps(plain[0], protocol=pickle.HIGHEST_PROTOCOL))
+    print(f"\none invoice on its own: {one_rec / 1024:.1f} KB as records, "
+          f"{one_plain / 1024:.1f} KB as dicts")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""
+invoice_corpus.py — A folder of synthetic invoice PDFs, for benchmarking
+the whole customer-invoice pipeline at month-end volumes.
+
+Each PDF is an invoice_fixtures.py line stream typeset with ReportLab the
+way the booking system prints them — fixed-width Courier, one text line
+per printed line, column spacing kept — so fitz extracts the same lines
+back and detect_format / extract_fields / state_parser all treat the file
+like a real one. No client PDFs needed.
+
+What varies per file is seeded, so a corpus is reproducible:
+
+  * format         ITIN or TIPITIN (--itin-share of them ITIN)
+  * size           a number of travel days drawn from --days MIN-MAX;
+                   the printed page count follows from the line count
+  * segment mix    each file's days cycle through a random pick of
+                   invoice_fixtures.DAY_KINDS, weighted by --mix
+  * names          invoice number and passenger surname, so outputs get
+                   distinct names the way a real month does
+
+    python invoice_corpus.py <folder> --count 1000 [--days 1-8]
+                             [--itin-share 0.5] [--mix flight_hotel=4,cruise=1]
+                             [--seed 1]
+
+corpus.json in the folder records what was generated; make_corpus()
+reuses a folder whose corpus.json already matches instead of rebuilding.
+"""
+
+import os
+import sys
+import json
+import random
+import argparse
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+from invoice_fixtures import make_invoice, DAY_KINDS, FORMATS   # noqa: E402
+
+MANIFEST_FILENAME = "corpus.json"
+FONT_NAME = "Courier"
+FONT_SIZE = 8.5
+LEADING = 11.2            # points between printed lines
+MARGIN = 36               # points
+LINES_PER_PAGE = 62
+SURNAMES = ("WHEELER", "MORENO", "SMITH", "LIN", "OKAFOR", "NAKAMURA", "BERGSTROM",
+            "DUBOIS", "PATEL", "KOWALSKI", "ROSSI", "FITZGERALD", "HALVORSEN", "ABARA")
+
+
+def render_pdf(lines, path):
+    """Typeset lines into a PDF at path — monospaced, LINES_PER_PAGE to a
+    page. Returns the page count."""
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.pagesizes import letter
+
+    tmp_path = path + ".tmp"
+    c = canvas.Canvas(tmp_path, pagesize=letter, pageCompression=1)
+    width, height = letter
+    pages = 0
+    for start in range(0, max(1, len(lines)), LINES_PER_PAGE):
+        text = c.beginText(MARGIN, height - MARGIN)
+        text.setFont(FONT_NAME, FONT_SIZE)
+        text.setLeading(LEADING)
+        for line in lines[start:start + LINES_PER_PAGE]:
+            text.textLine(line)
+        c.drawText(text)
+        c.showPage()
+        pages += 1
+    c.save()
+    os.replace(tmp_path, path)
+    return pages
+
+
+def parse_mix(spec: str) -> dict:
+    """'flight_hotel=4,cruise=1' → {kind: weight}; unnamed kinds get 0.
+    Empty → every kind weighted 1."""
+    if not spec:
+        return {kind: 1 for kind in DAY_KINDS}
+    weights = {kind: 0 for kind in DAY_KINDS}
+    for part in spec.split(","):
+        kind, _, weight = part.partition("=")
+        kind = kind.strip()
+        if kind not in weights:
+            raise ValueError(f"unknown day kind {kind!r} (expected one of {DAY_KINDS})")
+        weights[kind] = float(weight) if weight else 1.0
+    if not any(weights.values()):
+        raise ValueError("mix gives every day kind a weight of 0")
+    return weights
+
+
+def _parse_range(spec: str):
+    lo, _, hi = spec.partition("-")
+    lo = int(lo)
+    hi = int(hi) if hi else lo
+    if lo < 1 or hi < lo:
+        raise ValueError(f"bad range {spec!r}")
+    return lo, hi
+
+
+def plan(count: int, days: str = "1-8", itin_share: float = 0.5,
+         mix: str = "", seed: int = 1) -> list:
+    """What each file will contain — [{name, fmt, days, mix, invoice_no,
+    surname}], deterministic for the same arguments."""
+    rng = random.Random(seed)
+    lo, hi = _parse_range(days)
+    weights = parse_mix(mix)
+    kinds = [k for k in DAY_KINDS if weights[k] > 0]
+    kind_weights = [weights[k] for k in kinds]
+    entries = []
+    for i in range(count):
+        fmt = "ITIN" if rng.random() < itin_share else "TIPITIN"
+        n_days = rng.randint(lo, hi)
+        entries.append({
+            "name": f"invoice_{i + 1:05d}.pdf",
+            "fmt": fmt,
+            "days": n_days,
+            "mix": rng.choices(kinds, kind_weights, k=min(n_days, len(DAY_KINDS))),
+            "invoice_no": (200000 if fmt == "TIPITIN" else 3000) + i,
+            "surname": rng.choice(SURNAMES),
+        })
+    return entries
+
+
+def make_corpus(folder: str, count: int, days: str = "1-8", itin_share: float = 0.5,
+                mix: str = "", seed: int = 1, log=print) -> dict:
+    """Generate (or reuse) the corpus in folder. Returns the manifest."""
+    params = {"count": count, "days": days, "itin_share": itin_share,
+              "mix": mix, "seed": seed}
+    manifest_path = os.path.join(folder, MANIFEST_FILENAME)
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("params") == params and all(
+                os.path.exists(os.path.join(folder, e["name"])) for e in manifest["files"]):
+            return manifest
+    except (OSError, ValueError, KeyError):
+        pass
+
+    os.makedirs(folder, exist_ok=True)
+    entries = plan(count, days, itin_share, mix, seed)
+    total_bytes = 0
+    total_pages = 0
+    for i, e in enumerate(entries, 1):
+        lines = make_invoice(e["fmt"], e["days"], e["invoice_no"], e["mix"], e["surname"])
+        path = os.path.join(folder, e["name"])
+        e["pages"] = render_pdf(lines, path)
+        e["bytes"] = os.path.getsize(path)
+        total_pages += e["pages"]
+        total_bytes += e["bytes"]
+        if log and (i % 500 == 0 or i == len(entries)):
+            log(f"  generated {i}/{len(entries)}")
+    manifest = {"params": params, "files": entries,
+                "total_pages": total_pages, "total_bytes": total_bytes}
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp_path, manifest_path)
+    return manifest
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Generate a synthetic invoice PDF corpus.")
+    ap.add_argument("folder")
+    ap.add_argument("--count", type=int, default=100)
+    ap.add_argument("--days", default="1-8", help="travel days per invoice, MIN-MAX")
+    ap.add_argument("--itin-share", type=float, default=0.5)
+    ap.add_argument("--mix", default="",
+                    help=f"day-kind weights, e.g. flight_hotel=4,cruise=1 — kinds: {', '.join(DAY_KINDS)}")
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args(argv)
+    manifest = make_corpus(args.folder, args.count, args.days, args.itin_share,
+                           args.mix, args.seed)
+    print(f"{len(manifest['files'])} PDFs, {manifest['total_pages']} pages, "
+          f"{manifest['total_bytes'] / 1e6:.1f} MB in {args.folder}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
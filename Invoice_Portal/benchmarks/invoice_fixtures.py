@@ -0,0 +1,362 @@
+"""
+invoice_fixtures.py — Synthetic ITIN and TIPITIN invoices, as the text
+lines fitz would hand state_parser.
+
+The repo can't ship real invoices (customer names, card details), so the
+benchmarks build their own. Every line below is shaped like the examples
+in state_parser's regex docstrings and comments — the same spacing,
+labels and value formats — and together they reach every section the
+parser knows: flights, cars, hotels (both the CONFIRMED and the IN-/OUT-
+line formats), cruises, tours, packages, insurance, tickets, financials,
+baggage / carry-on and notices.
+
+A "page" is one travel day's worth of segments. Pages cycle through a
+fixed rotation of day types and are numbered like the real thing
+("PAGE: n"), so a 50-page invoice is the 1-page one's header and totals
+around 50 days of varied bookings. Everything is deterministic: the same
+(fmt, pages) always gives the same lines, which is what lets the golden
+outputs in golden/ stay valid.
+
+    lines = make_invoice("TIPITIN", pages=10)
+    for name, fmt, pages, lines in fixtures(): ...
+"""
+
+FORMATS = ("TIPITIN", "ITIN")
+SIZES = (1, 5, 20, 50)
+
+_DAYS = ("MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY", "SATURDAY", "SUNDAY")
+_MONTHS = ("JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC")
+
+_CITIES = (
+    ("RALEIGH DURHAM", "NEWARK"),
+    ("NEWARK", "LISBON"),
+    ("LISBON", "PORTO"),
+    ("PORTO", "MADRID"),
+    ("MADRID", "NAPLES"),
+    ("NAPLES", "ATHENS"),
+    ("ATHENS", "LONDON HEATHROW"),
+    ("LONDON HEATHROW", "RALEIGH DURHAM"),
+)
+_TIPITIN_AIRLINES = ("UNITED AIRLINES INC.", "DEUTSCHE LUFTHANSA AG", "TAP AIR PORTUGAL",
+                     "AMERICAN AIRLINES INC.")
+_ITIN_AIRLINES = ("KLM", "AIR FRANCE", "DELTA", "BRITISH AIRWAYS")
+_HOTELS = ("WESTIN HOTELS AND RESORTS", "HOTEL AVENIDA PALACE", "HOTEL INDIGO DENVER DOWN",
+           "MARRIOTT HOTELS")
+
+
+def _date(n):
+    """Day n of the trip as ('03 DEC 26', 'THURSDAY') and '03DEC'."""
+    day = n % 28 + 1
+    month = _MONTHS[(n // 28) % 12]
+    return f"{day:02d} {month} 26", _DAYS[n % 7], f"{day:02d}{month}"
+
+
+def _time(n, offset=0):
+    hour = (n * 3 + offset) % 12 + 1
+    return f"{hour}{(n * 7 + offset) % 6}{(n + offset) % 10}{'A' if (n + offset) % 2 else 'P'}"
+
+
+# ---------------------------------------------------------------------------
+# Headers
+# ---------------------------------------------------------------------------
+def _tipitin_header(invoice_no):
+    # The "ITIN NO:" line has to fall within the first five lines —
+    # that's where _detect_format looks
+    return [
+        "WHEELER/JOHN DANIEL",
+        "WHEELER/JANE MARIE",
+        "M/M JOHN WHEELER",
+        "1402 OBERLIN ROAD",
+        f"  ITIN NO: {invoice_no}   RECORD LOCATOR: QWX7PL   DATE: 12 JUN 26",
+    ]
+
+
+def _itin_header(invoice_no):
+    return [
+        f"SALES PERSON: AB   ITIN/INVOICE NO. {invoice_no}     DATE:12JUN26",
+        "CUSTOMER NBR: 0048213",
+        "  TO: JOHN SMITH",
+        "1402 OBERLIN ROAD",
+        "RALEIGH NC 27605",
+        "  FOR: SMITH/JOHN",
+        "       SMITH/JANE ANN",
+    ]
+
+
+# ---------------------------------------------------------------------------
+# One day of segments per page
+# ---------------------------------------------------------------------------
+def _tipitin_flight(n):
+    dep, arr = _CITIES[n % len(_CITIES)]
+    airline = _TIPITIN_AIRLINES[n % len(_TIPITIN_AIRLINES)]
+    lines = [
+        f"  {airline}      {100 + n * 37 % 900}   BUS/ FIRST XCPTNS",
+        f"  LV: {dep}        {_time(n)}    CONFIRMED NON-STOP",
+        f"  ARR: {arr}        {_time(n, 5)}",
+        "  FLIGHT TIME - 7:25   BAGGAGE ALLOWANCE - 2PC",
+        f"  SEAT ASSIGNED {n % 30 + 1:02d}A NON SMOKING CONFIRMED",
+        f"            {n % 30 + 1:02d}B NON SMOKING",
+        "  MEALS SERVED DINNER",
+        "  DEPART - TERMINAL 2   ARRIVE - TERMINAL C",
+        f"  AIRLINE LOCATOR: UA -KX{n % 100:02d}QP",
+        "  FREQ FLYER: WHEELER/JOHN DANIEL   UA   MX482011",
+    ]
+    if n % 4 == 3:
+        lines.append("  OPERATED BY-UNITED EXPRESS/MESA AIRLINES")
+        lines.append("  WHEELCHAIR REQUESTED")
+    return lines
+
+
+def _itin_flight(n):
+    dep, arr = _CITIES[n % len(_CITIES)]
+    airline = _ITIN_AIRLINES[n % len(_ITIN_AIRLINES)]
+    return [
+        f"  AIR   {airline}            FLT: {200 + n * 53 % 800}   COACH CLASS  MEAL",
+        f"  LV: {dep}  {_time(n)}  NON-STOP",
+        f"  AR: {arr}  {_time(n, 5)}  ARRIVES- {n % 28 + 2:02d} JUN",
+        "  EQUIP-BOEING 737-800     ELAPSED TIME- 1:45",
+        f"  RESERVED SEATS SEAT- {n % 30 + 1}E {n % 30 + 1}F",
+        f"  AIRLINE CONFIRMATION: KL -ZP{n % 100:02d}RT",
+    ]
+
+
+def _car(n):
+    _, city = _CITIES[n % len(_CITIES)]
+    _, _, short = _date(n)
+    _, _, short_out = _date(n + 2)
+    return [
+        f"CAR {city} HERTZ 1 INTERMED 2/4 DR",
+        f"  PICK UP-{short} {city} INTL AP",
+        f"  DROP-{short_out}",
+        "  RATE- 49.52 WEEKEND GUARANTEED EXTRA DAY-49.52",
+        f"  CONFIRMATION-L673EAD{n:03d} GOLD",
+        "  UNLIMITED MILEAGE",
+    ]
+
+
+def _hotel_confirmed(n):
+    chain = _HOTELS[n % len(_HOTELS)]
+    _, _, short_out = _date(n + 2)
+    return [
+        f"  {chain} 02 NT/S - OUT {short_out} CONFIRMED",
+        f"  {chain}     GUARANTEE-VI XXXXXXXXXXXX4417",
+        f"  1{n % 9}00 HARBOR DRIVE     RATE- USD {189 + n % 50}.00",
+        "  SAN DIEGO CA 92101 US",
+        "  PHONE NO-619-555-0100",
+        f"  CONFIRMATION-{81240 + n}SG",
+        f"  APPROX TTL {2 * (189 + n % 50)}.00USD",
+        "  CXL: 24HR PRIOR TO ARRIVAL",
+        "  1 BC-KING BED NON SMOKING",
+    ]
+
+
+def _hotel_in_out(n):
+    _, _, short_in = _date(n)
+    _, _, short_out = _date(n + 1)
+    return [
+        f"  HOTEL WINE AND BOOKS HOTE 01 NT/S IN-{short_in} OUT-{short_out}",
+        "  WINE AND BOOKS HOTEL     GUARANTEE-AX XXXXXXXXXXX1009",
+        "  1 RUA DO ALECRIM     RATE- 383.00EUR PER NIGHT",
+        "  PHONE 351-222-443750 HOTEL FAX-351-222-443751",
+        f"  CONF0-47725SG{n:06d}",
+    ]
+
+
+def _tour_tipitin(n):
+    date, day, short = _date(n)
+    return [
+        f"{date} - {day} TOUR",
+        f"  **POSITANO CAR SERVICE**/AMT-{550 + n}.00/CF-GAETA{n}",
+        "  PICK UP AT HOTEL LOBBY",
+        "  TYPE OF PKG: PRIVATE TRANSFER",
+        f"  TOTAL COST USD {550 + n}.00",
+        f"  {short} PAYMENT BY VISA  USD  {550 + n}.00-",
+        f"  BALANCE OF 0.00 DUE {short}2026",
+    ]
+
+
+def _tour_itin(n):
+    date, day, _ = _date(n)
+    return [
+        f"{date} - {day}",
+        "TRANSFERS",
+        "  AUTO EUROPE FOR SIXT",
+        f"  TOTAL COST OF TOUR.............. {503 + n}.47",
+        f"  CREDIT CARD TO PROVIDER {503 + n}.47-",
+        "  FARE.....1392.90",
+    ]
+
+
+def _cruise_tipitin(n):
+    date, day, short = _date(n)
+    return [
+        f"{date} - {day}",
+        "  CRUISE ARRANGEMENTS",
+        f"  **PRINCESS CRUISES**/CF-MJ8X{n:02d}W",
+        "  SHIP NAME: SAPPHIRE PRINCESS",
+        f"  CABIN NUMBER: A{100 + n}",
+        "  DECK: ALOHA",
+        "  DEPARTURE PORT: SEATTLE",
+        f"  DEPART DATE {short}26",
+        "  ADULT: 1836.95 X 2",
+        "  TOTAL COST USD 3673.90",
+        f"  {short}2026 PAYMENT BY VISA  USD  3673.90-",
+    ]
+
+
+def _cruise_itin(n):
+    date, day, short = _date(n)
+    return [
+        f"{date} - {day} CRUISE CRUISE",
+        "  VIKING CRUISE LINE",
+        "  SHIP : VIKING SEA",
+        f"  CABIN: {5000 + n}",
+        f"  SAIL DATE : {short}26",
+        "  PORT : BERGEN",
+        "  TOTAL COST OF CRUISE..... 10896.00",
+        "  CREDIT CARD TO PROVIDER 10896.00-",
+        f"  BALANCE OF 0.00 DUE {short}2026",
+    ]
+
+
+def _package(n):
+    date, day, short = _date(n)
+    return [
+        f"{date} - {day}",
+        "  PACKAGE ARRANGEMENTS",
+        f"  **BACKROADS**/AMT-{3649 + n}.00/CF-{3436299 + n}",
+        "  TYPE OF PKG: BACKROADS BELIZE & GUATEMALA MULTI ADVENTURE",
+        f"  TOTAL COST USD {3649 + n}.00",
+        f"  {short} PAYMENT BY VISA  USD  1000.00-",
+        f"  BALANCE OF {2649 + n}.00 DUE {short}2026",
+        f"  TOTAL DUE: {3649 + n}.00 BY {short}2026",
+        "  SIX NIGHTS LODGING WITH GUIDED ACTIVITIES",
+    ]
+
+
+# The eight day shapes, in the order pages rotate through them by default
+DAY_KINDS = ("flight_hotel", "flight_car", "tour", "flight_hotel_inout",
+             "cruise", "package", "car_flight", "two_flights_hotel")
+
+
+def _day(fmt, n, kind=None):
+    """Page n: a date line, then one day shape — kind, or the default
+    rotation through DAY_KINDS."""
+    date, day, _ = _date(n)
+    flight = _tipitin_flight if fmt == "TIPITIN" else _itin_flight
+    kind = kind or DAY_KINDS[n % len(DAY_KINDS)]
+    if kind == "flight_hotel":
+        return [f"{date} - {day}"] + flight(n) + _hotel_confirmed(n)
+    if kind == "flight_car":
+        return [f"{date} - {day}"] + flight(n) + _car(n)
+    if kind == "tour":
+        return _tour_tipitin(n) if fmt == "TIPITIN" else _tour_itin(n)
+    if kind == "flight_hotel_inout":
+        return [f"{date} - {day}"] + flight(n) + _hotel_in_out(n)
+    if kind == "cruise":
+        return _cruise_tipitin(n) if fmt == "TIPITIN" else _cruise_itin(n)
+    if kind == "package":
+        return _package(n)
+    if kind == "car_flight":
+        return [f"{date} - {day}"] + _car(n) + flight(n)
+    if kind == "two_flights_hotel":
+        return [f"{date} - {day}"] + flight(n) + flight(n + 1) + _hotel_confirmed(n)
+    raise ValueError(f"unknown day kind {kind!r} (expected one of {DAY_KINDS})")
+
+
+# ---------------------------------------------------------------------------
+# Trailer: tickets, totals, baggage, insurance, notices
+# ---------------------------------------------------------------------------
+def _tipitin_trailer(pages):
+    fare = 612.03 * max(1, pages // 4)
+    return [
+        "  TICKET NUMBER/S:",
+        f"  WHEELER/JOHN DANIEL  0167484690269  VIC CARD  USD  {fare:.2f}",
+        f"  WHEELER/JANE MARIE 0167484690270  USD  {fare:.2f}",
+        "  EXCHANGED FOR TICKET",
+        "       0167484600001",
+        f"AIR FARE USD      {2 * fare - 180:.2f}",
+        "TAX AND CARRIER FEES USD     180.00",
+        f"TTL USD      {2 * fare:.2f}",
+        f"  SUB TOTAL      {2 * fare:.2f}",
+        f"CREDIT CARD PAYMENT USD      {2 * fare:.2f}-",
+        "  AMOUNT DUE USD      0.00",
+        "BAGGAGE ALLOWANCE",
+        "  UA EWRLIS   2PC",
+        "  BAG 1 - 23KG UPTO 50LB/158LCM",
+        "  BAG 2 - 23KG UPTO 50LB/158LCM",
+        "CARRY ON ALLOWANCE",
+        "  UA EWRLIS   1PC",
+        "  BAG 1 - 10KG UPTO 22LB",
+        "  TRAVEL GUARD POLICY TYPE PROTECTION PLUS",
+        "  INSURED TRIP COST USD 9800.00",
+        "  SERVICE FEES USD 35.00",
+        "** ALL FLIGHTS MUST BE RECONFIRMED 72 HOURS PRIOR **",
+        "  PASSPORT MUST BE VALID SIX MONTHS BEYOND RETURN",
+        "  TICKET IS NON-REFUNDABLE",
+        "  ROUNDTRIP FARE: INCLUDES ALL SEGMENTS",
+    ]
+
+
+def _itin_trailer(pages):
+    fare = 3898.44 * max(1, pages // 4)
+    return [
+        "  TICKET NUMBER/S:",
+        f"  AIR TICKET/S  7401640949  AX CARD  {fare:.2f}",
+        f"  AIR TICKET/S  7401789463-464  {fare:.2f}",
+        f"  SUB TOTAL {2 * fare:.2f}",
+        f"  TOTAL AMOUNT {2 * fare:.2f}",
+        "  FARE.......1392.90 PER PERSON - INCLUDES TAXES",
+        "BAGGAGE ALLOWANCE",
+        "  KL AMSLHR   1PC",
+        "  BAG 1 - 23KG UPTO 50LB",
+        "  ALLIANZ TRAVEL INSURANCE COVERAGE",
+        "  TRIP CANCELLATION AND INTERRUPTION",
+        "  SERVICE FEE USD 50.00",
+        "** VALID PASSPORT REQUIRED FOR ALL TRAVELERS **",
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Public
+# ---------------------------------------------------------------------------
+def make_invoice(fmt: str = "TIPITIN", pages: int = 1, invoice_no: int = None,
+                 mix=None, surname: str = None) -> list:
+    """
+    Synthetic invoice text lines, as parse() would get them from fitz.
+
+    mix: a sequence of DAY_KINDS names that pages cycle through instead
+    of the default rotation (e.g. ("flight_hotel",) * 3 + ("cruise",)).
+    surname: replaces the passengers' last name everywhere it appears.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"fmt must be one of {FORMATS}")
+    invoice_no = invoice_no or (123456 if fmt == "TIPITIN" else 1001)
+    lines = _tipitin_header(invoice_no) if fmt == "TIPITIN" else _itin_header(invoice_no)
+    for n in range(pages):
+        if n:
+            lines.append(f"PAGE: {n + 1}")
+        lines.extend(_day(fmt, n, mix[n % len(mix)] if mix else None))
+    lines.extend(_tipitin_trailer(pages) if fmt == "TIPITIN" else _itin_trailer(pages))
+    if surname:
+        default = "WHEELER" if fmt == "TIPITIN" else "SMITH"
+        lines = [line.replace(default, surname) for line in lines]
+    return lines
+
+
+def fixture_name(fmt: str, pages: int) -> str:
+    return f"{fmt.lower()}_{pages}p"
+
+
+def fixtures(sizes=SIZES):
+    """Every (name, fmt, pages, lines) the benchmarks run."""
+    for fmt in FORMATS:
+        for pages in sizes:
+            yield fixture_name(fmt, pages), fmt, pages, make_invoice(fmt, pages)
+
+
+if __name__ == "__main__":
+    import sys
+    fmt = sys.argv[1].upper() if len(sys.argv) > 1 else "TIPITIN"
+    pages = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    print("\n".join(make_invoice(fmt, pages)))
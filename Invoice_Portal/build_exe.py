@@ -15,12 +15,14 @@ PyInstaller.__main__.run([
     "--add-data", "airport_lookup.py;.",
     "--add-data", "airport_resolver.py;.",
     "--add-data", "state_parser.py;.",
+    "--add-data", "invoice_records.py;.",
     "--hidden-import", "invoice_processor",
     "--hidden-import", "invoice_generator",
     "--hidden-import", "invoice_pdf",
     "--hidden-import", "airport_lookup",
     "--hidden-import", "airport_resolver",
     "--hidden-import", "state_parser",
+    "--hidden-import", "invoice_records",
     "--hidden-import", "reportlab",
     "--hidden-import", "reportlab.lib",
     "--hidden-import", "reportlab.platypus",
@@ -31,6 +31,17 @@ DATA_FILES = [
     "compare_view.py",
     "hotel_invoice_editor.py",
     "hotel_invoice_processor.py",
+    "hotel_invoice_index.py",
+    "visual_diff.py",
+    "coverage_check.py",
+    "startup_audit.py",
+    "single_instance.py",
+    "processing_service.py",
+    "invoice_pipeline.py",
+    "file_watchdog.py",
+    "invoice_records.py",
+    "invoice_splitter.py",
+    "invoice_watch.py",
 ]
 
 # Only bundle files that actually exist here — keeps this script safe to
@@ -55,6 +66,18 @@ HIDDEN_IMPORTS = [
     "compare_view",
     "hotel_invoice_editor",
     "hotel_invoice_processor",
+    "hotel_invoice_index",
+    "visual_diff",
+    "coverage_check",
+    "startup_audit",
+    "single_instance",
+    "processing_service",
+    "invoice_pipeline",
+    "file_watchdog",
+    "invoice_records",
+    "invoice_splitter",
+    "invoice_watch",
+    "numpy",
     "reportlab",
     "reportlab.lib",
     "reportlab.platypus",
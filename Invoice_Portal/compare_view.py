@@ -7,18 +7,248 @@ can visually verify no information is missing.
 
 import os
 import sys
+import json
+import threading
+import itertools
 import tkinter as tk
+from collections import OrderedDict
 from tkinter import ttk
 
 try:
     import fitz
-    from PIL import Image, ImageTk
 except ImportError as e:
     print(f"Missing dependency: {e}")
-    print("pip install PyMuPDF Pillow")
+    print("pip install PyMuPDF")
     sys.exit(1)
 
 
+# ---------------------------------------------------------------------------
+# Rendering
+# ---------------------------------------------------------------------------
+# Rendered pages are kept as PPM bytes straight out of fitz (pix.tobytes),
+# which tk.PhotoImage can load directly — no PIL round trip. A Tk
+# PhotoImage can only be built on the Tk thread, so the cache holds the
+# bytes and each viewer turns the couple of pages on screen into images.
+RENDER_CACHE_BYTES = 160 * 1024 * 1024   # ~90 letter pages at fit-width
+QUICK_FACTOR       = 3      # low-res first pass is rendered at zoom / 3
+PREFETCH_PAGES     = 2      # pages ahead (and 1 behind) rendered in advance
+ZOOM_STEP          = 0.05   # fit-width zoom is snapped to this so small
+                            # window resizes don't invalidate the cache
+PAGE_MARGIN_PX     = 60     # canvas width not given to the two pages
+REVIEW_PREFETCH_PAIRS = 3   # ReviewQueue keeps this many upcoming pairs
+                            # opened and their first page rendered
+
+# PyMuPDF isn't safe to call from two threads at once, even on separate
+# documents. Every fitz call in this module goes through this lock — in
+# practice only the render worker takes it, plus a page count per open.
+_FITZ_LOCK = threading.Lock()
+
+
+class RenderCache:
+    """Byte-bounded LRU of rendered pages: key -> (ppm_bytes, w, h)."""
+
+    def __init__(self, max_bytes=RENDER_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+            return item
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._items
+
+    def put(self, key, item):
+        size = len(item[0])
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[0])
+            self._items[key] = item
+            self._bytes += size
+            while self._bytes > self.max_bytes and len(self._items) > 1:
+                _, dropped = self._items.popitem(last=False)
+                self._bytes -= len(dropped[0])
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+
+def doc_stamp(path):
+    """(abs path, mtime_ns) — identifies one version of a file in render
+    keys, so a re-generated processed copy never shows a stale page."""
+    path = os.path.abspath(path)
+    try:
+        return path, os.stat(path).st_mtime_ns
+    except OSError:
+        return path, 0
+
+
+def render_key(stamp, page_num, zoom):
+    return (stamp[0], stamp[1], page_num, round(zoom, 3))
+
+
+def diff_key(orig_stamp, proc_stamp, page_num, zoom):
+    """Key for the processed page with hidden original content tinted
+    (visual_diff.highlight_ppm). Same first four fields as render_key."""
+    return render_key(proc_stamp, page_num, zoom) + orig_stamp
+
+
+def quick_zoom(zoom):
+    return round(zoom / QUICK_FACTOR, 3)
+
+
+def _doc_info(doc):
+    return len(doc), (doc[0].rect.width if len(doc) else 612)
+
+
+def page_info(path):
+    """(page count, width of page 1 in points). Free if the render worker
+    already has the file open (e.g. a prefetched review pair), otherwise
+    a quick open under the fitz lock."""
+    info = _worker.doc_info.get(doc_stamp(path))
+    if info is not None:
+        return info
+    with _FITZ_LOCK:
+        with fitz.open(path) as doc:
+            return _doc_info(doc)
+
+
+def _render_ppm(doc, page_num, zoom):
+    if page_num >= len(doc):
+        # Past the end of the shorter document — a blank placeholder
+        w, h = int(612 * zoom), int(792 * zoom)
+        pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, w, h), False)
+        pix.clear_with(0xF8)
+    else:
+        pix = doc[page_num].get_pixmap(matrix=fitz.Matrix(zoom, zoom),
+                                       alpha=False)
+    return pix.tobytes("ppm"), pix.width, pix.height
+
+
+class RenderWorker:
+    """
+    One background thread that renders pages into a RenderCache for any
+    number of viewers. Each viewer (owner) submits its wanted keys in
+    priority order; a new submission replaces that owner's pending jobs,
+    so paging quickly doesn't leave a backlog of pages nobody is looking
+    at. Priority 0 is what's on screen now, higher numbers are prefetch.
+
+    Open documents are kept between jobs, and all of them are closed as
+    soon as there's nothing left to render. A viewer that's been closed
+    or is showing pages it already has doesn't hold its PDFs open. On
+    Windows an open document locks its file against moving or deleting.
+    """
+
+    # Enough for a review pair plus REVIEW_PREFETCH_PAIRS upcoming ones
+    MAX_OPEN_DOCS = 2 * (REVIEW_PREFETCH_PAIRS + 2)
+
+    def __init__(self, cache):
+        self.cache = cache
+        self._cond = threading.Condition()
+        self._jobs = {}                 # owner -> [(prio, seq, key), ...]
+        self._callbacks = {}            # owner -> on_ready(key)
+        self._seq = itertools.count()
+        self._docs = OrderedDict()      # (path, mtime) -> fitz doc
+        self.doc_info = {}              # (path, mtime) -> (pages, width)
+        self._thread = None
+
+    def submit(self, owner, keys, on_ready=None):
+        """keys: [(prio, key), ...]. on_ready(key) is called from the worker
+        thread once each key is in the cache (including already-cached
+        ones, so the caller has a single code path)."""
+        with self._cond:
+            self._jobs[owner] = [(prio, next(self._seq), key)
+                                 for prio, key in keys]
+            if on_ready is not None:
+                self._callbacks[owner] = on_ready
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def cancel(self, owner):
+        with self._cond:
+            self._jobs.pop(owner, None)
+            self._callbacks.pop(owner, None)
+
+    def _next_job(self, block=True):
+        with self._cond:
+            while not any(self._jobs.values()):
+                if not block:
+                    return None
+                self._cond.wait()
+            owner, jobs = min(((o, j) for o, j in self._jobs.items() if j),
+                              key=lambda oj: oj[1][0][:2])
+            _, _, key = jobs.pop(0)
+            return owner, key, self._callbacks.get(owner)
+
+    def _doc(self, path, mtime):
+        doc = self._docs.get((path, mtime))
+        if doc is not None:
+            self._docs.move_to_end((path, mtime))
+            return doc
+        doc = fitz.open(path)
+        self._docs[(path, mtime)] = doc
+        self.doc_info[(path, mtime)] = _doc_info(doc)
+        while len(self._docs) > self.MAX_OPEN_DOCS:
+            _, old = self._docs.popitem(last=False)
+            old.close()
+        return doc
+
+    def close_docs(self):
+        with _FITZ_LOCK:
+            while self._docs:
+                _, doc = self._docs.popitem()
+                doc.close()
+
+    def _run(self):
+        while True:
+            job = self._next_job(block=False)
+            if job is None:
+                self.close_docs()
+                job = self._next_job()
+            owner, key, on_ready = job
+            if key not in self.cache:
+                path, mtime, page_num, zoom = key[:4]
+                try:
+                    with _FITZ_LOCK:
+                        doc = self._doc(path, mtime)
+                        if len(key) > 4 and page_num < len(doc):
+                            from visual_diff import highlight_ppm
+                            item = highlight_ppm(self._doc(*key[4:]), doc,
+                                                 page_num, zoom)
+                        else:
+                            item = _render_ppm(doc, page_num, zoom)
+                except Exception:
+                    continue
+                self.cache.put(key, item)
+            if on_ready is not None:
+                try:
+                    on_ready(key)
+                except Exception:
+                    pass
+
+
+_cache = RenderCache()
+_worker = RenderWorker(_cache)
+
+
+def _photo(master, key):
+    """PhotoImage for a cached key, or None if it isn't rendered yet."""
+    item = _cache.get(key)
+    if item is None:
+        return None
+    return tk.PhotoImage(master=master, data=item[0], format="PPM")
+
+
 class CompareViewer:
     """Show two PDFs side by side with page navigation."""
 
@@ -40,33 +270,46 @@ class CompareViewer:
         h = min(sh - 100, 900)
         self.root.geometry(f"{w}x{h}+{(sw-w)//2}+{(sh-h)//2}")
 
-        self.orig_path = original_path
-        self.proc_path = processed_path
-
-        # Load PDFs
-        self.orig_doc = fitz.open(original_path)
-        self.proc_doc = fitz.open(processed_path)
-        self.max_pages = max(len(self.orig_doc), len(self.proc_doc))
-        self.current_page = 0
-        self.zoom = 1.3
+        self._set_pair(original_path, processed_path)
+        self.zoom = self._fit_zoom(w - 20)
+        self.diff_mode = False
+        self._resize_after_id = None
 
-        # Cache rendered images
-        self._cache = {}
+        # PhotoImages for what's on screen; everything else lives as PPM
+        # bytes in the shared, size-bounded render cache.
+        self._shown = {}
 
         self._build_ui()
         self._render_page()
 
+    def _set_pair(self, original_path, processed_path):
+        self.orig_path = original_path
+        self.proc_path = processed_path
+
+        # Page counts only — the documents themselves are opened and
+        # rendered by the shared background worker, never on the Tk thread.
+        self._orig_stamp = doc_stamp(original_path)
+        self._proc_stamp = doc_stamp(processed_path)
+        orig_pages, orig_w = page_info(original_path)
+        proc_pages, proc_w = page_info(processed_path)
+        self.max_pages = max(orig_pages, proc_pages, 1)
+        self._page_width = max(orig_w, proc_w)
+        self.current_page = 0
+        if hasattr(self, "orig_name_label"):
+            self.orig_name_label.configure(text=os.path.basename(original_path))
+
     def _build_ui(self):
         # Header
         header = tk.Frame(self.root, bg="#ffffff", pady=8)
         header.pack(fill="x")
+        self.header = header
 
         tk.Label(header, text="ORIGINAL",
                  font=("Arial", 11, "bold"), bg="#ffffff", fg="#cc0000"
                  ).pack(side="left", padx=(20, 0))
-        tk.Label(header, text=os.path.basename(self.orig_path),
-                 font=("Arial", 9), bg="#ffffff", fg="#888888"
-                 ).pack(side="left", padx=(8, 0))
+        self.orig_name_label = tk.Label(header, text=os.path.basename(self.orig_path),
+                                        font=("Arial", 9), bg="#ffffff", fg="#888888")
+        self.orig_name_label.pack(side="left", padx=(8, 0))
 
         # Nav in center
         nav = tk.Frame(header, bg="#ffffff")
@@ -86,6 +329,14 @@ class CompareViewer:
                                    bg="#e0e0e0", padx=10, pady=4)
         self.next_btn.pack(side="left", padx=4)
 
+        # Diff: tint original content the overlay covered on the
+        # processed page — meant for the plain (stamped) copy, where the
+        # two pages should otherwise match.
+        self.diff_btn = tk.Button(nav, text="Diff", command=self._toggle_diff,
+                                  font=("Arial", 10), relief="flat",
+                                  bg="#e0e0e0", padx=10, pady=4)
+        self.diff_btn.pack(side="left", padx=(16, 4))
+
         tk.Label(header, text="PROCESSED",
                  font=("Arial", 11, "bold"), bg="#ffffff", fg="#005e8d"
                  ).pack(side="right", padx=(0, 20))
@@ -129,45 +380,101 @@ class CompareViewer:
         self.right_label = tk.Label(self.inner, bg=self.BG)
         self.right_label.pack(side="left", padx=(5, 10), pady=10, anchor="n")
 
+    def _fit_zoom(self, canvas_width):
+        """Zoom at which the two pages side by side fill canvas_width."""
+        z = (max(canvas_width - PAGE_MARGIN_PX, 200) / 2) / self._page_width
+        z = round(round(z / ZOOM_STEP) * ZOOM_STEP, 3)
+        return min(max(z, 0.5), 3.0)
+
     def _on_canvas_resize(self, event):
         self.canvas.itemconfig(self.canvas_window, width=event.width)
-
-    def _render_pdf_page(self, doc, page_num):
-        """Render a PDF page to a PhotoImage."""
-        cache_key = (id(doc), page_num, self.zoom)
-        if cache_key in self._cache:
-            return self._cache[cache_key]
-
-        if page_num >= len(doc):
-            # Return a blank placeholder
-            img = Image.new("RGB", (int(612 * self.zoom), int(792 * self.zoom)), "#f8f8f8")
-            photo = ImageTk.PhotoImage(img)
-            self._cache[cache_key] = photo
-            return photo
-
-        page = doc[page_num]
-        mat = fitz.Matrix(self.zoom, self.zoom)
-        pix = page.get_pixmap(matrix=mat)
-        img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-        photo = ImageTk.PhotoImage(img)
-        self._cache[cache_key] = photo
-        return photo
-
-    def _render_page(self):
-        left_img = self._render_pdf_page(self.orig_doc, self.current_page)
-        right_img = self._render_pdf_page(self.proc_doc, self.current_page)
-
-        self.left_label.configure(image=left_img)
-        self.left_label.image = left_img
-
-        self.right_label.configure(image=right_img)
-        self.right_label.image = right_img
+        # Debounced — dragging a window edge fires dozens of these
+        if self._resize_after_id is not None:
+            self.root.after_cancel(self._resize_after_id)
+        self._resize_after_id = self.root.after(
+            150, lambda w=event.width: self._apply_fit_zoom(w))
+
+    def _apply_fit_zoom(self, width):
+        self._resize_after_id = None
+        z = self._fit_zoom(width)
+        if z != self.zoom:
+            self.zoom = z
+            self._render_page(scroll_top=False)
+
+    # ------------------------------------------------------------------
+    # Rendering
+    # ------------------------------------------------------------------
+    def _keys(self, page_num, zoom=None):
+        zoom = self.zoom if zoom is None else zoom
+        right = diff_key(self._orig_stamp, self._proc_stamp, page_num, zoom) \
+                if self.diff_mode \
+                else render_key(self._proc_stamp, page_num, zoom)
+        return render_key(self._orig_stamp, page_num, zoom), right
+
+    def _toggle_diff(self):
+        self.diff_mode = not self.diff_mode
+        self.diff_btn.configure(bg="#f3c0c0" if self.diff_mode else "#e0e0e0")
+        self._render_page(scroll_top=False)
+
+    def _image_for(self, page_num, side):
+        """Sharp image if rendered, else the upscaled quick pass, else None."""
+        sharp = self._keys(page_num)[side]
+        photo = _photo(self.root, sharp)
+        if photo is not None:
+            return photo, True
+        quick = self._keys(page_num, quick_zoom(self.zoom))[side]
+        photo = _photo(self.root, quick)
+        if photo is not None:
+            return photo.zoom(QUICK_FACTOR), False
+        return None, False
+
+    def _show_images(self):
+        for side, label in enumerate((self.left_label, self.right_label)):
+            if self._shown.get(side) == (self.current_page, self.zoom, True):
+                continue
+            photo, sharp = self._image_for(self.current_page, side)
+            if photo is None or self._shown.get(side) == (self.current_page, self.zoom, sharp):
+                continue
+            label.configure(image=photo)
+            label.image = photo
+            self._shown[side] = (self.current_page, self.zoom, sharp)
+
+    def _wanted_keys(self):
+        """Render jobs in priority order: this page quick, this page sharp,
+        then the next few pages (and the previous one) sharp."""
+        page = self.current_page
+        jobs = [(0, k) for k in self._keys(page, quick_zoom(self.zoom))]
+        jobs += [(1, k) for k in self._keys(page)]
+        ahead = [p for p in range(page + 1, page + 1 + PREFETCH_PAGES)
+                 if p < self.max_pages]
+        if page > 0:
+            ahead.append(page - 1)
+        for prio, p in enumerate(ahead, start=2):
+            jobs += [(prio, k) for k in self._keys(p)]
+        return jobs
+
+    def _on_rendered(self, key):
+        # Worker thread → Tk thread
+        try:
+            self.root.after(0, lambda: self._rendered(key))
+        except (RuntimeError, tk.TclError):
+            pass
+
+    def _rendered(self, key):
+        if key[2] == self.current_page and key[3] in (self.zoom, quick_zoom(self.zoom)):
+            self._show_images()
+
+    def _render_page(self, scroll_top=True):
+        self._shown.clear()
+        self._show_images()
+        _worker.submit(self, self._wanted_keys(), self._on_rendered)
 
         self.page_label.configure(text=f"{self.current_page + 1} / {self.max_pages}")
         self.prev_btn.configure(state="normal" if self.current_page > 0 else "disabled")
         self.next_btn.configure(state="normal" if self.current_page < self.max_pages - 1 else "disabled")
 
-        self.canvas.yview_moveto(0)
+        if scroll_top:
+            self.canvas.yview_moveto(0)
 
     def _prev(self):
         if self.current_page > 0:
@@ -180,8 +487,7 @@ class CompareViewer:
             self._render_page()
 
     def close(self):
-        self.orig_doc.close()
-        self.proc_doc.close()
+        _worker.cancel(self)
         self.root.destroy()
 
     def run(self):
@@ -190,6 +496,129 @@ class CompareViewer:
             self.root.mainloop()
 
 
+class ReviewQueue(CompareViewer):
+    """
+    Step through a whole batch of (original, processed) pairs in one
+    window. While one pair is on screen the render worker opens the next
+    REVIEW_PREFETCH_PAIRS pairs and renders their first page, so moving
+    on is usually instant.
+
+    Keys:  ← / →  page      n / p  next / previous pair
+           a  approve + next    f  flag + next    d  diff    Esc  close
+
+    Decisions are saved to decisions_path (JSON, rewritten atomically on
+    every keypress) keyed by processed filename; re-opening the same
+    batch resumes at the first pair without a decision.
+    """
+
+    DECISION_COLORS = {"approved": "#1a7a1a", "flagged": "#cc0000"}
+
+    def __init__(self, pairs, parent=None, decisions_path=None):
+        self.pairs = [(o, p) for o, p in pairs if o and p]
+        if not self.pairs:
+            raise ValueError("ReviewQueue needs at least one pair")
+        self.decisions_path = decisions_path
+        self.decisions = load_decisions(decisions_path) if decisions_path else {}
+        self.pair_index = next(
+            (i for i, (_, proc) in enumerate(self.pairs)
+             if os.path.basename(proc) not in self.decisions), 0)
+
+        orig, proc = self.pairs[self.pair_index]
+        super().__init__(orig, proc, parent=parent)
+        self.root.title("Review — Original vs Processed")
+        self._build_review_bar()
+
+        for key, fn in (("<Left>", self._prev), ("<Right>", self._next),
+                        ("n", lambda: self._goto_pair(self.pair_index + 1)),
+                        ("p", lambda: self._goto_pair(self.pair_index - 1)),
+                        ("a", lambda: self._decide("approved")),
+                        ("f", lambda: self._decide("flagged")),
+                        ("d", self._toggle_diff),
+                        ("<Escape>", self.close)):
+            self.root.bind(key, lambda e, fn=fn: fn())
+        self.root.focus_set()
+        self._update_review_bar()
+
+    def _build_review_bar(self):
+        bar = tk.Frame(self.root, bg="#ffffff", pady=6)
+        bar.pack(fill="x", before=self.header)
+        self.pair_label = tk.Label(bar, font=("Arial", 10, "bold"),
+                                   bg="#ffffff")
+        self.pair_label.pack(side="left", padx=(20, 0))
+        self.decision_label = tk.Label(bar, font=("Arial", 10, "bold"),
+                                       bg="#ffffff")
+        self.decision_label.pack(side="left", padx=(12, 0))
+        tk.Label(bar, text="a approve   f flag   n/p next/prev invoice   ←/→ page   d diff",
+                 font=("Arial", 9), bg="#ffffff", fg="#888888"
+                 ).pack(side="right", padx=(0, 20))
+
+    def _update_review_bar(self):
+        done = sum(1 for _, proc in self.pairs
+                   if os.path.basename(proc) in self.decisions)
+        self.pair_label.configure(
+            text=f"Invoice {self.pair_index + 1} of {len(self.pairs)}"
+                 f"   ({done} reviewed)")
+        d = self.decisions.get(os.path.basename(self.proc_path), {}).get("decision")
+        self.decision_label.configure(text=(d or "").upper(),
+                                      fg=self.DECISION_COLORS.get(d, "#888888"))
+
+    def _goto_pair(self, index):
+        if not 0 <= index < len(self.pairs) or index == self.pair_index:
+            return
+        self.pair_index = index
+        self._set_pair(*self.pairs[index])
+        self._render_page()
+        self._update_review_bar()
+
+    def _decide(self, decision):
+        orig, proc = self.pairs[self.pair_index]
+        self.decisions[os.path.basename(proc)] = {
+            "decision":  decision,
+            "original":  orig,
+            "processed": proc,
+        }
+        if self.decisions_path:
+            save_decisions(self.decisions_path, self.decisions)
+        if self.pair_index < len(self.pairs) - 1:
+            self._goto_pair(self.pair_index + 1)
+        else:
+            self._update_review_bar()
+
+    def _wanted_keys(self):
+        jobs = super()._wanted_keys()
+        prio = len(jobs) + 1
+        for orig, proc in self.pairs[self.pair_index + 1:
+                                     self.pair_index + 1 + REVIEW_PREFETCH_PAIRS]:
+            for path in (orig, proc):
+                jobs.append((prio, render_key(doc_stamp(path), 0, self.zoom)))
+            prio += 1
+        return jobs
+
+
+DECISIONS_FILENAME = "review_decisions.json"
+
+
+def load_decisions(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("decisions", {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+def save_decisions(path, decisions):
+    """Atomic write (tmp file + os.replace) — a crash mid-review keeps the
+    previous file rather than a truncated one."""
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "decisions": decisions}, f, indent=2)
+        os.replace(tmp_path, path)
+        return True
+    except OSError:
+        return False
+
+
 def open_file_in_viewer(filepath):
     """Open a file in the system's default viewer."""
     import subprocess
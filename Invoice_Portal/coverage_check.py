@@ -0,0 +1,167 @@
+"""
+coverage_check.py — Did the styled invoice keep everything that matters?
+
+generate_invoice_pdf() builds the styled layout from what state_parser
+captured, so anything the parser dropped (or captured but the layout
+never prints) silently disappears. data["unrecognized"] only catches
+lines the parser didn't understand — not a ticket number it read and
+then lost. This pulls the tokens a customer would actually miss out of
+the source PDF's text and checks each one appears somewhere in the
+styled PDF's text:
+
+    confirmations   codes after CONFIRMATION / CONF / AIRLINE CONFIRMATION /
+                    RECORD LOCATOR
+    tickets         10+ digit ticket numbers
+    amounts         money values (1,234.56 and 1234.56 compare equal)
+    names           LAST/FIRST passenger names (both words must appear)
+
+Lines state_parser skips on purpose (SKIP_PATTERNS — mileage numbers,
+page footers, boilerplate) are skipped here too, so they never count as
+missing. It's plain text extraction plus a handful of regexes per line
+— a few milliseconds per invoice, cheap enough to run on every file.
+
+    python coverage_check.py <source.pdf> <styled.pdf>
+"""
+
+import re
+import sys
+
+try:
+    import fitz
+except ImportError as e:
+    print(f"Missing dependency: {e}")
+    print("pip install PyMuPDF")
+    sys.exit(1)
+
+# Module reference rather than "from state_parser import _should_skip",
+# so a hot-swapped parser (updater.apply_pending_updates) brings its new
+# SKIP_PATTERNS along with it.
+import state_parser
+
+
+CATEGORIES = ("confirmations", "tickets", "amounts", "names")
+
+_CONF_RE = re.compile(
+    r'(?:AIRLINE CONFIRMATION|CONFIRMATION|CONF[O0]?|RECORD LOCATOR)'
+    r'[\s:#\-]*(?:[A-Z0-9]{2}\s*-\s*)?([A-Z0-9][A-Z0-9\-]{4,})')
+_TICKET_RE = re.compile(r'(?<![\d.])(\d{10,})(?:-\d+)?(?![\d.])')
+_AMOUNT_RE = re.compile(r'(?<![\d.,])(\d{1,3}(?:,\d{3})+|\d+)\.(\d{2})(?![\d])')
+# LAST/FIRST — last name may carry a suffix word ("LIN JR/RICHARD"), the
+# same shape state_parser's ticket regex allows. Both parts need 2+
+# letters, which keeps "NT/S" and "TICKET/S" out.
+_NAME_RE = re.compile(
+    r"(?<![A-Z0-9])([A-Z][A-Z'\-]+)(?:\s(?:JR|SR|II|III|IV))?/([A-Z][A-Z'\-]+)")
+_WORD_RE = re.compile(r"[A-Z0-9][A-Z0-9'\-]*")
+
+
+def _amount(whole: str, cents: str) -> str:
+    return f"{int(whole.replace(',', ''))}.{cents}"
+
+
+def source_tokens(lines) -> dict:
+    """{category: set(tokens)} from the source invoice's text lines."""
+    found = {c: set() for c in CATEGORIES}
+    for line in lines:
+        if state_parser._should_skip(line):
+            continue
+        for m in _CONF_RE.finditer(line):
+            code = m.group(1).rstrip("-")
+            # A bare number after "CONFIRMATION" is still a confirmation,
+            # but all-letter words ("CONFIRMED", "NUMBER") aren't codes.
+            if any(ch.isdigit() for ch in code):
+                found["confirmations"].add(code)
+        for m in _TICKET_RE.finditer(line):
+            found["tickets"].add(m.group(1))
+        for m in _AMOUNT_RE.finditer(line):
+            amt = _amount(m.group(1), m.group(2))
+            if amt != "0.00":
+                found["amounts"].add(amt)
+        for m in _NAME_RE.finditer(line):
+            found["names"].add(f"{m.group(1)}/{m.group(2)}")
+    # A ticket number can look like an amount-less confirmation code too
+    found["confirmations"] -= found["tickets"]
+    return found
+
+
+def output_index(text: str) -> dict:
+    """What the styled output contains, in the forms source tokens are
+    compared against."""
+    up = text.upper()
+    return {
+        "words":   set(_WORD_RE.findall(up)),
+        "digits":  set(re.findall(r"\d{10,}", up)),
+        "amounts": {_amount(w, c) for w, c in _AMOUNT_RE.findall(up)},
+        "text":    up,
+    }
+
+
+def missing_tokens(tokens: dict, out: dict) -> dict:
+    """{category: sorted list of source tokens absent from the output}."""
+    missing = {}
+    for code in tokens["confirmations"]:
+        if code not in out["words"] and code not in out["text"]:
+            missing.setdefault("confirmations", []).append(code)
+    for tkt in tokens["tickets"]:
+        if tkt not in out["digits"]:
+            missing.setdefault("tickets", []).append(tkt)
+    for amt in tokens["amounts"]:
+        if amt not in out["amounts"]:
+            missing.setdefault("amounts", []).append(amt)
+    for name in tokens["names"]:
+        last, first = name.split("/", 1)
+        if last not in out["words"] or first not in out["words"]:
+            missing.setdefault("names", []).append(name)
+    return {c: sorted(v) for c, v in missing.items()}
+
+
+def doc_text(doc) -> str:
+    return "\n".join(page.get_text("text") for page in doc)
+
+
+def _pdf_text(path):
+    with fitz.open(path) as doc:
+        return doc_text(doc)
+
+
+def check_text(source_text: str, styled_text: str) -> dict:
+    """
+    Compare one source invoice's text against its styled output's. Returns
+    {"missing": {category: [tokens]}, "checked": {category: count}} —
+    an empty "missing" means every token was found.
+    """
+    tokens = source_tokens(source_text.split("\n"))
+    out = output_index(styled_text)
+    return {"missing": missing_tokens(tokens, out),
+            "checked": {c: len(tokens[c]) for c in CATEGORIES}}
+
+
+def check_pdf(source_pdf: str, styled_pdf: str) -> dict:
+    """check_text() for two PDF files."""
+    return check_text(_pdf_text(source_pdf), _pdf_text(styled_pdf))
+
+
+def format_missing(missing: dict, limit: int = 4) -> str:
+    """One line for the processing log: 'tickets: 0161234567890; amounts:
+    612.03, 98.10 (+3 more)'."""
+    parts = []
+    for c in CATEGORIES:
+        items = missing.get(c)
+        if not items:
+            continue
+        shown = ", ".join(items[:limit])
+        more = f" (+{len(items) - limit} more)" if len(items) > limit else ""
+        parts.append(f"{c}: {shown}{more}")
+    return "; ".join(parts)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python coverage_check.py <source.pdf> <styled.pdf>")
+        sys.exit(1)
+    result = check_pdf(sys.argv[1], sys.argv[2])
+    checked = ", ".join(f"{n} {c}" for c, n in result["checked"].items())
+    if result["missing"]:
+        print(f"Missing from styled output — {format_missing(result['missing'], limit=50)}")
+        print(f"(checked {checked})")
+        sys.exit(1)
+    print(f"All content found (checked {checked})")
@@ -0,0 +1,244 @@
+"""
+file_watchdog.py — Run each file's work in a child process that can be
+killed.
+
+One malformed or enormous PDF can hang fitz's text extraction, and a
+pathological line can stall state_parser — and with everything on one
+processing thread, the whole batch stopped there with no clue which file
+did it. IsolatedWorker runs the work in a separate process instead,
+with a watchdog in this one:
+
+  * a time limit per file (FILE_TIMEOUT, spanning every call made for
+    that file — the time a human spends in an airport prompt between
+    calls doesn't count)
+  * a memory ceiling (MEMORY_LIMIT_MB of resident memory, checked every
+    POLL_INTERVAL while a call runs)
+  * recycling: after RECYCLE_AFTER files the worker is replaced with a
+    fresh one, so slow leaks can't add up over an overnight run
+
+A worker that breaks a limit (or crashes outright) is killed and the
+call raises WatchdogError, whose message is the reason — the caller
+routes the file to errored_invoices/ and carries on with a new worker.
+
+The work itself is a module-level handler(op, args, log) named as
+"module:function" so the spawned child can import it; whatever it
+passes to log() comes back with the result.
+"""
+
+import sys
+import time
+import importlib
+import multiprocessing
+
+FILE_TIMEOUT    = 90      # seconds of work allowed per file
+MEMORY_LIMIT_MB = 1536    # resident memory ceiling for a worker
+RECYCLE_AFTER   = 40      # files per worker before it's replaced
+STARTUP_TIMEOUT = 60      # a fresh worker importing fitz/ReportLab on a slow laptop
+POLL_INTERVAL   = 0.25
+
+
+class WatchdogError(Exception):
+    """The worker was killed or died; str(e) is the reason."""
+    pass
+
+
+# ---------------------------------------------------------------------------
+# Resident memory of another process
+# ---------------------------------------------------------------------------
+def _rss_bytes(pid):
+    """Resident set size of pid in bytes, or None if it can't be read on
+    this platform (the memory ceiling is then simply not enforced)."""
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss
+    except ImportError:
+        pass
+    except Exception:
+        return None
+    if sys.platform.startswith("linux"):
+        try:
+            with open(f"/proc/{pid}/status", "r") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1]) * 1024
+        except (OSError, ValueError):
+            return None
+    if sys.platform == "win32":
+        return _rss_bytes_windows(pid)
+    return None
+
+
+def _rss_bytes_windows(pid):
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [("cb", wintypes.DWORD),
+                    ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t),
+                    ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t),
+                    ("PeakPagefileUsage", ctypes.c_size_t)]
+
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    PROCESS_VM_READ = 0x0010
+    kernel32 = ctypes.windll.kernel32
+    handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION | PROCESS_VM_READ,
+                                  False, pid)
+    if not handle:
+        return None
+    try:
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters),
+                                                    counters.cb):
+            return counters.WorkingSetSize
+        return None
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+# ---------------------------------------------------------------------------
+# Child side
+# ---------------------------------------------------------------------------
+def _worker_main(conn, handler_ref):
+    module, name = handler_ref.split(":")
+    handler = getattr(importlib.import_module(module), name)
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, OSError):
+            return
+        if msg is None:
+            return
+        op, args = msg
+        logs = []
+        try:
+            result = handler(op, args, logs.append)
+            conn.send(("ok", result, logs))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}", logs))
+
+
+# ---------------------------------------------------------------------------
+# Parent side
+# ---------------------------------------------------------------------------
+class IsolatedWorker:
+    """
+    worker.begin_file()                  # new per-file time budget
+    result = worker.call("analyze", args, log=print)
+    ...
+    worker.close()
+
+    call() returns the handler's result, re-raises a handler exception as
+    RuntimeError (the worker stays usable), and raises WatchdogError when
+    the worker had to be killed or died (a fresh one starts next file).
+    """
+
+    def __init__(self, handler_ref: str, timeout: float = FILE_TIMEOUT,
+                 memory_limit_mb: int = MEMORY_LIMIT_MB,
+                 recycle_after: int = RECYCLE_AFTER):
+        self.handler_ref = handler_ref
+        self.timeout = timeout
+        self.memory_limit = memory_limit_mb * 1024 * 1024 if memory_limit_mb else None
+        self.recycle_after = max(1, recycle_after)
+        self._ctx = multiprocessing.get_context("spawn")
+        self._proc = None
+        self._conn = None
+        self._files = 0
+        self._budget = timeout
+
+    # ── lifecycle ───────────────────────────────────────────────────
+    def _start(self):
+        parent_conn, child_conn = self._ctx.Pipe()
+        self._proc = self._ctx.Process(target=_worker_main,
+                                       args=(child_conn, self.handler_ref),
+                                       daemon=True)
+        self._proc.start()
+        child_conn.close()
+        self._conn = parent_conn
+        self._files = 0
+        # Imports happen now, outside any file's budget
+        self._budget = STARTUP_TIMEOUT
+        self.call("warm", ())
+
+    def _stop(self, kill=False):
+        if self._proc is None:
+            return
+        if not kill:
+            try:
+                self._conn.send(None)
+                self._proc.join(2)
+            except (OSError, ValueError):
+                pass
+        if self._proc.is_alive():
+            self._proc.kill()
+            self._proc.join(5)
+        try:
+            self._conn.close()
+        except OSError:
+            pass
+        self._proc = self._conn = None
+
+    def close(self):
+        self._stop()
+
+    def begin_file(self):
+        """Start the next file: recycle the worker if it's done its share
+        (or is gone), and reset the time budget."""
+        if self._proc is not None and (self._files >= self.recycle_after
+                                       or not self._proc.is_alive()):
+            self._stop()
+        if self._proc is None:
+            self._start()
+        self._files += 1
+        self._budget = self.timeout
+
+    # ── calls ───────────────────────────────────────────────────────
+    def call(self, op, args, log=None):
+        if self._proc is None:
+            self._start()
+        started = time.monotonic()
+        try:
+            self._conn.send((op, args))
+        except (OSError, ValueError) as e:
+            self._stop(kill=True)
+            raise WatchdogError(f"worker process unavailable ({e})")
+        while True:
+            try:
+                ready = self._conn.poll(POLL_INTERVAL)
+            except (OSError, EOFError):
+                ready = True        # recv() below reports what happened
+            if ready:
+                break
+            elapsed = time.monotonic() - started
+            if elapsed > self._budget:
+                self._stop(kill=True)
+                limit = self.timeout if op != "warm" else STARTUP_TIMEOUT
+                raise WatchdogError(f"took longer than {limit:g} s ({op}) — worker stopped")
+            if self.memory_limit:
+                rss = _rss_bytes(self._proc.pid)
+                if rss is not None and rss > self.memory_limit:
+                    self._stop(kill=True)
+                    raise WatchdogError(f"used more than {self.memory_limit // (1024 * 1024)} MB "
+                                        f"({op}) — worker stopped")
+            if not self._proc.is_alive():
+                break
+        self._budget -= time.monotonic() - started
+        try:
+            status, result, logs = self._conn.recv()
+        except (EOFError, OSError):
+            self._proc.join(1)
+            code = self._proc.exitcode
+            self._stop(kill=True)
+            raise WatchdogError(f"worker process died (exit code {code}) during {op}")
+        for line in logs:
+            if log:
+                log(line)
+        if status == "error":
+            raise RuntimeError(result)
+        return result
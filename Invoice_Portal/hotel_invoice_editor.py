@@ -20,7 +20,7 @@ try:
     import fitz
     from openpyxl import load_workbook
     from openpyxl.styles import Font, Alignment
-    from invoice_pdf import build_pdf
+    from hotel_invoice_index import FolderIndex
 except ImportError as e:
     _r = tk.Tk(); _r.withdraw()
     messagebox.showerror("Missing Dependencies",
@@ -64,10 +64,33 @@ FIELDS = [
     ("Pd. To Date",        "D30", True,     True,   False),
 ]
 
+# Sort choices for the queue-mode FIND box: label -> (cell, descending).
+# Totals default to high → low since that's what people scan for.
+SORT_OPTIONS = {
+    "Invoice #":    ("D3",  False),
+    "Guest":        ("A24", False),
+    "Hotel":        ("A17", False),
+    "Arrive":       ("D25", False),
+    "Depart":       ("D26", False),
+    "Total ↓":      ("D28", True),
+    "Total Due ↓":  ("D35", True),
+}
+
+# Caps how many matches the results list renders — the index itself can
+# hold thousands, but nobody scrolls past a few hundred rows.
+MAX_RESULTS_SHOWN = 500
+
 
 # ---------------------------------------------------------------------------
 # Read / write xlsx
 # ---------------------------------------------------------------------------
+def build_pdf(fields: dict, overlay_path: str, out_pdf: str):
+    """invoice_pdf.build_pdf, imported on the first export — ReportLab
+    isn't needed just to open a folder and edit workbooks."""
+    from invoice_pdf import build_pdf as _build_pdf
+    return _build_pdf(fields, overlay_path, out_pdf)
+
+
 def read_fields(xlsx_path: str) -> dict:
     wb = load_workbook(xlsx_path, data_only=True)
     ws = wb.active
@@ -124,6 +147,180 @@ def write_fields(src: str, values: dict, dst: str):
         raise
 
 
+# ---------------------------------------------------------------------------
+# Bulk edit / export
+# ---------------------------------------------------------------------------
+_MONEY_CELLS = {cell for _, cell, _e, is_money, _m in FIELDS if is_money}
+_SUBTOTAL_INPUTS = ("D28", "D29", "D30")
+
+
+def _money(raw) -> float:
+    if isinstance(raw, (int, float)):
+        return float(raw)
+    try:
+        return float(str(raw).replace("$", "").replace(",", "")) if raw else 0.0
+    except ValueError:
+        return 0.0
+
+
+def _same_value(cell: str, current, wanted) -> bool:
+    """Compare a stored cell value against a typed-in one the way a person
+    would — 100, 100.0 and "$100.00" are the same commission."""
+    if cell in _MONEY_CELLS:
+        return abs(_money(current) - _money(wanted)) < 0.005
+    return ("" if current is None else str(current)) == (wanted or "")
+
+
+def export_pdf_path(xlsx_path: str, values: dict) -> str:
+    """final_invoices/"{invoice#} {guest}.pdf" next to processed_invoices/ —
+    the same name a single Export PDF click produces."""
+    base_dir   = os.path.dirname(xlsx_path)
+    parent_dir = os.path.dirname(base_dir) \
+                 if os.path.basename(base_dir) == "processed_invoices" \
+                 else base_dir
+    final_dir  = os.path.join(parent_dir, "final_invoices")
+    guest_raw  = values.get("A24", "").strip()
+    first_line = guest_raw.splitlines()[0].strip() if guest_raw else ""
+    safe_guest = re.sub(r'[\\/*?:"<>|]', "_", first_line) if first_line \
+                 else "invoice"
+    invoice_no = values.get("D3", "").strip()
+    stem       = f"{invoice_no} {safe_guest}" if invoice_no else safe_guest
+    return os.path.join(final_dir, stem + ".pdf")
+
+
+def write_changed_fields(path: str, delta: dict):
+    """
+    Apply delta ({cell: new value}) to path in place, writing ONLY the
+    cells whose value actually differs — unlike write_fields(), which
+    rewrites every field in FIELDS. D31/D35 are recomputed only when one
+    of their inputs changed. If nothing differs the workbook isn't saved
+    at all (mtime untouched).
+
+    Returns (changed: bool, values: dict) — values are the file's
+    resulting FIELDS in read_fields() form, ready for build_pdf().
+    """
+    wb = load_workbook(path)
+    ws = wb.active
+
+    changed = []
+    for cell, wanted in delta.items():
+        c = ws[cell]
+        if _same_value(cell, c.value, wanted):
+            continue
+        c.value = _money(wanted) if cell in _MONEY_CELLS else wanted
+        c.font = Font(name=TNR, size=11, bold=c.font.bold, color=BLACK)
+        if cell in _MONEY_CELLS:
+            c.number_format = MONEY_FMT
+            c.alignment = Alignment(horizontal="right")
+        changed.append(cell)
+
+    if any(cell in _SUBTOTAL_INPUTS for cell in changed):
+        total, comm, pd_date = (_money(ws[c].value) for c in _SUBTOTAL_INPUTS)
+        subtotal = total - comm - pd_date
+        for coord in ("D31", "D35"):
+            c = ws[coord]
+            c.value = subtotal
+            c.number_format = MONEY_FMT
+            c.alignment = Alignment(horizontal="right")
+            c.font = Font(name=TNR, size=11, bold=(coord == "D35"), color=BLACK)
+
+    values = {cell: ("" if ws[cell].value is None else str(ws[cell].value))
+              for _, cell, *__ in FIELDS}
+
+    if changed:
+        # Same temp-file-then-move safety as write_fields(), minus its
+        # up-front copy: the workbook is already in memory, so the temp
+        # file is just the save target.
+        import tempfile
+        tmp_fd, tmp_path = tempfile.mkstemp(
+            suffix=".xlsx", dir=os.path.dirname(os.path.abspath(path)))
+        os.close(tmp_fd)
+        try:
+            wb.save(tmp_path)
+            shutil.copymode(path, tmp_path)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    wb.close()
+    return bool(changed), values
+
+
+def bulk_apply(paths, delta: dict, export_pdf: bool = False,
+               overlay_path: str = None, indexed_fields=None,
+               max_workers: int = None, progress=None) -> dict:
+    """
+    Apply the same field delta to many invoices at once, optionally
+    exporting every PDF in the same pass.
+
+    indexed_fields(path), if given, returns that file's current values
+    from the folder index (or None if it has no up-to-date entry) — any
+    file whose indexed values already match the delta is skipped without
+    opening the workbook at all (unless a PDF export needs its full
+    field set anyway).
+
+    Files run on a thread pool. progress(done, total, path), if given,
+    is called from worker threads after each file.
+
+    Returns {"changed": [...], "unchanged": [...], "exported": [...],
+             "failed": [(path, error), ...]}.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    delta = {cell: value for cell, value in delta.items()
+             if cell in {c for _, c, *__ in FIELDS}}
+    result = {"changed": [], "unchanged": [], "exported": [], "failed": []}
+    if not paths or (not delta and not export_pdf):
+        return result
+    if export_pdf and not overlay_path:
+        raise ValueError("overlay_path is required to export PDFs")
+
+    # Two workbooks with the same invoice# and guest both map to one
+    # export_pdf_path — give the second "(1)", as generate_invoices does
+    used_names = {}
+    names_lock = threading.Lock()
+
+    def _claim(out_pdf):
+        stem, ext = os.path.splitext(out_pdf)
+        key = os.path.normcase(out_pdf)
+        with names_lock:
+            count = used_names.get(key, 0)
+            used_names[key] = count + 1
+        return out_pdf if count == 0 else f"{stem} ({count}){ext}"
+
+    def _one(path):
+        if not export_pdf and indexed_fields is not None:
+            known = indexed_fields(path)
+            if known is not None and all(
+                    cell in known and _same_value(cell, known[cell], v)
+                    for cell, v in delta.items()):
+                return path, False, None
+        changed, values = write_changed_fields(path, delta)
+        out_pdf = None
+        if export_pdf:
+            out_pdf = _claim(export_pdf_path(path, values))
+            os.makedirs(os.path.dirname(out_pdf), exist_ok=True)
+            build_pdf(values, overlay_path, out_pdf)
+        return path, changed, out_pdf
+
+    workers = max_workers or min(8, (os.cpu_count() or 2) * 2)
+    total = len(paths)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_one, p): p for p in paths}
+        for done, fut in enumerate(as_completed(futures), 1):
+            path = futures[fut]
+            try:
+                _, changed, out_pdf = fut.result()
+                result["changed" if changed else "unchanged"].append(path)
+                if out_pdf:
+                    result["exported"].append(out_pdf)
+            except Exception as e:
+                result["failed"].append((path, str(e)))
+            if progress:
+                progress(done, total, path)
+    return result
+
 
 # ---------------------------------------------------------------------------
 # Editor window
@@ -166,12 +363,29 @@ class InvoiceEditorWindow:
         self._modified    = False
         self._overlay_path = _asset("overlay.pdf")
 
+        # One sidecar index per folder the queue draws from (normally just
+        # the single processed_invoices/ folder). Loading the sidecar is a
+        # single JSON read; the refresh that catches up on new/changed
+        # files runs in the background once the window is up.
+        self._indexes = []
+        self._result_paths = []
+        self._search_after_id = None
+        if self._queue:
+            folders = []
+            for p in self._queue:
+                d = os.path.dirname(os.path.abspath(p))
+                if d not in folders:
+                    folders.append(d)
+            self._indexes = [FolderIndex(d) for d in folders]
+
         self._draw_logo()
         self._setup_ui()
 
         # Load first file
         if self._queue:
             self._goto(0)
+            self._run_search()
+            self._refresh_indexes()
         elif initial_path and os.path.exists(initial_path):
             self._load_file(initial_path)
 
@@ -201,6 +415,7 @@ class InvoiceEditorWindow:
             tk.Label(top, textvariable=self.xlsx_path,
                      font=("Consolas", 10),
                      bg=self.CLR_BG, fg="#888888").pack(anchor="w")
+            self._build_search_panel(top)
         else:
             # Single / standalone mode: browse row
             tk.Label(top, text="INVOICE FILE  (.xlsx)",
@@ -284,6 +499,17 @@ class InvoiceEditorWindow:
             pady=9, padx=16, bd=0)
         self.pdf_btn.pack(side="left", padx=(0, 8))
 
+        # Bulk edit (queue mode) — one delta applied to many invoices
+        if self._queue:
+            self.bulk_btn = tk.Button(
+                btn_area, text="Bulk Edit…",
+                command=self._open_bulk_dialog,
+                relief="flat", cursor="hand2",
+                bg=self.CLR_BTN, fg="#000000",
+                activebackground=self.CLR_BTN_ACT,
+                font=("Arial", 11, "bold"),
+                pady=9, padx=16, bd=0)
+            self.bulk_btn.pack(side="left", padx=(0, 8))
 
         # Queue navigation (right-aligned)
         if self._queue:
@@ -310,6 +536,137 @@ class InvoiceEditorWindow:
 
             self._update_nav_buttons()
 
+    # ------------------------------------------------------------------
+    def _build_search_panel(self, parent):
+        """FIND box + sort + results list over the folder index (queue
+        mode only). Picking a result jumps straight to that invoice."""
+        self.search_var       = tk.StringVar()
+        self.sort_var         = tk.StringVar(value=next(iter(SORT_OPTIONS)))
+        self.index_status_var = tk.StringVar(value="Indexing…")
+
+        row = tk.Frame(parent, bg=self.CLR_BG)
+        row.pack(fill="x", pady=(10, 0))
+        tk.Label(row, text="FIND", font=("Arial", 10, "bold"),
+                 bg=self.CLR_BG, fg=self.CLR_MUTED).pack(side="left")
+        box = tk.Frame(row, bg=self.CLR_PANEL,
+                       highlightbackground=self.CLR_BORDER,
+                       highlightthickness=1)
+        box.pack(side="left", fill="x", expand=True, padx=(8, 8))
+        tk.Entry(box, textvariable=self.search_var,
+                 relief="flat", bd=0,
+                 bg=self.CLR_PANEL, fg=self.CLR_TEXT,
+                 insertbackground=self.CLR_TEXT,
+                 font=("Consolas", 10)).pack(fill="x", padx=8, pady=4)
+        tk.Label(row, text="Sort", font=("Arial", 9),
+                 bg=self.CLR_BG, fg=self.CLR_MUTED).pack(side="left")
+        ttk.Combobox(row, textvariable=self.sort_var,
+                     values=list(SORT_OPTIONS), state="readonly",
+                     width=12, font=("Arial", 9)).pack(side="left", padx=(6, 8))
+        tk.Label(row, textvariable=self.index_status_var,
+                 font=("Arial", 8), bg=self.CLR_BG,
+                 fg="#888888").pack(side="left")
+
+        lf = tk.Frame(parent, highlightbackground=self.CLR_BORDER,
+                      highlightthickness=1, bg=self.CLR_BORDER)
+        lf.pack(fill="x", pady=(4, 0))
+        self.results_list = tk.Listbox(
+            lf, height=5, font=("Consolas", 9),
+            relief="flat", bd=0, activestyle="none",
+            bg=self.CLR_PANEL, fg=self.CLR_TEXT,
+            selectbackground="#dceefb", selectforeground="#000000")
+        rsb = ttk.Scrollbar(lf, orient="vertical",
+                            command=self.results_list.yview)
+        self.results_list.configure(yscrollcommand=rsb.set)
+        self.results_list.pack(side="left", fill="x", expand=True)
+        rsb.pack(side="right", fill="y")
+        self.results_list.bind("<<ListboxSelect>>", self._on_result_select)
+
+        self.search_var.trace_add("write", lambda *_: self._schedule_search())
+        self.sort_var.trace_add("write", lambda *_: self._schedule_search())
+
+    def _refresh_indexes(self):
+        """Catch each folder index up with new/changed files on a
+        background thread; the results list updates when they finish."""
+        pending = [len(self._indexes)]
+
+        def _count_down():
+            # Tk thread only — the refresh threads finish in any order,
+            # possibly at the same moment
+            pending[0] -= 1
+            if pending[0] == 0:
+                self._on_indexes_ready()
+
+        def _one_done(_count):
+            self.root.after(0, _count_down)
+
+        for idx in self._indexes:
+            idx.refresh_in_background(on_done=_one_done)
+
+    def _on_indexes_ready(self):
+        total = sum(len(idx) for idx in self._indexes)
+        self.index_status_var.set(f"{total} indexed")
+        self._run_search()
+
+    def _index_for(self, path):
+        d = os.path.dirname(os.path.abspath(path))
+        for idx in self._indexes:
+            if idx.folder == d:
+                return idx
+        return None
+
+    def _schedule_search(self):
+        # Debounced like the airport manager's search box — typing a name
+        # shouldn't re-sort thousands of rows on every keystroke.
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(120, self._run_search)
+
+    def _run_search(self):
+        self._search_after_id = None
+        if not hasattr(self, "results_list"):
+            return
+        cell, descending = SORT_OPTIONS.get(self.sort_var.get(), ("D3", False))
+        query = self.search_var.get()
+        results = []
+        for idx in self._indexes:
+            results.extend(idx.search(query, sort_cell=cell, descending=descending))
+        if len(self._indexes) > 1:
+            from hotel_invoice_index import sort_value
+            results.sort(key=lambda r: sort_value(cell, r[1].get(cell, "")),
+                         reverse=descending)
+
+        self.results_list.delete(0, tk.END)
+        self._result_paths = []
+        for path, f in results[:MAX_RESULTS_SHOWN]:
+            guest = (f.get("A24") or "").strip().splitlines()
+            guest = guest[0] if guest else ""
+            line = (f"{f.get('D3', ''):<8.8} {guest:<22.22} "
+                    f"{f.get('A17', ''):<24.24} {f.get('D25', ''):<10.10} "
+                    f"{f.get('D28', ''):>10.10}")
+            self.results_list.insert(tk.END, line)
+            self._result_paths.append(path)
+
+        if self._indexes and self.index_status_var.get() != "Indexing…":
+            shown = len(self._result_paths)
+            more = f" of {len(results)}" if len(results) > shown else ""
+            self.index_status_var.set(f"{shown}{more} match(es)")
+
+    def _on_result_select(self, _event=None):
+        sel = self.results_list.curselection()
+        if not sel or sel[0] >= len(self._result_paths):
+            return
+        path = self._result_paths[sel[0]]
+        norm = [os.path.abspath(p) for p in self._queue]
+        if os.path.abspath(path) in norm:
+            index = norm.index(os.path.abspath(path))
+        else:
+            # In the folder but not in this queue (e.g. generated after the
+            # editor was opened) — append it rather than refuse to open it.
+            self._queue.append(path)
+            index = len(self._queue) - 1
+        if index != self._q_index:
+            self._goto(index)
+
     # ------------------------------------------------------------------
     def _build_form(self):
         for w in self.form_frame.winfo_children():
@@ -463,6 +820,9 @@ class InvoiceEditorWindow:
         try:
             write_fields(path, self._collect_values(), path)
             self._modified = False
+            idx = self._index_for(path)
+            if idx is not None:
+                idx.update_file(path)
             self.status_lbl.config(fg="#1a7a1a")
             self.status_var.set(f"✓  Saved: {os.path.basename(path)}")
         except Exception as e:
@@ -499,23 +859,10 @@ class InvoiceEditorWindow:
                 messagebox.showerror("Error", f"Could not save before export:\n{e}")
                 return
 
-        # Output folder: final_invoices/ next to processed_invoices/
-        base_dir   = os.path.dirname(path)
-        parent_dir = os.path.dirname(base_dir) \
-                     if os.path.basename(base_dir) == "processed_invoices" \
-                     else base_dir
-        final_dir  = os.path.join(parent_dir, "final_invoices")
-        os.makedirs(final_dir, exist_ok=True)
-
-        # Filename: "{invoice#} {guest name}.pdf"
-        vals       = self._collect_values()
-        guest_raw  = vals.get("A24", "").strip()
-        first_line = guest_raw.splitlines()[0].strip() if guest_raw else ""
-        safe_guest = re.sub(r'[\\/*?:"<>|]', "_", first_line) if first_line \
-                     else "invoice"
-        invoice_no = vals.get("D3", "").strip()
-        stem       = f"{invoice_no} {safe_guest}" if invoice_no else safe_guest
-        out_pdf    = os.path.join(final_dir, stem + ".pdf")
+        # Output: final_invoices/"{invoice#} {guest name}.pdf" next to
+        # processed_invoices/
+        out_pdf = export_pdf_path(path, self._collect_values())
+        os.makedirs(os.path.dirname(out_pdf), exist_ok=True)
 
         self.pdf_btn.config(state="disabled", text="⏳  Exporting…", bg="#555555")
         self.status_lbl.config(fg=self.CLR_MUTED)
@@ -554,6 +901,158 @@ class InvoiceEditorWindow:
         self.status_var.set("Export failed.")
         messagebox.showerror("Export Failed", str(err))
 
+    # ------------------------------------------------------------------
+    def _open_bulk_dialog(self):
+        """
+        Apply the same values to many invoices at once. Blank fields are
+        left alone; filled ones are written to every invoice in scope
+        (the whole queue, or just what the FIND box currently matches).
+        """
+        if self._modified:
+            ans = messagebox.askyesnocancel(
+                "Unsaved Changes",
+                f"{os.path.basename(self.xlsx_path.get())} has unsaved changes.\n\n"
+                "Save before bulk editing?")
+            if ans is None:
+                return
+            if ans:
+                self._save_xlsx(silent=True)
+
+        dlg = tk.Toplevel(self.root)
+        dlg.title("Bulk Edit")
+        dlg.configure(bg=self.CLR_BG)
+        dlg.transient(self.root)
+        dlg.resizable(False, False)
+
+        tk.Label(dlg, text="Leave a field blank to keep each invoice's own value.",
+                 font=("Arial", 9), bg=self.CLR_BG,
+                 fg=self.CLR_MUTED).pack(anchor="w", padx=16, pady=(14, 6))
+
+        grid = tk.Frame(dlg, bg=self.CLR_BG)
+        grid.pack(fill="x", padx=16)
+        bulk_vars = {}
+        for r, (label, cell, editable, is_money, multiline) in enumerate(FIELDS):
+            if not editable or multiline:
+                continue
+            tk.Label(grid, text=label, font=("Arial", 10),
+                     bg=self.CLR_BG, fg=self.CLR_MUTED,
+                     width=18, anchor="e").grid(row=r, column=0, padx=(0, 10), pady=2)
+            var = tk.StringVar()
+            tk.Entry(grid, textvariable=var, width=30,
+                     relief="flat", bd=0,
+                     bg=self.CLR_PANEL, fg=self.CLR_TEXT,
+                     highlightbackground=self.CLR_BORDER, highlightthickness=1,
+                     font=("Consolas", 10)).grid(row=r, column=1, pady=2, sticky="w")
+            bulk_vars[cell] = var
+
+        n_matches = len(self._result_paths)
+        scope_var  = tk.StringVar(value="queue")
+        export_var = tk.BooleanVar(value=False)
+        opts = tk.Frame(dlg, bg=self.CLR_BG)
+        opts.pack(fill="x", padx=16, pady=(10, 0))
+        tk.Radiobutton(opts, text=f"All {len(self._queue)} invoice(s) in this queue",
+                       variable=scope_var, value="queue",
+                       bg=self.CLR_BG, font=("Arial", 10)).pack(anchor="w")
+        tk.Radiobutton(opts, text=f"Only the {n_matches} FIND match(es)",
+                       variable=scope_var, value="matches",
+                       state="normal" if n_matches else "disabled",
+                       bg=self.CLR_BG, font=("Arial", 10)).pack(anchor="w")
+        tk.Checkbutton(opts, text="Export PDFs too",
+                       variable=export_var,
+                       bg=self.CLR_BG, font=("Arial", 10)).pack(anchor="w", pady=(6, 0))
+
+        def _apply():
+            delta = {cell: v.get().strip() for cell, v in bulk_vars.items()
+                     if v.get().strip()}
+            export = export_var.get()
+            if not delta and not export:
+                messagebox.showinfo("Bulk Edit", "Nothing to change.", parent=dlg)
+                return
+            overlay = None
+            if export:
+                overlay = self._resolve_overlay()
+                if not overlay:
+                    return
+            paths = list(self._result_paths) if scope_var.get() == "matches" \
+                    else list(self._queue)
+            dlg.destroy()
+            self._run_bulk(paths, delta, export, overlay)
+
+        btns = tk.Frame(dlg, bg=self.CLR_BG)
+        btns.pack(fill="x", padx=16, pady=14)
+        tk.Button(btns, text="Apply", command=_apply,
+                  relief="flat", cursor="hand2",
+                  bg=self.CLR_BTN, fg="#000000",
+                  activebackground=self.CLR_BTN_ACT,
+                  font=("Arial", 10, "bold"), padx=14, pady=6, bd=0).pack(side="right")
+        tk.Button(btns, text="Cancel", command=dlg.destroy,
+                  relief="flat", cursor="hand2",
+                  bg=self.CLR_BTN, fg="#000000",
+                  activebackground=self.CLR_BTN_ACT,
+                  font=("Arial", 10), padx=14, pady=6, bd=0).pack(side="right", padx=(0, 8))
+        dlg.grab_set()
+
+    def _run_bulk(self, paths, delta, export, overlay):
+        self.bulk_btn.config(state="disabled", text="⏳  Working…")
+        self.save_btn.config(state="disabled")
+        self.pdf_btn.config(state="disabled")
+        self.status_lbl.config(fg=self.CLR_MUTED)
+        self.status_var.set(f"Bulk edit: 0 / {len(paths)}…")
+
+        def _indexed(path):
+            idx = self._index_for(path)
+            return idx.fields_for(path) if idx is not None else None
+
+        def _progress(done, total, _path):
+            self.root.after(0, lambda: self.status_var.set(
+                f"Bulk edit: {done} / {total}…"))
+
+        def _do():
+            try:
+                result = bulk_apply(paths, delta, export_pdf=export,
+                                    overlay_path=overlay,
+                                    indexed_fields=_indexed,
+                                    progress=_progress)
+                for idx in self._indexes:
+                    for p in result["changed"]:
+                        if idx.folder == os.path.dirname(os.path.abspath(p)):
+                            idx.update_file(p, save=False)
+                    idx.save()
+                self.root.after(0, lambda: self._bulk_done(result))
+            except Exception as e:
+                self.root.after(0, lambda err=e: self._bulk_done(None, err))
+
+        threading.Thread(target=_do, daemon=True).start()
+
+    def _bulk_done(self, result, err=None):
+        self.bulk_btn.config(state="normal", text="Bulk Edit…")
+        self.save_btn.config(state="normal")
+        self.pdf_btn.config(state="normal")
+        if result is None:
+            self.status_lbl.config(fg="#cc0000")
+            self.status_var.set("Bulk edit failed.")
+            messagebox.showerror("Bulk Edit Failed", str(err))
+            return
+
+        # Current file may have just been rewritten underneath the form.
+        if self._queue and 0 <= self._q_index < len(self._queue):
+            self._load_file(self._queue[self._q_index])
+        self._run_search()
+
+        failed = result["failed"]
+        summary = (f"{len(result['changed'])} updated, "
+                   f"{len(result['unchanged'])} already matched")
+        if result["exported"]:
+            summary += f", {len(result['exported'])} PDF(s) exported"
+        if failed:
+            summary += f", {len(failed)} failed"
+        self.status_lbl.config(fg="#cc0000" if failed else "#1a7a1a")
+        self.status_var.set(f"✓  Bulk edit: {summary}")
+        if failed:
+            detail = "\n".join(f"{os.path.basename(p)}: {e}" for p, e in failed[:10])
+            more = f"\n…and {len(failed) - 10} more" if len(failed) > 10 else ""
+            messagebox.showwarning("Bulk Edit", f"{summary}.\n\n{detail}{more}")
+
     # ------------------------------------------------------------------
     def run(self):
         if self.standalone:
@@ -565,4 +1064,12 @@ class InvoiceEditorWindow:
 # ---------------------------------------------------------------------------
 if __name__ == "__main__":
     initial = sys.argv[1] if len(sys.argv) > 1 else None
-    InvoiceEditorWindow(initial_path=initial).run()
+    if initial and os.path.isdir(initial):
+        # A folder: queue mode over every invoice in it, with the FIND box.
+        folder_queue = sorted(os.path.join(initial, f)
+                              for f in os.listdir(initial)
+                              if f.lower().endswith(".xlsx")
+                              and not f.startswith("~$"))
+        InvoiceEditorWindow(queue=folder_queue).run()
+    else:
+        InvoiceEditorWindow(initial_path=initial).run()
@@ -0,0 +1,299 @@
+"""
+hotel_invoice_index.py — Per-folder index of generated hotel invoices.
+
+The editor used to know nothing about a folder beyond the list of .xlsx
+names in it: finding "the Smith invoice at the Westin" meant opening
+workbooks one at a time until the right one came up. This keeps a small
+sidecar file (.invoice_index.json) next to the invoices with the handful
+of fields people actually search and sort by — invoice #, guest, hotel,
+dates, totals — so a lookup is a scan over an in-memory list instead of
+a full openpyxl load per file.
+
+The sidecar is keyed by filename and stamped with each file's mtime and
+size, so a refresh only re-reads workbooks that were added or changed
+since the last one (a season's worth of untouched invoices costs a few
+thousand os.stat() calls, nothing more). Safe to delete at any time — it
+just gets rebuilt on the next refresh.
+"""
+
+import os
+import re
+import json
+import threading
+
+from openpyxl import load_workbook
+
+INDEX_FILENAME = ".invoice_index.json"
+INDEX_VERSION  = 1
+
+# Cells captured per invoice — the same cell addresses hotel_invoice_editor
+# uses in FIELDS, so an indexed value can be compared directly against
+# read_fields() output. D35 (TOTAL DUE) isn't an editable field, but it's
+# the number people actually look for.
+INDEX_CELLS = ("D3", "D4", "D5", "D7", "A17", "D23", "A24",
+               "D25", "D26", "D27", "D28", "D29", "D30", "D35")
+
+MONEY_CELLS = {"D27", "D28", "D29", "D30", "D35"}
+DATE_CELLS  = {"D4", "D25", "D26"}
+
+# Rows/columns actually touched by INDEX_CELLS — bounds the read_only
+# row scan below so a workbook with stray content far down the sheet
+# doesn't cost more to index than a clean one.
+_MAX_ROW = 35
+_MAX_COL = 4
+
+
+def _cell_str(value) -> str:
+    """Same conversion hotel_invoice_editor.read_fields() applies."""
+    return "" if value is None else str(value)
+
+
+def read_index_fields(xlsx_path: str) -> dict:
+    """
+    Read just INDEX_CELLS from one workbook. Uses openpyxl's read_only
+    mode with a bounded row scan — several times faster than the full
+    load_workbook() the editor needs for writing, and it never builds
+    style objects for the rest of the sheet.
+    """
+    wanted = set(INDEX_CELLS)
+    values = {cell: "" for cell in INDEX_CELLS}
+    wb = load_workbook(xlsx_path, read_only=True, data_only=True)
+    try:
+        ws = wb.active
+        for r, row in enumerate(ws.iter_rows(min_row=1, max_row=_MAX_ROW,
+                                             max_col=_MAX_COL,
+                                             values_only=True), start=1):
+            for c, value in enumerate(row):
+                coord = f"{'ABCD'[c]}{r}"
+                if coord in wanted:
+                    values[coord] = _cell_str(value)
+    finally:
+        wb.close()
+    return values
+
+
+def _money_key(raw: str):
+    try:
+        return float(raw.replace("$", "").replace(",", "")) if raw else 0.0
+    except ValueError:
+        return 0.0
+
+
+def _date_key(raw: str):
+    """MM/DD/YY(YY) → (year, month, day) so dates sort chronologically;
+    anything else (an ISO datetime from a date-typed cell, free text)
+    falls back to sorting as text after every parseable date."""
+    m = re.match(r"\s*(\d{1,2})/(\d{1,2})/(\d{2,4})", raw or "")
+    if not m:
+        m_iso = re.match(r"\s*(\d{4})-(\d{2})-(\d{2})", raw or "")
+        if m_iso:
+            return (0, int(m_iso.group(1)), int(m_iso.group(2)),
+                    int(m_iso.group(3)), "")
+        return (1, 0, 0, 0, (raw or "").lower())
+    month, day, year = (int(g) for g in m.groups())
+    if year < 100:
+        year += 2000
+    return (0, year, month, day, "")
+
+
+def sort_value(cell: str, raw: str):
+    if cell in MONEY_CELLS:
+        return _money_key(raw)
+    if cell in DATE_CELLS:
+        return _date_key(raw)
+    if cell == "D3":
+        # Invoice numbers are numeric text — "99" should come before "100".
+        digits = re.sub(r"\D", "", raw or "")
+        return (int(digits) if digits else 0, (raw or "").lower())
+    return (raw or "").lower()
+
+
+class FolderIndex:
+    """
+    In-memory view of one folder's invoices, backed by the sidecar file.
+
+    Thread-safe: refresh() is meant to run on a background thread while
+    the editor keeps calling search() from the Tk thread.
+    """
+
+    def __init__(self, folder: str):
+        self.folder = os.path.abspath(folder)
+        self.path = os.path.join(self.folder, INDEX_FILENAME)
+        self._entries = {}      # filename -> {"mtime": ns, "size": n, "fields": {...}}
+        self._haystacks = {}    # filename -> lowercased searchable text (not persisted)
+        self._lock = threading.Lock()
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Sidecar persistence
+    # ------------------------------------------------------------------
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        if raw.get("version") != INDEX_VERSION:
+            return
+        entries = raw.get("files") or {}
+        with self._lock:
+            self._entries = {name: e for name, e in entries.items()
+                             if isinstance(e, dict) and "fields" in e}
+            self._haystacks.clear()
+
+    def save(self) -> bool:
+        """Atomic write (tmp file + os.replace), same as the airport
+        overrides file — a crash mid-save leaves the previous index."""
+        with self._lock:
+            payload = {"version": INDEX_VERSION, "files": dict(self._entries)}
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+            return True
+        except OSError:
+            return False
+
+    # ------------------------------------------------------------------
+    # Building / incremental refresh
+    # ------------------------------------------------------------------
+    def _xlsx_names(self):
+        try:
+            names = os.listdir(self.folder)
+        except OSError:
+            return []
+        # "~$..." are Excel's own lock files for a workbook that's open.
+        return [n for n in names
+                if n.lower().endswith(".xlsx") and not n.startswith("~$")]
+
+    def refresh(self, progress=None, stop_event=None) -> int:
+        """
+        Bring the index up to date with the folder. Only files whose
+        mtime/size changed (or that are new) get opened. Returns the
+        number of entries added, changed, or removed. progress(done,
+        total), if given, is called after each file that had to be read.
+        """
+        names = self._xlsx_names()
+        with self._lock:
+            known = dict(self._entries)
+
+        stale = []
+        for name in names:
+            try:
+                st = os.stat(os.path.join(self.folder, name))
+            except OSError:
+                continue
+            e = known.get(name)
+            if not e or e.get("mtime") != st.st_mtime_ns or e.get("size") != st.st_size:
+                stale.append((name, st))
+
+        removed = set(known) - set(names)
+        changed = 0
+        for done, (name, st) in enumerate(stale, 1):
+            if stop_event is not None and stop_event.is_set():
+                break
+            try:
+                fields = read_index_fields(os.path.join(self.folder, name))
+            except Exception:
+                # Half-written, corrupt, or not really a workbook — leave
+                # it out rather than fail the whole refresh; it's retried
+                # on the next one since it still has no entry.
+                continue
+            with self._lock:
+                self._entries[name] = {"mtime": st.st_mtime_ns,
+                                       "size": st.st_size, "fields": fields}
+                self._haystacks.pop(name, None)
+            changed += 1
+            if progress:
+                progress(done, len(stale))
+
+        if removed:
+            with self._lock:
+                for name in removed:
+                    self._entries.pop(name, None)
+                    self._haystacks.pop(name, None)
+
+        if changed or removed:
+            self.save()
+        return changed + len(removed)
+
+    def refresh_in_background(self, on_done=None):
+        """Run refresh() on a daemon thread. on_done(count) is called from
+        that thread — GUI callers should hop back via root.after()."""
+        def _run():
+            try:
+                count = self.refresh()
+            except Exception:
+                count = 0
+            if on_done:
+                on_done(count)
+        t = threading.Thread(target=_run, daemon=True)
+        t.start()
+        return t
+
+    def update_file(self, path: str, save: bool = True):
+        """Re-index a single file right after the editor saved it, so the
+        search list doesn't show the pre-edit values until the next full
+        refresh."""
+        name = os.path.basename(path)
+        try:
+            st = os.stat(path)
+            fields = read_index_fields(path)
+        except Exception:
+            return
+        with self._lock:
+            self._entries[name] = {"mtime": st.st_mtime_ns,
+                                   "size": st.st_size, "fields": fields}
+            self._haystacks.pop(name, None)
+        if save:
+            self.save()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def fields_for(self, path: str):
+        """Indexed values for path, but only if the entry is still current
+        (same mtime/size as the file on disk) — otherwise None."""
+        name = os.path.basename(path)
+        with self._lock:
+            e = self._entries.get(name)
+        if not e:
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if e.get("mtime") != st.st_mtime_ns or e.get("size") != st.st_size:
+            return None
+        return dict(e["fields"])
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def search(self, query: str = "", sort_cell: str = "D3",
+               descending: bool = False) -> list:
+        """
+        Every whitespace-separated word of query must appear (case-
+        insensitive substring) somewhere in the invoice's indexed fields —
+        "smith westin" finds the Smith invoice at the Westin. Returns
+        [(full_path, fields), ...] sorted by sort_cell.
+        """
+        words = (query or "").lower().split()
+        with self._lock:
+            items = list(self._entries.items())
+            results = []
+            for name, e in items:
+                if words:
+                    hay = self._haystacks.get(name)
+                    if hay is None:
+                        hay = " ".join([name.lower()] + [
+                            (v or "").lower() for v in e["fields"].values()])
+                        self._haystacks[name] = hay
+                    if not all(w in hay for w in words):
+                        continue
+                results.append((os.path.join(self.folder, name), e["fields"]))
+        results.sort(key=lambda r: sort_value(sort_cell, r[1].get(sort_cell, "")),
+                     reverse=descending)
+        return results
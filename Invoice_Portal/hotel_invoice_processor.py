@@ -13,8 +13,13 @@ from tkinter import filedialog, messagebox, scrolledtext, ttk
 
 # Editor is imported lazily to avoid circular issues and keep startup fast
 
+# pandas is checked for here but only imported by load_hotels_data() —
+# it's the single slowest import in the app, and opening this screen
+# shouldn't wait on it before the user has even picked a report.
 try:
-    import pandas as pd
+    import importlib.util
+    if importlib.util.find_spec("pandas") is None:
+        raise ImportError("No module named 'pandas'")
     from openpyxl import load_workbook
 except ImportError as e:
     root = tk.Tk()
@@ -51,6 +56,7 @@ TEMPLATES = {
 # Parse Hotels report (all sheets)
 # ---------------------------------------------------------------------------
 def load_hotels_data(hotels_path: str) -> "pd.DataFrame":
+    import pandas as pd
     df = pd.read_excel(hotels_path, sheet_name=0, header=None)
     rows = []
 
@@ -224,6 +230,75 @@ def fill_invoice(template_path: str, row: dict, output_path: str):
     wb.save(output_path)
 
 
+# ---------------------------------------------------------------------------
+# The whole batch, without the window
+# ---------------------------------------------------------------------------
+def output_dir_for(hotels_path: str) -> str:
+    """Processed invoices are saved alongside the Hotels report file."""
+    return os.path.join(os.path.dirname(hotels_path), "processed_invoices")
+
+
+def generate_invoices(hotels_path: str, template_path: str, output_dir: str = None,
+                      log=None, on_rows=None) -> dict:
+    """
+    One filled invoice .xlsx per data row of the Hotels report. Used by
+    HotelInvoiceGUI._process and benchmarks/bench_hotels.py.
+
+    on_rows(total) is called once the report is loaded. Returns
+    {"rows", "successful", "failed", "skipped", "output_dir",
+    "outputs": [path, ...]}.
+    """
+    log = log or (lambda _msg: None)
+    output_dir = output_dir or output_dir_for(hotels_path)
+    os.makedirs(output_dir, exist_ok=True)
+    summary = {"rows": 0, "successful": 0, "failed": 0, "skipped": 0,
+               "output_dir": output_dir, "outputs": []}
+    log(f"Template  : {os.path.basename(template_path)}")
+    log(f"Output    : {output_dir}\n")
+
+    log("Loading Hotels report...")
+    df = load_hotels_data(hotels_path)
+    log(f"Found {len(df)} data rows.")
+
+    if df.empty:
+        log("⚠  No data rows found. Verify the Hotels file format.")
+        return summary
+
+    summary["rows"] = total_rows = len(df)
+    log(f"Rows to process: {total_rows}\n")
+    if on_rows:
+        on_rows(total_rows)
+
+    used_names = {}  # track filename collisions → append suffix
+
+    for _, row in df.iterrows():
+        invoice_no = str(row.get("Invoice", "")).strip()
+        if not invoice_no or invoice_no in ("nan", "NaN", ""):
+            summary["skipped"] += 1
+            continue
+
+        last = last_name_only(row.get("Traveler", ""))
+        safe = re.sub(r'[\\/*?:"<>|]', "_", invoice_no.lstrip("0"))
+        base = f"{safe} {last}" if last else safe
+
+        # Avoid overwriting if same invoice# appears on multiple rows
+        count = used_names.get(base, 0)
+        used_names[base] = count + 1
+        fname = f"{base}.xlsx" if count == 0 else f"{base} ({count}).xlsx"
+        out_path = os.path.join(output_dir, fname)
+
+        log(f"[{invoice_no.lstrip('0')}]  {last}  →  {fname}")
+        try:
+            fill_invoice(template_path, row.to_dict(), out_path)
+            log("  ✓  Saved")
+            summary["successful"] += 1
+            summary["outputs"].append(out_path)
+        except Exception as e:
+            log(f"  ✗  Error: {e}")
+            summary["failed"] += 1
+    return summary
+
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
@@ -436,51 +511,15 @@ class HotelInvoiceGUI:
             hotels_path   = self.hotels_file.get()
             template_path = TEMPLATES[self.template_label.get()]
 
-            # Save processed invoices alongside the Hotels report file
-            output_dir = os.path.join(os.path.dirname(hotels_path), "processed_invoices")
-            os.makedirs(output_dir, exist_ok=True)
-            self.log(f"Template  : {os.path.basename(template_path)}")
-            self.log(f"Output    : {output_dir}\n")
-
-            self.log("Loading Hotels report...")
-            df = load_hotels_data(hotels_path)
-            self.log(f"Found {len(df)} data rows.")
-
-            if df.empty:
-                self.log("⚠  No data rows found. Verify the Hotels file format.")
+            result = generate_invoices(
+                hotels_path, template_path, log=self.log,
+                on_rows=lambda n: self.stats_var.set(f"Rows found: {n}"))
+            if not result["rows"]:
                 return
-
-            total_rows = len(df)
-            self.log(f"Rows to process: {total_rows}\n")
-            self.stats_var.set(f"Rows found: {total_rows}")
-
-            successful = failed = skipped = 0
-            used_names = {}  # track filename collisions → append suffix
-
-            for _, row in df.iterrows():
-                invoice_no = str(row.get("Invoice", "")).strip()
-                if not invoice_no or invoice_no in ("nan", "NaN", ""):
-                    skipped += 1
-                    continue
-
-                last = last_name_only(row.get("Traveler", ""))
-                safe = re.sub(r'[\\/*?:"<>|]', "_", invoice_no.lstrip("0"))
-                base = f"{safe} {last}" if last else safe
-
-                # Avoid overwriting if same invoice# appears on multiple rows
-                count = used_names.get(base, 0)
-                used_names[base] = count + 1
-                fname = f"{base}.xlsx" if count == 0 else f"{base} ({count}).xlsx"
-                out_path = os.path.join(output_dir, fname)
-
-                self.log(f"[{invoice_no.lstrip('0')}]  {last}  →  {fname}")
-                try:
-                    fill_invoice(template_path, row.to_dict(), out_path)
-                    self.log("  ✓  Saved")
-                    successful += 1
-                except Exception as e:
-                    self.log(f"  ✗  Error: {e}")
-                    failed += 1
+            output_dir = result["output_dir"]
+            successful = result["successful"]
+            failed     = result["failed"]
+            skipped    = result["skipped"]
 
             self.log(f"\n{'='*55}")
             self.log("SUMMARY:")
@@ -5,6 +5,7 @@ the overlay.pdf on top with PyMuPDF.  No LibreOffice required.
 """
 
 import os
+import threading
 import fitz  # PyMuPDF
 
 from reportlab.pdfgen import canvas as rl_canvas
@@ -61,7 +62,22 @@ def _register_fonts():
     return "Times-Roman", "Times-Bold"
 
 
-FONT_REG, FONT_BOLD = _register_fonts()
+# Parsing the Times New Roman TTF takes a noticeable slice of a second,
+# so it happens on the first _text() call — i.e. the first invoice
+# actually rendered — not whenever something imports this module.
+# The lock is for bulk_apply's worker threads racing to be first.
+_FONTS = None
+_FONTS_LOCK = threading.Lock()
+
+
+def _fonts():
+    """(regular, bold) font names, registering them on first use."""
+    global _FONTS
+    if _FONTS is None:
+        with _FONTS_LOCK:
+            if _FONTS is None:
+                _FONTS = _register_fonts()
+    return _FONTS
 
 
 # ---------------------------------------------------------------------------
@@ -73,7 +89,8 @@ def _y(pdf_y: float) -> float:
 
 
 def _text(c, x, y_pdf, text, bold=False, size=FS, align="left"):
-    font = FONT_BOLD if bold else FONT_REG
+    font_reg, font_bold = _fonts()
+    font = font_bold if bold else font_reg
     c.setFont(font, size)
     c.setFillColor(black)
     rl_y = _y(y_pdf)
@@ -0,0 +1,810 @@
+"""
+invoice_pipeline.py — The customer-invoice batch, staged so a slow
+network share doesn't leave the CPU waiting.
+
+Invoice folders live on an SMB share. Processing one file at a time —
+read it, work on it, write/rename/copy its outputs, then start reading
+the next — pays every network round trip with the CPU idle. run_batch()
+splits the batch into three overlapping stages:
+
+    ReadAhead     a background thread reading the next READ_AHEAD files'
+                  bytes while the current one is processed
+    compute       this thread: everything works on the in-memory bytes
+                  (fitz opens from a stream, ReportLab renders to BytesIO,
+                  outputs come back as bytes), split into
+                  analyze_invoice() → airport prompt → render_invoice()
+                  so the GUI can ask about an unknown airport in between
+    WriteBehind   WRITER_THREADS background threads writing outputs (and
+                  errored_invoices/ copies) to their final names. At most
+                  MAX_PENDING_WRITES wait in the queue; past that compute
+                  blocks, so a share that can't keep up slows the batch
+                  down instead of piling every output up in memory.
+
+Every output is written once, straight to its final name. Output names
+come from a single folder listing plus the names already handed out in
+this batch, not an exists() round trip per candidate name. Each file is
+fsynced by its writer before it's renamed into place, and the batch
+doesn't return until every write has finished. Anything that failed to
+write is reported in the summary, instead of the batch quietly claiming
+success.
+
+Compute runs in a watchdogged worker process (file_watchdog.py) by
+default: a file that hangs fitz, stalls the parser or eats memory past
+the limits is killed and routed to errored_invoices/ with the reason, and
+the batch moves on. Every errored file's reason is also appended to
+errored_invoices/errored_reasons.txt, so an overnight run can be reviewed
+without its log.
+
+A bulk export — many invoices printed into one PDF — is cut into one
+PDF per invoice (invoice_splitter.py, in memory), and each invoice goes
+through the batch as its own file under a "<export> part NNN" name until
+its fields rename it. The cutting is part of the worker's analyze step,
+under the same watchdog as everything else. It only happens for a file
+whose last page says it holds more than one invoice
+(may_hold_several), so an ordinary file pays one extra page of text at
+most, and a one-page file pays nothing.
+
+Used by PDFRenamerGUI._process_pdfs; also usable without the GUI:
+
+    python invoice_pipeline.py <folder> [both|plain|styled]
+                               [--timeout SECONDS] [--no-isolate] [--no-split]
+"""
+
+import io
+import os
+import sys
+import time
+import queue
+import threading
+import collections
+
+import fitz
+
+from invoice_processor import (
+    detect_format, extract_fields, build_filename, StampAssets, stamp_document,
+    PROFILE_BOTH, PROFILE_PLAIN, PROFILE_STYLED, PROFILE_LABELS,
+)
+from file_watchdog import (
+    IsolatedWorker, WatchdogError, FILE_TIMEOUT, MEMORY_LIMIT_MB, RECYCLE_AFTER,
+)
+
+READ_AHEAD         = 4     # source files read ahead of the one being processed
+MAX_PENDING_WRITES = 8     # outputs allowed to wait for a writer thread
+WRITER_THREADS     = 3     # concurrent writes — on a share, each is mostly waiting
+SPLIT_EXPORTS      = True  # cut multi-invoice PDFs into one invoice each
+
+STYLED_FOLDER  = "processed_invoices_styled"
+PLAIN_FOLDER   = "processed_invoices_plain"
+ERRORED_FOLDER = "errored_invoices"
+REASONS_FILENAME = "errored_reasons.txt"
+
+STAGES = ("read_wait", "split", "worker_start", "analyze", "airports", "render",
+          "write_wait", "drain", "writing")
+
+
+# ---------------------------------------------------------------------------
+# Read-ahead
+# ---------------------------------------------------------------------------
+class ReadAhead:
+    """Iterate (path, bytes, error) for paths, with up to depth files
+    already read by a background thread."""
+
+    _DONE = object()
+
+    def __init__(self, paths, depth: int = READ_AHEAD):
+        self._q = queue.Queue(maxsize=max(1, depth))
+        self._stop = threading.Event()
+        threading.Thread(target=self._run, args=(list(paths),), daemon=True).start()
+
+    def _run(self, paths):
+        for path in paths:
+            if self._stop.is_set():
+                return
+            try:
+                with open(path, "rb") as f:
+                    item = (path, f.read(), None)
+            except OSError as e:
+                item = (path, None, e)
+            self._put(item)
+        self._put(self._DONE)
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._q.put(item, timeout=0.2)
+                return
+            except queue.Full:
+                continue
+
+    def __iter__(self):
+        while True:
+            item = self._q.get()
+            if item is self._DONE:
+                return
+            yield item
+
+    def close(self):
+        """Stop reading early (the consumer gave up on the batch)."""
+        self._stop.set()
+
+
+# ---------------------------------------------------------------------------
+# Write-behind
+# ---------------------------------------------------------------------------
+class WriteBehind:
+    """
+    Writes (path, bytes) on background threads, each via a .part file
+    (fsynced) + os.replace, so nothing half-written ever sits under a
+    final name. write() blocks once max_pending writes are queued
+    (back-pressure). finish() waits for the queue to drain and returns
+    [(path, error), ...] for anything that failed. bytes_written and
+    write_seconds (summed over the writer threads) feed the batch's
+    stage timings.
+    """
+
+    def __init__(self, max_pending: int = MAX_PENDING_WRITES,
+                 threads: int = WRITER_THREADS):
+        self._q = queue.Queue(maxsize=max(1, max_pending))
+        self._listings = {}      # folder → set of normcased names taken
+        self._folders = set()
+        self.failures = []
+        self.bytes_written = 0
+        self.write_seconds = 0.0
+        self._stats_lock = threading.Lock()
+        self._threads = [threading.Thread(target=self._run, daemon=True)
+                         for _ in range(max(1, threads))]
+        for t in self._threads:
+            t.start()
+
+    def _taken(self, folder) -> set:
+        if folder not in self._listings:
+            try:
+                names = os.listdir(folder)
+            except OSError:
+                names = []
+            self._listings[folder] = {os.path.normcase(n) for n in names}
+        return self._listings[folder]
+
+    def claim(self, folder: str, name: str, unique: bool = True) -> str:
+        """
+        Reserve an output path. unique=True gives "name (2).pdf",
+        "name (3).pdf", ... when the name exists on disk or was already
+        claimed this batch — without waiting for earlier writes to land.
+        unique=False keeps the name even if it exists (overwrite), as
+        un-renamed copies always have.
+        """
+        taken = self._taken(folder)
+        candidate = name
+        if unique:
+            base, ext = os.path.splitext(name)
+            counter = 2
+            while os.path.normcase(candidate) in taken:
+                candidate = f"{base} ({counter}){ext}"
+                counter += 1
+        taken.add(os.path.normcase(candidate))
+        return os.path.join(folder, candidate)
+
+    def write(self, path: str, data: bytes):
+        self._q.put((path, data))
+
+    def _run(self):
+        while True:
+            item = self._q.get()
+            if item is None:
+                return
+            path, data = item
+            part = path + ".part"
+            started = time.perf_counter()
+            try:
+                with open(part, "wb") as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(part, path)
+                self._folders.add(os.path.dirname(path))
+                with self._stats_lock:
+                    self.bytes_written += len(data)
+                    self.write_seconds += time.perf_counter() - started
+            except OSError as e:
+                self.failures.append((path, str(e)))
+                try:
+                    os.remove(part)
+                except OSError:
+                    pass
+
+    def finish(self) -> list:
+        for _ in self._threads:
+            self._q.put(None)
+        for t in self._threads:
+            t.join()
+        if hasattr(os, "O_DIRECTORY"):
+            # POSIX: the renames themselves live in the directory entries
+            for folder in self._folders:
+                try:
+                    fd = os.open(folder, os.O_RDONLY | os.O_DIRECTORY)
+                    try:
+                        os.fsync(fd)
+                    finally:
+                        os.close(fd)
+                except OSError:
+                    pass
+        return self.failures
+
+
+# ---------------------------------------------------------------------------
+# Compute — one invoice, all in memory
+# ---------------------------------------------------------------------------
+def _noop(_msg):
+    pass
+
+
+def _stamped_bytes(pdf_bytes: bytes, fmt: str, assets: StampAssets):
+    """(stamped bytes, True), or (the input unchanged, False) if stamping
+    failed — the same "unstamped copy rather than none" as before."""
+    try:
+        with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+            if stamp_document(doc, fmt, assets):
+                return doc.tobytes(garbage=1, deflate=True), True
+    except Exception:
+        pass
+    return pdf_bytes, False
+
+
+def _split_export(doc, text: str, a: dict, log):
+    """a["parts"] = [(first_page, last_page, invoice_no, bytes), ...] if
+    the open document is a bulk export of several invoices."""
+    from invoice_splitter import may_hold_several, iter_ranges, cut
+
+    started = time.perf_counter()
+    try:
+        if not may_hold_several(doc, text):
+            return
+        ranges = list(iter_ranges(doc))
+        if len(ranges) > 1:
+            a["parts"] = [(first, last, invoice_no, cut(doc, first, last))
+                          for first, last, invoice_no in ranges]
+    except Exception as e:
+        # Not splittable (a damaged file) — analyzed whole, as before
+        log(f"  ? Could not split ({e}) — processing as one invoice")
+    finally:
+        a["split_seconds"] = time.perf_counter() - started
+
+
+def analyze_invoice(src: str, pdf_bytes: bytes, profile: str = PROFILE_BOTH,
+                    log=None, service=None, split: bool = False) -> dict:
+    """
+    Everything that reads the invoice: format, rename fields and — when
+    the profile includes the styled copy — the full state_parser parse
+    and its unknown airports. No output is produced here, so the caller
+    can resolve unknown airports (a GUI prompt) before render_invoice().
+
+    split=True first checks for a bulk export. If it is one, the result
+    is just a["parts"], one per invoice, for the caller to analyze on
+    their own.
+    """
+    log = log or _noop
+    a = {"src": src, "file": os.path.basename(src), "bytes": pdf_bytes,
+         "profile": profile, "fmt": None, "agent": None, "invoice_no": None,
+         "last_name": None, "parsed": None, "parse_error": None,
+         "unknown_airports": [], "parts": None, "split_seconds": 0.0}
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        text = doc[0].get_text("text") if len(doc) else ""
+        if split:
+            _split_export(doc, text, a, log)
+    if a["parts"]:
+        return a
+    a["fmt"] = detect_format(text)
+    if not a["fmt"]:
+        return a
+    log(f"  Format: {a['fmt'].upper()}")
+    a["agent"], a["invoice_no"], a["last_name"] = extract_fields(text, a["fmt"], log_fn=log)
+
+    if profile == PROFILE_PLAIN:
+        return a
+    try:
+        from state_parser import parse as parse_invoice
+        from airport_resolver import check_unknown_airports
+
+        log(f"  Parsing {a['file']}...")
+        data = None
+        if service:
+            try:
+                data = service.parse_bytes(pdf_bytes)["data"]
+            except Exception as e:
+                log(f"    Service parse failed ({e}) — parsing locally")
+        if data is None:
+            data = parse_invoice(src, pdf_bytes=pdf_bytes)
+        a["parsed"] = data
+
+        parts = []
+        if data["flights"]: parts.append(f'{len(data["flights"])} flights')
+        if data["hotels"]: parts.append(f'{len(data["hotels"])} hotels')
+        if data["cruises"]: parts.append(f'{len(data["cruises"])} cruises')
+        if data["tours"]: parts.append(f'{len(data["tours"])} tours')
+        if data["packages"]: parts.append(f'{len(data["packages"])} packages')
+        parts.append(f'{len(data["passengers"])} pax')
+        if data["tickets"]: parts.append(f'{len(data["tickets"])} tickets')
+        log(f"    Parsed: {', '.join(parts)}")
+        for w in data.get("warnings", []):
+            log(f"    ⚠ {w}")
+        for u in data.get("unrecognized", []):
+            log(f"    ? {u}")
+
+        a["unknown_airports"] = check_unknown_airports(data)
+    except Exception as e:
+        # A message, not the exception: the analysis crosses a process
+        # boundary when a watchdogged worker produced it
+        a["parse_error"] = str(e) or type(e).__name__
+    return a
+
+
+def render_invoice(a: dict, assets: StampAssets, log=None) -> dict:
+    """
+    Produce the outputs analyze_invoice() made possible, as bytes:
+    {"plain", "plain_stamped", "styled", "styled_error", "coverage_gap"}.
+    Airports resolved since analyze_invoice() are already in
+    airport_lookup, which the generator reads.
+    """
+    log = log or _noop
+    profile = a["profile"]
+    out = {"plain": None, "plain_stamped": False, "styled": None,
+           "styled_error": None, "coverage_gap": None}
+
+    # Needed for the plain copy, and for errored_invoices/ on a styled-only run
+    out["plain"], out["plain_stamped"] = _stamped_bytes(a["bytes"], a["fmt"], assets)
+    if profile != PROFILE_STYLED:
+        if out["plain_stamped"]:
+            log("  ✓ Plain copy: overlay & back page applied")
+        else:
+            log("  ✗ Plain copy: overlay failed")
+
+    if profile == PROFILE_PLAIN:
+        return out
+    try:
+        if a["parse_error"] is not None:
+            raise RuntimeError(a["parse_error"])
+        from invoice_generator import generate_invoice_pdf
+
+        buf = io.BytesIO()
+        generate_invoice_pdf(a["parsed"], buf)
+        log("  ✓ Reformatted to new layout")
+        styled, stamped = _stamped_bytes(buf.getvalue(), a["fmt"], assets)
+        if stamped:
+            log("  ✓ Styled copy: overlay & back page applied")
+        out["styled"] = styled
+
+        try:
+            from coverage_check import check_text, doc_text, format_missing
+            with fitz.open(stream=a["bytes"], filetype="pdf") as src_doc, \
+                 fitz.open(stream=styled, filetype="pdf") as styled_doc:
+                coverage = check_text(doc_text(src_doc), doc_text(styled_doc))
+            if coverage["missing"]:
+                out["coverage_gap"] = format_missing(coverage["missing"])
+                log(f"  ⚠ Missing from styled copy — {out['coverage_gap']}")
+            else:
+                log("  ✓ Coverage: all confirmations, tickets, amounts and names present")
+        except Exception as e:
+            log(f"  ? Coverage check skipped ({e})")
+    except Exception as e:
+        out["styled_error"] = str(e) or type(e).__name__
+        log(f"  ✗ Reformat failed ({e}) — "
+            + ("plain copy is still available" if profile == PROFILE_BOTH
+               else "stamped original goes to errored_invoices/"))
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Where compute runs
+# ---------------------------------------------------------------------------
+class _InProcess:
+    """analyze/render on this thread — no watchdog (--no-isolate)."""
+
+    def __init__(self):
+        self._assets = StampAssets()
+
+    def begin_file(self):
+        pass
+
+    def analyze(self, src, pdf_bytes, profile, service, log, split=False):
+        return analyze_invoice(src, pdf_bytes, profile, log, service, split)
+
+    def render(self, a, airports_changed, log):
+        return render_invoice(a, self._assets, log)
+
+    def close(self):
+        self._assets.close()
+
+
+class _Isolated:
+    """analyze/render in a watchdogged worker process. The PDF bytes go
+    over once; the analysis comes back without them and render() reuses
+    the worker's copy."""
+
+    def __init__(self, timeout, memory_limit_mb, recycle_after):
+        self._worker = IsolatedWorker("invoice_pipeline:_worker_handle",
+                                      timeout, memory_limit_mb, recycle_after)
+
+    def begin_file(self):
+        self._worker.begin_file()
+
+    def analyze(self, src, pdf_bytes, profile, service, log, split=False):
+        a = self._worker.call("analyze", (src, pdf_bytes, profile, service, split), log)
+        a["bytes"] = pdf_bytes
+        return a
+
+    def render(self, a, airports_changed, log):
+        lean = {k: v for k, v in a.items() if k != "bytes"}
+        return self._worker.call("render", (lean, airports_changed), log)
+
+    def close(self):
+        self._worker.close()
+
+
+_WORKER_STATE = {}
+
+
+def _worker_handle(op, args, log):
+    """Runs inside the worker process (see file_watchdog.IsolatedWorker)."""
+    if op == "warm":
+        _WORKER_STATE["assets"] = StampAssets()
+        try:
+            # Pay the heavy imports now, not inside the first file's budget
+            import state_parser, invoice_generator, coverage_check  # noqa: F401
+        except ImportError:
+            pass
+        return None
+    if op == "analyze":
+        src, pdf_bytes, profile, service, split = args
+        a = analyze_invoice(src, pdf_bytes, profile, log, service, split)
+        _WORKER_STATE["bytes"] = a.pop("bytes")
+        return a
+    if op == "render":
+        a, airports_changed = args
+        if airports_changed:
+            # The parent just saved airport_overrides.json from its prompt
+            import airport_lookup
+            airport_lookup.reload_overrides()
+        a["bytes"] = _WORKER_STATE.pop("bytes")
+        return render_invoice(a, _WORKER_STATE["assets"], log)
+    raise ValueError(f"unknown op {op!r}")
+
+
+def _record_reasons(errored_path, reasons, writer):
+    """Append this batch's (file, reason) lines to errored_reasons.txt —
+    one read of the old file, one atomic write of old + new."""
+    path = os.path.join(errored_path, REASONS_FILENAME)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            previous = f.read()
+    except OSError:
+        previous = ""
+    stamp = time.strftime("%Y-%m-%d %H:%M")
+    lines = "".join(f"{stamp}\t{file}\t{reason}\n" for file, reason in reasons)
+    writer.write(writer.claim(errored_path, REASONS_FILENAME, unique=False),
+                 (previous + lines).encode("utf-8"))
+
+
+# ---------------------------------------------------------------------------
+# Batch
+# ---------------------------------------------------------------------------
+def list_invoices(source_folder: str) -> list:
+    return [f for f in os.listdir(source_folder)
+            if f.lower().endswith(".pdf")
+            and os.path.isfile(os.path.join(source_folder, f))]
+
+
+def _inputs(reader, parts, stages: dict):
+    """(src, bytes, read error, export src or None) for every file the
+    reader reads — and, ahead of the next file, whatever invoices the
+    last one was split into (appended to the parts deque meanwhile)."""
+    files = iter(reader)
+    while True:
+        while parts:
+            yield parts.popleft()
+        started = time.perf_counter()
+        try:
+            src, pdf_bytes, read_error = next(files)
+        except StopIteration:
+            return
+        stages["read_wait"] += time.perf_counter() - started
+        yield src, pdf_bytes, read_error, None
+
+
+def run_batch(source_folder: str, profile: str = PROFILE_BOTH, log=None,
+              resolve_airport=None, service=None, files=None,
+              split_exports: bool = SPLIT_EXPORTS,
+              read_ahead: int = READ_AHEAD,
+              max_pending_writes: int = MAX_PENDING_WRITES,
+              isolate: bool = True, file_timeout: float = FILE_TIMEOUT,
+              memory_limit_mb: int = MEMORY_LIMIT_MB,
+              recycle_after: int = RECYCLE_AFTER) -> dict:
+    """
+    Process every PDF in source_folder (or just files, names within it).
+
+    resolve_airport(city, src) → (display, added_new) is called for each
+    unknown airport between analyze and render; without it, unknown
+    airports render as their fallback name.
+
+    split_exports=True processes each invoice of a multi-invoice PDF on
+    its own (see invoice_splitter); total counts invoices, not files.
+
+    isolate=True runs compute in a worker process under file_timeout
+    seconds and memory_limit_mb per file, replaced every recycle_after
+    files; isolate=False runs it on this thread with no limits.
+
+    Returns {"total", "successful", "failed", "unknown_variant",
+    "airports_added", "coverage_gaps": [(name, gap)], "processed_files":
+    [(original, output)], "errored": [(name, reason)], "write_failures":
+    [(path, error)], "bytes_written", "stage_seconds": {stage: seconds},
+    "parser_profile", "split_exports": [(export name, invoices)]}.
+
+    stage_seconds says where the batch's time went — STAGES, in order:
+    read_wait (waiting on read-ahead), split (finding and cutting the
+    invoices in bulk exports, in the worker), worker_start (starting/recycling
+    worker processes), analyze, airports (unknown-airport prompts),
+    render, write_wait (blocked on a full write queue), drain (waiting
+    for the last writes at the end) and writing (writer-thread time,
+    summed over threads, so it overlaps the others).
+
+    parser_profile is None unless TW_PARSER_PROFILE is set, in which case
+    it's every file's state_parser rule profile merged into one (see
+    state_parser.merge_profiles / format_profile).
+    """
+    log = log or _noop
+    want_plain  = profile in (PROFILE_BOTH, PROFILE_PLAIN)
+    want_styled = profile in (PROFILE_BOTH, PROFILE_STYLED)
+    styled_path  = os.path.join(source_folder, STYLED_FOLDER)
+    plain_path   = os.path.join(source_folder, PLAIN_FOLDER)
+    errored_path = os.path.join(source_folder, ERRORED_FOLDER)
+    summary = {"total": 0, "successful": 0, "failed": 0, "unknown_variant": 0,
+               "airports_added": 0, "coverage_gaps": [], "processed_files": [],
+               "errored": [], "write_failures": [], "bytes_written": 0,
+               "stage_seconds": dict.fromkeys(STAGES, 0.0), "parser_profile": None,
+               "split_exports": []}
+    stages = summary["stage_seconds"]
+
+    wanted_dirs = [errored_path]
+    if want_plain:
+        wanted_dirs.append(plain_path)
+    if want_styled:
+        wanted_dirs.append(styled_path)
+    for p in wanted_dirs:
+        if not os.path.exists(p):
+            os.makedirs(p)
+            log(f"Created directory: {p}")
+
+    pdf_files = list(files) if files is not None else list_invoices(source_folder)
+    summary["total"] = len(pdf_files)
+    if not pdf_files:
+        return summary
+
+    compute = _Isolated(file_timeout, memory_limit_mb, recycle_after) if isolate \
+              else _InProcess()
+    reader = ReadAhead([os.path.join(source_folder, f) for f in pdf_files], read_ahead)
+    writer = _TimedWriter(WriteBehind(max_pending_writes), stages)
+    parts = collections.deque()
+    inputs = _inputs(reader, parts, stages)
+    try:
+        for i, (src, pdf_bytes, read_error, export) in enumerate(inputs, 1):
+            file = os.path.basename(src)
+            log(f"\n[{i}/{summary['total']}] Processing: {file}")
+            try:
+                if read_error is not None:
+                    raise read_error
+                started = time.perf_counter()
+                compute.begin_file()
+                stages["worker_start"] += time.perf_counter() - started
+                split = _process_one(src, pdf_bytes, profile, compute, writer, summary,
+                                     log, resolve_airport, service,
+                                     plain_path, styled_path, errored_path, export,
+                                     split_exports and export is None)
+                if split:
+                    _queue_parts(src, split, parts, summary, log)
+            except WatchdogError as e:
+                log(f"  ✗ Stopped: {e}")
+                summary["failed"] += 1
+                summary["errored"].append((file, str(e)))
+                writer.write(writer.claim(errored_path, file, unique=False), pdf_bytes)
+                log("  ⚠ Original copied to errored_invoices/ for review")
+            except Exception as e:
+                log(f"  ✗ Error: {e}")
+                summary["failed"] += 1
+                summary["errored"].append((file, f"error: {e}"))
+                if pdf_bytes is not None:
+                    writer.write(writer.claim(errored_path, file, unique=False), pdf_bytes)
+        if summary["errored"]:
+            _record_reasons(errored_path, summary["errored"], writer)
+    finally:
+        reader.close()
+        started = time.perf_counter()
+        summary["write_failures"] = writer.finish()
+        stages["drain"] += time.perf_counter() - started
+        stages["writing"] = writer.write_seconds
+        summary["bytes_written"] = writer.bytes_written
+        compute.close()
+    return summary
+
+
+class _TimedWriter:
+    """WriteBehind, with the time write() spends blocked (a full queue)
+    added to stages["write_wait"]."""
+
+    def __init__(self, writer: WriteBehind, stages: dict):
+        self._writer = writer
+        self._stages = stages
+
+    def write(self, path, data):
+        started = time.perf_counter()
+        self._writer.write(path, data)
+        self._stages["write_wait"] += time.perf_counter() - started
+
+    def __getattr__(self, name):
+        return getattr(self._writer, name)
+
+
+def _queue_parts(src, split, parts, summary, log):
+    """Line a bulk export's invoices up as the batch's next inputs."""
+    from invoice_splitter import part_name
+
+    file = os.path.basename(src)
+    log(f"  Bulk export — split into {len(split)} invoices")
+    summary["total"] += len(split) - 1
+    summary["split_exports"].append((file, len(split)))
+    for index, (first, last, invoice_no, data) in enumerate(split, 1):
+        name = part_name(file, index, invoice_no)
+        log(f"    {name}: pages {first + 1}-{last + 1}")
+        parts.append((os.path.join(os.path.dirname(src), name), data, None, src))
+
+
+def _process_one(src, pdf_bytes, profile, compute, writer, summary, log,
+                 resolve_airport, service, plain_path, styled_path, errored_path,
+                 export=None, split=False):
+    """export: the bulk export src was cut from — src itself then only
+    names the invoice, there's no such file to review against.
+    split=True: check for a bulk export first. Returns its parts, with
+    nothing written, if src is one; None otherwise."""
+    file = os.path.basename(src)
+    want_plain  = profile in (PROFILE_BOTH, PROFILE_PLAIN)
+    want_styled = profile in (PROFILE_BOTH, PROFILE_STYLED)
+
+    stages = summary["stage_seconds"]
+    started = time.perf_counter()
+    a = compute.analyze(src, pdf_bytes, profile, service, log, split)
+    split_seconds = a.pop("split_seconds")
+    stages["analyze"] += time.perf_counter() - started - split_seconds
+    stages["split"] += split_seconds
+    if a["parts"]:
+        return a["parts"]
+    if a["parsed"] and a["parsed"].get("profile"):
+        from state_parser import merge_profiles
+        summary["parser_profile"] = merge_profiles(
+            summary["parser_profile"], a["parsed"].pop("profile"), file)
+    if not a["fmt"]:
+        log("  ✗ Could not detect format")
+        summary["failed"] += 1
+        summary["errored"].append((file, "could not detect format"))
+        # Still produce a plain, unbranded-but-safe copy so there's
+        # SOMETHING to review in errored_invoices/, even without knowing
+        # which overlay style to use.
+        writer.write(writer.claim(errored_path, file, unique=False), pdf_bytes)
+        if want_plain:
+            writer.write(writer.claim(plain_path, file, unique=False), pdf_bytes)
+        return
+
+    renamed = bool(a["invoice_no"] and a["last_name"])
+    new_name = build_filename(a["agent"], a["invoice_no"], a["last_name"]) if renamed else None
+    has_problem = not renamed
+    reasons = [] if renamed else ["missing invoice number or last name"]
+
+    airports_changed = False
+    started = time.perf_counter()
+    if a["unknown_airports"]:
+        log(f"  ? Unknown airport(s): {', '.join(a['unknown_airports'])}")
+        if resolve_airport:
+            for city in a["unknown_airports"]:
+                display, added_new = resolve_airport(city, export or src)
+                if added_new:
+                    summary["airports_added"] += 1
+                log(f"    → {city} = {display}")
+            airports_changed = True
+            log("  ✓ Airport(s) resolved")
+
+    stages["airports"] += time.perf_counter() - started
+
+    started = time.perf_counter()
+    out = compute.render(a, airports_changed, log)
+    stages["render"] += time.perf_counter() - started
+
+    # ── PLAIN: original content + the overlay and back page every invoice
+    # has always gotten — and what errored_invoices/ falls back to.
+    plain_dest = None
+    if want_plain:
+        plain_dest = writer.claim(plain_path, new_name) if renamed \
+                     else writer.claim(plain_path, file, unique=False)
+        writer.write(plain_dest, out["plain"])
+        if renamed:
+            log(f"  ✓ Plain copy renamed to: {os.path.basename(plain_dest)}")
+        if not want_styled:
+            summary["processed_files"].append((export or src, plain_dest))
+
+    # What the review window shows as the original: a split invoice has
+    # no file of its own, but its plain copy is its pages as printed
+    review_src = src if export is None else (plain_dest or export)
+
+    # ── STYLED: the new reformatted layout
+    if want_styled:
+        if out["styled"] is not None:
+            if renamed:
+                styled_dest = writer.claim(styled_path, new_name)
+                writer.write(styled_dest, out["styled"])
+                log(f"  ✓ Styled copy renamed to: {os.path.basename(styled_dest)}")
+                summary["processed_files"].append((review_src, styled_dest))
+            else:
+                writer.write(writer.claim(styled_path, file, unique=False), out["styled"])
+                log("  ⚠ Styled copy kept as original filename (missing invoice_no/last_name)")
+            if out["coverage_gap"]:
+                summary["coverage_gaps"].append((file, out["coverage_gap"]))
+        else:
+            has_problem = True
+            reasons.append(f"reformat failed: {out['styled_error']}")
+
+    data = a["parsed"]
+    unrecognized = bool(data and data.get("unrecognized"))
+    if unrecognized:
+        log(f"  ⚠ {len(data['unrecognized'])} unrecognized line(s)")
+        has_problem = True
+        reasons.append(f"{len(data['unrecognized'])} unrecognized line(s)")
+        summary["unknown_variant"] += 1
+
+    # ── ERRORED: the plain version for any file with a problem — missing
+    # rename info, a reformat exception, or unrecognized content. Not the
+    # (possibly incomplete) styled one: the plain copy is the more
+    # reliable one to hand a human for review.
+    if has_problem:
+        name = os.path.basename(plain_dest) if plain_dest else (new_name or file)
+        writer.write(writer.claim(errored_path, name, unique=False), out["plain"])
+        log("  ⚠ Copy saved to errored_invoices/ for review")
+        summary["errored"].append((name, "; ".join(reasons)))
+        if not unrecognized:
+            summary["failed"] += 1
+    else:
+        summary["successful"] += 1
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Process a folder of customer invoices.")
+    ap.add_argument("folder")
+    ap.add_argument("profile", nargs="?", default=PROFILE_BOTH, choices=list(PROFILE_LABELS))
+    ap.add_argument("--timeout", type=float, default=FILE_TIMEOUT,
+                    help=f"seconds allowed per file (default {FILE_TIMEOUT})")
+    ap.add_argument("--memory-mb", type=int, default=MEMORY_LIMIT_MB,
+                    help=f"worker memory ceiling (default {MEMORY_LIMIT_MB})")
+    ap.add_argument("--recycle-after", type=int, default=RECYCLE_AFTER,
+                    help=f"files per worker process (default {RECYCLE_AFTER})")
+    ap.add_argument("--no-isolate", action="store_true",
+                    help="process in this process, without the watchdog")
+    ap.add_argument("--no-split", action="store_true",
+                    help="treat multi-invoice PDFs as one invoice each")
+    ap.add_argument("--parser-profile", action="store_true",
+                    help="profile state_parser's rules and print the batch's totals")
+    args = ap.parse_args()
+    if args.parser_profile:
+        # Through the environment so watchdog workers profile too
+        from state_parser import PROFILE_ENV
+        os.environ[PROFILE_ENV] = "1"
+    result = run_batch(args.folder, args.profile, log=print,
+                       split_exports=not args.no_split,
+                       isolate=not args.no_isolate, file_timeout=args.timeout,
+                       memory_limit_mb=args.memory_mb, recycle_after=args.recycle_after)
+    for name, count in result["split_exports"]:
+        print(f"Split {name} into {count} invoices")
+    print(f"\n{result['successful']} ok, {result['failed']} problem(s), "
+          f"{result['unknown_variant']} unknown variant(s), "
+          f"{len(result['coverage_gaps'])} coverage gap(s)")
+    for path, err in result["write_failures"]:
+        print(f"WRITE FAILED  {path}: {err}")
+    if result["parser_profile"]:
+        from state_parser import format_profile
+        print("\n" + format_profile(result["parser_profile"]))
+    sys.exit(1 if result["write_failures"] else 0)
@@ -5,7 +5,6 @@ PDF Invoice Renamer - Travel Wizards
 
 import os
 import sys
-import shutil
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext
 import threading
@@ -40,6 +39,18 @@ BACKSIDE_PATH = _asset("backside.pdf")
 FOLDER_ITIN    = "itin"
 FOLDER_TIPITIN = "tipitin"
 
+# Output profiles. "plain" is the fast path for days when only the
+# renamed, branded copies are needed: page-1 text for the rename fields,
+# one stamp, one write — no state_parser, no ReportLab, no second stamp.
+PROFILE_BOTH   = "both"
+PROFILE_PLAIN  = "plain"
+PROFILE_STYLED = "styled"
+PROFILE_LABELS = {
+    PROFILE_BOTH:   "Plain + Styled",
+    PROFILE_PLAIN:  "Plain only (rename & brand)",
+    PROFILE_STYLED: "Styled only",
+}
+
 
 def detect_format(text: str):
     if re.search(r'SALES PERSON:', text):
@@ -90,6 +101,88 @@ def build_filename(agent_initials, invoice_no, last_name):
     return f"{invoice_no} {last_name}.pdf"
 
 
+# ---------------------------------------------------------------------------
+# Stamping (overlay + backside) — module-level so processing_service.py's
+# workers can use it without a GUI
+# ---------------------------------------------------------------------------
+def _make_bottom_overlay(overlay_full) -> fitz.Document:
+    """Just the footer strip of overlay.pdf, for TIPITIN pages after the
+    first."""
+    page_rect   = overlay_full[0].rect
+    footer_rect = fitz.Rect(0, 730, page_rect.width, page_rect.height)
+    out = fitz.open()
+    new_page = out.new_page(width=page_rect.width, height=page_rect.height)
+    new_page.show_pdf_page(footer_rect, overlay_full, 0, clip=footer_rect)
+    return out
+
+
+class StampAssets:
+    """
+    overlay.pdf and backside.pdf, opened once and reused for every invoice
+    in a batch (or for the life of a service worker) rather than re-opened
+    and re-parsed for every file. PyMuPDF documents aren't safe to share
+    between threads — one StampAssets per thread/process.
+    """
+
+    def __init__(self, overlay_path=OVERLAY_PATH, backside_path=BACKSIDE_PATH):
+        self.overlay_full = fitz.open(overlay_path)
+        self.backside     = fitz.open(backside_path)
+        self._overlay_bottom = None
+
+    @property
+    def overlay_bottom(self):
+        if self._overlay_bottom is None:
+            self._overlay_bottom = _make_bottom_overlay(self.overlay_full)
+        return self._overlay_bottom
+
+    def close(self):
+        for doc in (self.overlay_full, self.backside, self._overlay_bottom):
+            if doc is not None:
+                doc.close()
+
+
+def stamp_document(doc, fmt: str, assets: StampAssets) -> bool:
+    """Stamp the overlay on every page of an open document (full overlay
+    on page 1 — and on every page of ITIN invoices — footer only on later
+    TIPITIN pages) and append the back page. Modifies doc in place."""
+    if len(doc) < 1 or len(assets.overlay_full) < 1:
+        return False
+    for i, page in enumerate(doc):
+        if i == 0 or fmt == FOLDER_ITIN:
+            page.show_pdf_page(page.rect, assets.overlay_full, 0)
+        else:
+            page.show_pdf_page(page.rect, assets.overlay_bottom, 0)
+    doc.insert_pdf(assets.backside, from_page=0, to_page=0)
+    return True
+
+
+def apply_overlay_and_backside(pdf_path: str, fmt: str, assets: StampAssets = None,
+                               log_fn=None) -> bool:
+    """Stamp pdf_path in place. Without assets, overlay/backside are
+    opened just for this one file."""
+    temp_path = pdf_path.replace(".pdf", "_temp.pdf")
+    own_assets = assets is None
+    try:
+        if own_assets:
+            assets = StampAssets()
+        with fitz.open(pdf_path) as background:
+            if not stamp_document(background, fmt, assets):
+                return False
+            background.save(temp_path)
+        os.replace(temp_path, pdf_path)
+        return True
+    except Exception as e:
+        if log_fn:
+            log_fn(f"    ✗ Overlay error: {e}")
+        if os.path.exists(temp_path):
+            try: os.remove(temp_path)
+            except Exception: pass
+        return False
+    finally:
+        if own_assets and assets is not None:
+            assets.close()
+
+
 class PDFRenamerGUI:
     CLR_BG        = "#ffffff"
     CLR_PANEL     = "#f5f5f5"
@@ -119,7 +212,9 @@ class PDFRenamerGUI:
 
         self.source_folder = tk.StringVar()
         self.detected_fmt  = tk.StringVar(value="—")
+        self.profile_label = tk.StringVar(value=PROFILE_LABELS[PROFILE_BOTH])
         self.processed_files = []  # list of (original_path, processed_path) tuples
+        self.watcher = None        # invoice_watch.FolderWatcher while watching
         self.main_frame = tk.Frame(self.root, bg=self.CLR_BG)
         self.main_frame.pack(fill="both", expand=True)
         self.airport_frame = None
@@ -203,6 +298,13 @@ class PDFRenamerGUI:
         tk.Label(fmt_row, textvariable=self.detected_fmt,
                  font=("Arial", 10, "bold"),
                  bg=self.CLR_BG, fg=self.CLR_ACCENT).pack(side="left", padx=6)
+        profile_menu = tk.OptionMenu(fmt_row, self.profile_label, *PROFILE_LABELS.values())
+        profile_menu.config(relief="flat", bg="#e0e0e0", fg="#000000",
+                            activebackground="#cccccc", font=("Arial", 9),
+                            highlightthickness=0, bd=0, cursor="hand2")
+        profile_menu.pack(side="right")
+        tk.Label(fmt_row, text="Output:", font=("Arial", 8),
+                 bg=self.CLR_BG, fg=self.CLR_MUTED).pack(side="right", padx=(0, 6))
 
         btn_frame = tk.Frame(self.main_frame, bg=self.CLR_BG)
         btn_frame.pack(fill="x", padx=24, pady=(8, 8))
@@ -214,7 +316,17 @@ class PDFRenamerGUI:
             activebackground="#cccccc",
             font=("Arial", 13, "bold"),
             pady=10, bd=0)
-        self.process_btn.pack(fill="x")
+        self.process_btn.pack(side="left", fill="x", expand=True)
+        # Watch mode: process PDFs as they arrive instead of all at once
+        self.watch_btn = tk.Button(
+            btn_frame, text="👁  WATCH FOLDER",
+            command=self.toggle_watch,
+            relief="flat", cursor="hand2",
+            bg="#e0e0e0", fg="#000000",
+            activebackground="#cccccc",
+            font=("Arial", 11, "bold"),
+            padx=14, pady=12, bd=0)
+        self.watch_btn.pack(side="right", padx=(8, 0))
 
         log_label_row = tk.Frame(self.main_frame, bg=self.CLR_BG)
         log_label_row.pack(fill="x", padx=24, pady=(6, 2))
@@ -237,269 +349,131 @@ class PDFRenamerGUI:
         try:
             folder = filedialog.askdirectory(title="Select folder containing PDF invoices")
             if folder:
-                self.source_folder.set(folder)
-                self.detected_fmt.set("auto-detected per file")
-                self.log(f"Selected folder: {folder}")
+                self.set_folder(folder)
         except Exception as e:
             self.log(f"Browse failed: {e}")
             self.log("You can type/paste the folder path directly into the box above.")
 
+    def set_folder(self, folder):
+        """Also used by the portal for "--pdf <folder>" launches."""
+        self.source_folder.set(folder)
+        self.detected_fmt.set("auto-detected per file")
+        self.log(f"Selected folder: {folder}")
+
     def log(self, message):
         self.log_text.insert(tk.END, message + "\n")
         self.log_text.see(tk.END)
         self.root.update_idletasks()
 
-    def start_processing(self):
+    def _ready_to_process(self) -> bool:
         if not self.source_folder.get():
             messagebox.showerror("Error", "Please select a folder first!")
-            return
+            return False
         for path, label in [(OVERLAY_PATH, "overlay.pdf"), (BACKSIDE_PATH, "backside.pdf")]:
             if not os.path.exists(path):
                 messagebox.showerror("Missing Asset",
                                      f"Bundled asset not found: {label}\n"
                                      f"Expected at: {path}")
-                return
+                return False
+        return True
+
+    def _selected_profile(self):
+        return next((k for k, label in PROFILE_LABELS.items()
+                     if label == self.profile_label.get()), PROFILE_BOTH)
+
+    def start_processing(self):
+        if not self._ready_to_process():
+            return
+        # Safe point for the background updater: anything it downloaded
+        # since the last batch is swapped in now, before this one starts.
+        try:
+            import updater
+            reloaded = updater.apply_pending_updates()
+        except Exception:
+            reloaded = []
         self.process_btn.config(state="disabled", text="⏳  Processing...", bg="#aaaaaa")
+        self.watch_btn.config(state="disabled")
         self.log_text.delete(1.0, tk.END)
+        if reloaded:
+            self.log(f"Using updated logic: {', '.join(reloaded)}")
         self.processed_files = []
         thread = threading.Thread(target=self.process_pdfs)
         thread.daemon = True
         thread.start()
 
-    @staticmethod
-    def _make_bottom_overlay(overlay_path: str) -> fitz.Document:
-        src = fitz.open(overlay_path)
-        page_rect  = src[0].rect
-        footer_rect = fitz.Rect(0, 730, page_rect.width, page_rect.height)
-        out = fitz.open()
-        new_page = out.new_page(width=page_rect.width, height=page_rect.height)
-        new_page.show_pdf_page(footer_rect, src, 0, clip=footer_rect)
-        src.close()
-        return out
-
-    def apply_overlay_and_backside(self, pdf_path: str, fmt: str) -> bool:
-        temp_path = pdf_path.replace(".pdf", "_temp.pdf")
-        try:
-            background   = fitz.open(pdf_path)
-            overlay_full = fitz.open(OVERLAY_PATH)
-            backside     = fitz.open(BACKSIDE_PATH)
-            if len(background) < 1 or len(overlay_full) < 1:
-                background.close(); overlay_full.close(); backside.close()
-                return False
-            overlay_bottom = None
-            if fmt == FOLDER_TIPITIN and len(background) > 1:
-                overlay_bottom = self._make_bottom_overlay(OVERLAY_PATH)
-            for i, page in enumerate(background):
-                if i == 0 or fmt == FOLDER_ITIN:
-                    page.show_pdf_page(page.rect, overlay_full, 0)
-                else:
-                    page.show_pdf_page(page.rect, overlay_bottom, 0)
-            background.insert_pdf(backside, from_page=0, to_page=0)
-            background.save(temp_path)
-            background.close(); overlay_full.close(); backside.close()
-            if overlay_bottom:
-                overlay_bottom.close()
-            os.remove(pdf_path)
-            os.rename(temp_path, pdf_path)
-            return True
-        except Exception as e:
-            self.log(f"    ✗ Overlay error: {e}")
-            if os.path.exists(temp_path):
-                try: os.remove(temp_path)
-                except Exception: pass
-            return False
-
     def process_pdfs(self):
         try:
+            import updater
+            guard = updater.batch_guard()
+        except Exception:
+            from contextlib import nullcontext
+            guard = nullcontext()
+        with guard:
+            self._process_pdfs()
+
+    def _process_pdfs(self):
+        try:
+            import invoice_pipeline
+
             source_path = self.source_folder.get()
-            styled_path  = os.path.join(source_path, "processed_invoices_styled")
-            plain_path   = os.path.join(source_path, "processed_invoices_plain")
-            errored_path = os.path.join(source_path, "errored_invoices")
-            for p in (styled_path, plain_path, errored_path):
-                if not os.path.exists(p):
-                    os.makedirs(p)
-                    self.log(f"Created directory: {p}")
-
-            pdf_files = [f for f in os.listdir(source_path)
-                         if f.lower().endswith('.pdf')
-                         and os.path.isfile(os.path.join(source_path, f))]
+            profile = self._selected_profile()
+            self.log(f"Output: {PROFILE_LABELS[profile]}")
+            pdf_files = invoice_pipeline.list_invoices(source_path)
             if not pdf_files:
                 self.log("No PDF files found in the selected folder!")
-                self.process_btn.config(state="normal", text="▶  PROCESS INVOICES", bg="#e0e0e0")
                 return
             self.log(f"Found {len(pdf_files)} PDF file(s)")
-            successful = failed = unknown_variant = airports_added = 0
-
-            for i, file in enumerate(pdf_files, 1):
-                self.log(f"\n[{i}/{len(pdf_files)}] Processing: {file}")
-                data = None
-                has_problem = False
-                src = os.path.join(source_path, file)
-
+            # If processing_service.py is running, its warm workers do the
+            # parsing; otherwise (the usual case) it happens right here.
+            service = None
+            if profile != PROFILE_PLAIN:
                 try:
-                    # Read text from original for format detection + field extraction
-                    doc  = fitz.open(src)
-                    text = doc[0].get_text("text")
-                    doc.close()
-
-                    fmt = detect_format(text)
-                    if not fmt:
-                        self.log("  ✗ Could not detect format")
-                        failed += 1
-                        # Still produce a plain, unbranded-but-safe copy so
-                        # there's SOMETHING to review in errored_invoices/,
-                        # even without knowing which overlay style to use.
-                        try:
-                            shutil.copy2(src, os.path.join(errored_path, file))
-                            shutil.copy2(src, os.path.join(plain_path, file))
-                        except Exception:
-                            pass
-                        continue
-                    self.log(f"  Format: {fmt.upper()}")
-
-                    agent, invoice_no, last_name = extract_fields(text, fmt, log_fn=self.log)
-                    if not invoice_no or not last_name:
-                        has_problem = True
-
-                    # ── PLAIN: original content, always produced ────────
-                    # This is what makes the logo/branding consistent across
-                    # every output, and what errored_invoices/ falls back to
-                    # when a full reformat isn't possible — "the old
-                    # styling": the same overlay + backside every invoice
-                    # has always gotten, just without the new layout.
-                    plain_dest = os.path.join(plain_path, file)
-                    shutil.copy2(src, plain_dest)
-                    if self.apply_overlay_and_backside(plain_dest, fmt):
-                        self.log("  ✓ Plain copy: overlay & back page applied")
-                    else:
-                        self.log("  ✗ Plain copy: overlay failed")
-
-                    if invoice_no and last_name:
-                        plain_new_name = build_filename(agent, invoice_no, last_name)
-                        plain_new_path = os.path.join(plain_path, plain_new_name)
-                        if os.path.exists(plain_new_path) and plain_new_path != plain_dest:
-                            base, ext = os.path.splitext(plain_new_name)
-                            counter = 2
-                            while os.path.exists(os.path.join(plain_path, f"{base} ({counter}){ext}")):
-                                counter += 1
-                            plain_new_name = f"{base} ({counter}){ext}"
-                            plain_new_path = os.path.join(plain_path, plain_new_name)
-                        os.rename(plain_dest, plain_new_path)
-                        plain_dest = plain_new_path
-                        self.log(f"  ✓ Plain copy renamed to: {plain_new_name}")
-
-                    # ── STYLED: the new reformatted layout ───────────────
-                    styled_ok = False
-                    try:
-                        from state_parser import parse as parse_invoice
-                        from invoice_generator import generate_invoice_pdf
-                        from airport_resolver import check_unknown_airports, prompt_and_save
-
-                        self.log(f"  Parsing {file}...")
-                        data = parse_invoice(src)
-
-                        parts = []
-                        if data["flights"]: parts.append(f'{len(data["flights"])} flights')
-                        if data["hotels"]: parts.append(f'{len(data["hotels"])} hotels')
-                        if data["cruises"]: parts.append(f'{len(data["cruises"])} cruises')
-                        if data["tours"]: parts.append(f'{len(data["tours"])} tours')
-                        if data["packages"]: parts.append(f'{len(data["packages"])} packages')
-                        parts.append(f'{len(data["passengers"])} pax')
-                        if data["tickets"]: parts.append(f'{len(data["tickets"])} tickets')
-                        self.log(f"    Parsed: {', '.join(parts)}")
-
-                        for w in data.get("warnings", []):
-                            self.log(f"    ⚠ {w}")
-                        for u in data.get("unrecognized", []):
-                            self.log(f"    ? {u}")
-
-                        unknowns = check_unknown_airports(data)
-                        if unknowns:
-                            self.log(f"  ? Unknown airport(s): {', '.join(unknowns)}")
-                            for city in unknowns:
-                                import queue
-                                result_q = queue.Queue()
-                                def _do_prompt(c=city):
-                                    r = prompt_and_save(c, parent=self.root, source_pdf=src)
-                                    result_q.put(r)
-                                self.root.after(0, _do_prompt)
-                                display, added_new = result_q.get()
-                                if added_new:
-                                    airports_added += 1
-                                self.log(f"    → {city} = {display}")
-                            self.log("  ✓ Airport(s) resolved")
-
-                        styled_dest = os.path.join(styled_path, file)
-                        generate_invoice_pdf(data, styled_dest)
-                        self.log("  ✓ Reformatted to new layout")
-
-                        if self.apply_overlay_and_backside(styled_dest, fmt):
-                            self.log("  ✓ Styled copy: overlay & back page applied")
-                        styled_ok = True
-                    except Exception as e:
-                        self.log(f"  ✗ Reformat failed ({e}) — plain copy is still available")
-                        has_problem = True
-
-                    if styled_ok:
-                        if invoice_no and last_name:
-                            styled_new_name = build_filename(agent, invoice_no, last_name)
-                            styled_new_path = os.path.join(styled_path, styled_new_name)
-                            if os.path.exists(styled_new_path) and styled_new_path != styled_dest:
-                                base, ext = os.path.splitext(styled_new_name)
-                                counter = 2
-                                while os.path.exists(os.path.join(styled_path, f"{base} ({counter}){ext}")):
-                                    counter += 1
-                                styled_new_name = f"{base} ({counter}){ext}"
-                                styled_new_path = os.path.join(styled_path, styled_new_name)
-                            os.rename(styled_dest, styled_new_path)
-                            styled_dest = styled_new_path
-                            self.log(f"  ✓ Styled copy renamed to: {styled_new_name}")
-                            self.processed_files.append((src, styled_dest))
-                        else:
-                            self.log("  ⚠ Styled copy kept as original filename (missing invoice_no/last_name)")
-
-                    if data and data.get("unrecognized"):
-                        self.log(f"  ⚠ {len(data['unrecognized'])} unrecognized line(s)")
-                        has_problem = True
-                        unknown_variant += 1
-
-                    # ── ERRORED: a copy of whatever's in "plain", for any
-                    # file with a problem — missing rename info, a reformat
-                    # exception, or unrecognized content. Deliberately the
-                    # plain version, not the (possibly incomplete) styled
-                    # one, since it's the more reliable copy to hand a
-                    # human for review.
-                    if has_problem:
-                        try:
-                            shutil.copy2(plain_dest, os.path.join(errored_path, os.path.basename(plain_dest)))
-                            self.log(f"  ⚠ Copy saved to errored_invoices/ for review")
-                        except Exception as e:
-                            self.log(f"  ⚠ Could not save to errored_invoices: {e}")
-                        if not (data and data.get("unrecognized")):
-                            failed += 1
-                    else:
-                        successful += 1
-
-                except Exception as e:
-                    self.log(f"  ✗ Error: {e}")
-                    failed += 1
-                    try:
-                        shutil.copy2(src, os.path.join(errored_path, file))
-                    except Exception:
-                        pass
+                    import processing_service
+                    service = processing_service.connect()
+                except Exception:
+                    service = None
+                if service:
+                    self.log(f"Using processing service on port {service.port}")
+
+            result = invoice_pipeline.run_batch(
+                source_path, profile, log=self.log, files=pdf_files,
+                resolve_airport=self._resolve_airport, service=service)
+            self.processed_files = result["processed_files"]
+            successful = result["successful"]
+            failed = result["failed"]
+            unknown_variant = result["unknown_variant"]
+            coverage_gaps = result["coverage_gaps"]
+            write_failures = result["write_failures"]
 
             self.log(f"\n{'='*50}\nSUMMARY:"
                      f"\n  Processed correctly : {successful}"
                      f"\n  Problems             : {failed}"
                      f"\n  Unknown variants     : {unknown_variant}"
-                     f"\n  Airports Added       : {airports_added}")
+                     f"\n  Airports Added       : {result['airports_added']}"
+                     f"\n  Coverage gaps        : {len(coverage_gaps)}")
+            for name, gap in coverage_gaps:
+                self.log(f"    {name}: {gap}")
+            if result["errored"]:
+                self.log(f"  Reasons for the {len(result['errored'])} file(s) in errored_invoices/ "
+                         f"are in errored_invoices/{invoice_pipeline.REASONS_FILENAME}")
+            if write_failures:
+                self.log(f"  ✗ Could not write {len(write_failures)} file(s):")
+                for path, err in write_failures:
+                    self.log(f"    {path}: {err}")
+            if result["parser_profile"]:
+                from state_parser import format_profile
+                self.log("\n" + format_profile(result["parser_profile"]))
             if successful > 0 or unknown_variant > 0 or failed > 0:
+                write_line = (f"\n✗ {len(write_failures)} output(s) could not be written — see log"
+                              if write_failures else "")
                 messagebox.showinfo("Complete",
                                     f"Processing complete!\n"
                                     f"✓ {successful} processed correctly\n"
                                     f"✗ {failed} problem(s)\n"
                                     f"? {unknown_variant} unknown variant(s)\n"
-                                    f"✈ Airports Added: {airports_added}")
+                                    f"✈ Airports Added: {result['airports_added']}\n"
+                                    f"⚠ Coverage gaps: {len(coverage_gaps)}"
+                                    f"{write_line}")
                 # Show review button
                 self.log(f"\n📋 Click 'Review' to compare original vs processed side by side.")
                 self._show_review_button()
@@ -508,9 +482,103 @@ class PDFRenamerGUI:
             messagebox.showerror("Error", f"An error occurred: {e}")
         finally:
             self.process_btn.config(state="normal", text="▶  PROCESS INVOICES", bg="#e0e0e0")
+            self.watch_btn.config(state="normal")
+
+    # ── Watch mode ────────────────────────────────────────────────
+    # The watcher polls the folder on its own thread and runs each batch
+    # of new arrivals through the same invoice_pipeline.run_batch() the
+    # button does (see invoice_watch.py). Its feed reaches the log via
+    # root.after(), so the window stays usable all day while it runs.
+    def toggle_watch(self):
+        if self.watcher is not None:
+            # Both buttons come back in _on_watch_stopped, once the
+            # watcher thread has really exited — a batch may still be
+            # writing into the same output folders until then
+            self.watcher.stop()
+            self.watcher = None
+            self.watch_btn.config(state="disabled", text="⏳  Stopping...", bg="#e0e0e0")
+            self.log("Watch stopping after the current batch (if any)")
+            return
+        if not self._ready_to_process():
+            return
+        try:
+            from invoice_watch import FolderWatcher
+        except ImportError:
+            messagebox.showerror("Not Found", "invoice_watch.py not found in the same folder.")
+            return
+        self.watch_btn.config(state="disabled", text="⏳  Checking...")
+        self.process_btn.config(state="disabled")
+        watcher = FolderWatcher(self.source_folder.get(), self._selected_profile(),
+                                log=self._log_from_thread, on_batch=self._on_watch_batch,
+                                on_stopped=lambda: self.root.after(0, self._on_watch_stopped),
+                                resolve_airport=self._resolve_airport)
+
+        def _check():
+            # Hashing what's already there can take a while on the share
+            try:
+                unhandled = watcher.unhandled()
+            except OSError as e:
+                unhandled = e
+            self.root.after(0, self._begin_watch, watcher, unhandled)
+        threading.Thread(target=_check, daemon=True).start()
+
+    def _begin_watch(self, watcher, unhandled):
+        self.watch_btn.config(state="normal")
+        if isinstance(unhandled, OSError):
+            self.watch_btn.config(text="👁  WATCH FOLDER")
+            self.process_btn.config(state="normal")
+            messagebox.showerror("Error", f"Could not read the folder: {unhandled}")
+            return
+        skip_existing = False
+        if unhandled:
+            answer = messagebox.askyesnocancel(
+                "Watch Folder",
+                f"{len(unhandled)} PDF(s) already in this folder haven't been through "
+                f"watch mode yet.\n\nYes — process them now, then watch for new ones\n"
+                f"No — treat them as done and only process new arrivals")
+            if answer is None:
+                self.watch_btn.config(text="👁  WATCH FOLDER")
+                self.process_btn.config(state="normal")
+                return
+            skip_existing = not answer
+        self.watcher = watcher
+        self.watch_btn.config(text="■  STOP WATCHING", bg="#cfe8cf")
+        self.log(f"Output: {PROFILE_LABELS[watcher.profile]}")
+        watcher.start(skip_existing=skip_existing)
+
+    def _on_watch_stopped(self):
+        self.watch_btn.config(state="normal", text="👁  WATCH FOLDER", bg="#e0e0e0")
+        self.process_btn.config(state="normal")
+
+    def _log_from_thread(self, message):
+        self.root.after(0, self.log, message)
+
+    def _on_watch_batch(self, summary):
+        def _update():
+            self.processed_files.extend(summary["processed_files"])
+            if self.processed_files:
+                self._show_review_button()
+        self.root.after(0, _update)
+
+    def _resolve_airport(self, city, src):
+        """Called from the processing thread: show the unknown-airport
+        prompt on the Tk thread and wait for the answer."""
+        import queue
+        from airport_resolver import prompt_and_save
+        result_q = queue.Queue()
+
+        def _do_prompt():
+            result_q.put(prompt_and_save(city, parent=self.root, source_pdf=src))
+        self.root.after(0, _do_prompt)
+        return result_q.get()
 
     def _show_review_button(self):
-        """Show a review button in the log area after processing."""
+        """Show a review button in the log area after processing — once:
+        later batches (and every watch batch) reuse the same button, which
+        always opens the current processed_files."""
+        existing = getattr(self, "_review_frame", None)
+        if existing is not None and existing.winfo_exists():
+            return
         review_frame = tk.Frame(self.main_frame, bg=self.CLR_BG)
         review_frame.pack(fill="x", padx=24, pady=(0, 8))
 
@@ -526,14 +594,16 @@ class PDFRenamerGUI:
         self._review_frame = review_frame
 
     def _open_review(self):
-        """Open the comparison viewer for each processed file."""
+        """Open one review window over every processed file — step through
+        the pairs with the keyboard; approve/flag decisions are saved next
+        to the styled output so a half-finished review can be resumed."""
         if not self.processed_files:
             return
         try:
-            from compare_view import CompareViewer
-            # Open comparison for the first file (user can close and it shows next)
-            for orig, proc in self.processed_files:
-                CompareViewer(orig, proc, parent=self.root)
+            from compare_view import ReviewQueue, DECISIONS_FILENAME
+            out_dir = os.path.dirname(self.processed_files[0][1])
+            ReviewQueue(self.processed_files, parent=self.root,
+                        decisions_path=os.path.join(out_dir, DECISIONS_FILENAME))
         except ImportError:
             # Fallback: just open the output folder
             self.log("  compare_view.py not found — opening output folder instead")
@@ -550,6 +620,11 @@ class PDFRenamerGUI:
 
 
 if __name__ == "__main__":
+    # The invoice batch runs in watchdogged worker processes; in a frozen
+    # build each one relaunches this executable, which must hand straight
+    # over to multiprocessing instead of opening another window.
+    import multiprocessing
+    multiprocessing.freeze_support()
     # Same safety net as invoice_portal.py, for the case where this screen
     # is launched directly rather than through the portal.
     try:
@@ -0,0 +1,340 @@
+"""
+invoice_records.py — Typed, slotted records for the segments state_parser
+pulls out of an invoice (passengers, flights, cars, hotels, cruises,
+tours, packages, tickets).
+
+These used to be plain dicts — a flight was ~24 keys, each with its own
+hash table and key pointers, repeated for every flight of every invoice
+in a batch. A record keeps the same values in fixed __slots__ instead,
+with no per-instance dict, and pickles as (class, tuple of values), so
+the field names don't go over the pipe with every segment. What that
+buys, per benchmarks/bench_records.py (500 five-page invoices): about
+17% less memory held (7.3 vs 8.8 MB) and slightly smaller pickles (2.4
+vs 2.6 KB an invoice). It isn't free: every record is read out slot by
+slot, so pickle.dumps() takes about 1.6x as long as for the dicts
+(60 vs 37 ms) and json.dumps() about 1.5x (91 vs 60 ms) — some 0.05 ms
+more per invoice, next to the milliseconds its fitz work takes.
+
+Everything that reads a segment still reads it like a dict. invoice_
+generator's fl.get("departure_city") and p["full_slash"], the parser's
+own current_hotel["notes"].append(...) and .setdefault("payments", []),
+airport_resolver's fl.get(...) — all of it works unchanged. Two details
+keep a record indistinguishable from the dict it replaces:
+
+  * Keys the parser only sets sometimes (a flight's "equipment", a
+    tour's "payments") are slots that start out _UNSET: "equipment" in
+    fl is False, fl.get("equipment") is None and to_dict() leaves it
+    out, exactly as if the key had never been added.
+  * A key with no slot at all (a label variant nobody planned for) goes
+    into a small per-record `extra` dict instead of raising, so the
+    parser can never lose data to a missing field.
+
+JSON doesn't know about records — pass default=json_default to
+json.dump()/dumps(), or call to_plain() on a whole parse result first.
+"""
+
+import dataclasses
+from operator import attrgetter
+from collections.abc import MutableMapping
+
+
+class _Unset:
+    """Marks a slot whose key the parser hasn't set (as opposed to set to
+    None). One instance, and it pickles as a reference to it."""
+    __slots__ = ()
+
+    def __repr__(self):
+        return "_UNSET"
+
+    def __reduce__(self):
+        return "_UNSET"
+
+    def __bool__(self):
+        return False
+
+
+_UNSET = _Unset()
+
+
+class Record:
+    """The dict-style API shared by every record type below."""
+    __slots__ = ()
+    _fields = ()           # slot names in declaration order, minus "extra"
+    _field_set = frozenset()
+    _values = None         # attrgetter over every slot — to_tuple() in one C call
+
+    # ── Mapping protocol ──────────────────────────────────────────
+    def __getitem__(self, key):
+        if key in self._field_set:
+            value = getattr(self, key)
+            if value is not _UNSET:
+                return value
+        elif self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in self._field_set:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __delitem__(self, key):
+        if key in self._field_set and getattr(self, key) is not _UNSET:
+            setattr(self, key, _UNSET)
+        elif self.extra and key in self.extra:
+            del self.extra[key]
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        if key in self._field_set:
+            return getattr(self, key) is not _UNSET
+        return bool(self.extra) and key in self.extra
+
+    def __iter__(self):
+        for name in self._fields:
+            if getattr(self, name) is not _UNSET:
+                yield name
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def get(self, key, default=None):
+        if key in self._field_set:
+            value = getattr(self, key)
+            return default if value is _UNSET else value
+        if self.extra:
+            return self.extra.get(key, default)
+        return default
+
+    def setdefault(self, key, default=None):
+        value = self.get(key, _UNSET)
+        if value is _UNSET:
+            self[key] = value = default
+        return value
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return [self[k] for k in self]
+
+    def items(self):
+        return [(k, self[k]) for k in self]
+
+    def __eq__(self, other):
+        if isinstance(other, (Record, dict)):
+            return self.to_dict() == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    # ── Conversions ───────────────────────────────────────────────
+    def to_dict(self) -> dict:
+        """The plain dict this record stands in for (nested lists/dicts
+        are shared, not copied)."""
+        out = {name: getattr(self, name) for name in self._fields
+               if getattr(self, name) is not _UNSET}
+        if self.extra:
+            out.update(self.extra)
+        return out
+
+    @classmethod
+    def from_dict(cls, d: dict):
+        """Back from to_dict() — or from the JSON processing_service sends."""
+        rec = cls()
+        for key, value in d.items():
+            rec[key] = value
+        return rec
+
+    def to_tuple(self) -> tuple:
+        """Every slot's value in declaration order, "extra" last — the
+        compact form. _UNSET slots stay _UNSET."""
+        return self._values(self)
+
+    @classmethod
+    def from_tuple(cls, values: tuple):
+        return cls(*values)
+
+    def __reduce__(self):
+        # (class, values) — pickle memoizes the class reference, so a list
+        # of records costs its values and little else
+        return (type(self), self.to_tuple())
+
+
+def _record(cls):
+    """@dataclass(slots=True) plus the lookup tables Record's methods use.
+    eq=False: Record.__eq__ (which also compares equal to the plain dict)
+    is kept."""
+    cls = dataclasses.dataclass(slots=True, eq=False, repr=False)(cls)
+    cls._fields = tuple(f.name for f in dataclasses.fields(cls) if f.name != "extra")
+    cls._field_set = frozenset(cls._fields)
+    cls._values = attrgetter(*cls.__slots__)
+    MutableMapping.register(cls)
+    return cls
+
+
+@_record
+class Passenger(Record):
+    last_name: str = _UNSET
+    first_name: str = _UNSET
+    middle_name: str = _UNSET
+    full_slash: str = _UNSET
+    extra: dict = None
+
+
+@_record
+class Flight(Record):
+    date_raw: str = _UNSET
+    day_name: str = _UNSET
+    airline: str = _UNSET
+    flight_number: str = _UNSET
+    cabin_class: str = _UNSET
+    operated_by: str = _UNSET
+    departure_city: str = _UNSET
+    departure_time: str = _UNSET
+    arrival_city: str = _UNSET
+    arrival_time: str = _UNSET
+    arrives_next_day: str = _UNSET
+    duration: str = _UNSET
+    nonstop: bool = _UNSET
+    confirmed: bool = _UNSET
+    baggage_allowance: str = _UNSET
+    seats: list = _UNSET
+    meals: str = _UNSET
+    dep_terminal: str = _UNSET
+    arr_terminal: str = _UNSET
+    airline_locator_carrier: str = _UNSET
+    airline_locator_code: str = _UNSET
+    wheelchair: bool = _UNSET
+    equipment: str = _UNSET
+    notes: list = _UNSET
+    extra: dict = None
+
+
+@_record
+class Car(Record):
+    date_raw: str = _UNSET
+    day_name: str = _UNSET
+    description: str = _UNSET
+    details: list = _UNSET
+    pickup_date: str = _UNSET
+    pickup_location: str = _UNSET
+    dropoff_date: str = _UNSET
+    dropoff_location: str = _UNSET
+    rate: str = _UNSET
+    confirmation: str = _UNSET
+    extra: dict = None
+
+
+@_record
+class Hotel(Record):
+    chain: str = _UNSET
+    nights: int = _UNSET
+    checkin_date: str = _UNSET
+    checkout_date: str = _UNSET
+    status: str = _UNSET
+    name: str = _UNSET
+    address: str = _UNSET
+    city: str = _UNSET
+    phone: str = _UNSET
+    fax: str = _UNSET
+    rate_currency: str = _UNSET
+    rate_amount: str = _UNSET
+    confirmation: str = _UNSET
+    guarantee: str = _UNSET
+    approx_total: str = _UNSET
+    cancel_policy: str = _UNSET
+    notes: list = _UNSET
+    room_info: str = _UNSET
+    extra: dict = None
+
+
+@_record
+class Cruise(Record):
+    # "details" stays a free-form dict: vendor, ship, ports, payments...
+    date_raw: str = _UNSET
+    day_name: str = _UNSET
+    details: dict = _UNSET
+    extra: dict = None
+
+
+@_record
+class Package(Record):
+    date_raw: str = _UNSET
+    day_name: str = _UNSET
+    details: dict = _UNSET
+    extra: dict = None
+
+
+@_record
+class Tour(Record):
+    date_raw: str = _UNSET
+    day_name: str = _UNSET
+    vendor: str = _UNSET
+    amount: str = _UNSET
+    confirmation: str = _UNSET
+    details: list = _UNSET
+    raw_lines: list = _UNSET
+    type: str = _UNSET
+    total_cost: str = _UNSET
+    payments: list = _UNSET
+    balance_due: str = _UNSET
+    balance_due_date: str = _UNSET
+    extra: dict = None
+
+
+@_record
+class Ticket(Record):
+    passenger: str = _UNSET
+    ticket_number: str = _UNSET
+    payment_method: str = _UNSET
+    amount_usd: str = _UNSET
+    extra: dict = None
+
+
+RECORD_TYPES = (Passenger, Flight, Car, Hotel, Cruise, Package, Tour, Ticket)
+
+# Which list in a parse result holds which record type
+SECTIONS = {
+    "passengers": Passenger, "flights": Flight, "cars": Car, "hotels": Hotel,
+    "cruises": Cruise, "packages": Package, "tours": Tour, "tickets": Ticket,
+}
+
+
+def json_default(obj):
+    """json.dump(..., default=json_default) — records serialize as the
+    dicts they stand in for."""
+    if isinstance(obj, Record):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def to_plain(data: dict) -> dict:
+    """A parse result with every record swapped for its plain dict (a
+    shallow copy; the lists inside records are shared)."""
+    out = dict(data)
+    for section in SECTIONS:
+        if isinstance(out.get(section), list):
+            out[section] = [r.to_dict() if isinstance(r, Record) else r
+                            for r in out[section]]
+    return out
+
+
+def from_plain(data: dict) -> dict:
+    """to_plain() reversed — e.g. for a parse result that came back from
+    processing_service as JSON."""
+    out = dict(data)
+    for section, cls in SECTIONS.items():
+        if isinstance(out.get(section), list):
+            out[section] = [cls.from_dict(r) if isinstance(r, dict) else r
+                            for r in out[section]]
+    return out
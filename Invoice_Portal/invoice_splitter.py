@@ -0,0 +1,154 @@
+"""
+invoice_splitter.py — Cut a bulk export (hundreds of invoices printed
+into one PDF) back into one PDF per invoice, in memory.
+
+Everything downstream — detect_format, extract_fields, state_parser —
+assumes one invoice per file, so a bulk export used to be split by hand
+before it could go through the batch. iter_ranges() walks the export a
+page at a time and finds where each invoice starts; cut() copies one
+invoice's pages into a PDF of its own (bytes, never a file).
+
+Reading every page is what costs, so may_hold_several() looks first: it
+reads only the last page's header, and only a file it flags is scanned.
+invoice_pipeline does both inside the watchdogged worker's analyze step
+(analyze_invoice), so a hostile export can't hang the batch's own
+process. visual_diff uses the same ranges to pair each invoice of an
+export with its plain copy.
+
+Where an invoice starts is read off the top of each page:
+
+  * a header marker — "SALES PERSON:" (ITIN) or "ITIN NO:" (TIPITIN) —
+    in the first HEAD_LINES lines, and
+  * the invoice number next to it, and the "PAGE: n" line, if printed.
+
+ITIN invoices repeat their header on page 2+, so a header alone isn't a
+new invoice. Only a header that says PAGE 1, or names a different
+invoice number than the current invoice's, starts the next one. A
+repeated header (the same number, PAGE 2 or later, or no numbers at
+all) and a page with no header continue the current invoice.
+
+    python invoice_splitter.py <export.pdf>              list the invoices
+    python invoice_splitter.py <export.pdf> --out DIR    also write them
+"""
+
+import os
+import re
+import sys
+
+import fitz
+
+HEAD_LINES = 15          # lines at the top of a page the header must be in
+
+_HEADER_RE = re.compile(r'SALES PERSON:|ITIN NO:')
+_INVOICE_NO_RE = re.compile(r'ITIN\s*/\s*INVOICE NO\.?\s+(\d+)|ITIN NO:\s*(\d+)')
+_PAGE_NO_RE = re.compile(r'^\s*PAGE:\s*(\d+)', re.MULTILINE)
+
+
+def read_page_head(text: str):
+    """(has_header, invoice_no or None, page_no or None) from the top of
+    one page's text."""
+    head = "\n".join(text.split("\n", HEAD_LINES)[:HEAD_LINES])
+    if not _HEADER_RE.search(head):
+        page = _PAGE_NO_RE.search(head)
+        return False, None, int(page.group(1)) if page else None
+    inv = _INVOICE_NO_RE.search(head)
+    page = _PAGE_NO_RE.search(head)
+    return (True, (inv.group(1) or inv.group(2)) if inv else None,
+            int(page.group(1)) if page else None)
+
+
+def _starts_invoice(has_header, invoice_no, page_no, current_no) -> bool:
+    if not has_header:
+        return False
+    if page_no == 1:
+        return True
+    return invoice_no is not None and current_no is not None and invoice_no != current_no
+
+
+def may_hold_several(doc, first_text: str = None) -> bool:
+    """
+    Cheap test before iter_ranges() reads every page: could this open
+    document hold more than one invoice? Reads the head of the last page
+    only (first_text is page 0's text, if the caller already has it).
+    True when that page names a different invoice number than page 0,
+    or its "PAGE: n" is lower than its position in the file. Page
+    numbers start over at each invoice.
+    """
+    pages = len(doc)
+    if pages < 2:
+        return False
+    if first_text is None:
+        first_text = doc[0].get_text("text")
+    _, first_no, _ = read_page_head(first_text)
+    has_header, invoice_no, page_no = read_page_head(doc[pages - 1].get_text("text"))
+    if has_header and invoice_no and first_no and invoice_no != first_no:
+        return True
+    return page_no is not None and page_no < pages
+
+
+def iter_ranges(doc):
+    """(first_page, last_page, invoice_no) for each invoice in an open
+    document, in order, each yielded as soon as the next one starts."""
+    start, current_no = 0, None
+    for i, page in enumerate(doc):
+        has_header, invoice_no, page_no = read_page_head(page.get_text("text"))
+        if i and _starts_invoice(has_header, invoice_no, page_no, current_no):
+            yield start, i - 1, current_no
+            start, current_no = i, invoice_no
+        elif invoice_no and not current_no:
+            current_no = invoice_no
+    if len(doc):
+        yield start, len(doc) - 1, current_no
+
+
+def cut(doc, first: int, last: int) -> bytes:
+    """Pages first..last of an open document, as a PDF of their own."""
+    with fitz.open() as part:
+        part.insert_pdf(doc, from_page=first, to_page=last)
+        # garbage=3 merges the fonts every copied page brings along
+        return part.tobytes(garbage=3, deflate=True)
+
+
+def iter_invoices(pdf_bytes: bytes):
+    """(first_page, last_page, invoice_no, part_bytes) per invoice in the
+    PDF. A file holding a single invoice comes back as one part with its
+    original bytes — nothing re-encoded."""
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        pages = len(doc)
+        for first, last, invoice_no in iter_ranges(doc):
+            if first == 0 and last == pages - 1:
+                yield first, last, invoice_no, pdf_bytes
+                return
+            yield first, last, invoice_no, cut(doc, first, last)
+
+
+def part_name(export_name: str, index: int, invoice_no=None) -> str:
+    """File name for the index'th (1-based) invoice of an export — only
+    used until the pipeline renames it from its own fields."""
+    stem = os.path.splitext(export_name)[0]
+    suffix = f" {invoice_no}" if invoice_no else ""
+    return f"{stem} part {index:03d}{suffix}.pdf"
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Split a bulk invoice export into one PDF per invoice.")
+    ap.add_argument("pdf")
+    ap.add_argument("--out", help="write each invoice into this folder")
+    args = ap.parse_args()
+
+    with open(args.pdf, "rb") as f:
+        pdf_bytes = f.read()
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+    count = 0
+    for count, (first, last, invoice_no, data) in enumerate(iter_invoices(pdf_bytes), 1):
+        name = part_name(os.path.basename(args.pdf), count, invoice_no)
+        print(f"{count:4d}  pages {first + 1}-{last + 1}  invoice {invoice_no or '?'}  {name}")
+        if args.out:
+            path = os.path.join(args.out, name)
+            with open(path + ".tmp", "wb") as f:
+                f.write(data)
+            os.replace(path + ".tmp", path)
+    print(f"{count} invoice(s)")
+    sys.exit(0)
@@ -0,0 +1,386 @@
+"""
+invoice_watch.py — Watch-folder mode: process customer invoices as they
+land in the source folder, instead of all at once at the end of the day.
+
+A FolderWatcher polls the folder every POLL_SECONDS. A PDF is picked up
+once it's fully written:
+
+  * its size and mtime haven't changed for STABLE_POLLS polls in a row
+    (a copy over the share arrives in pieces — a file still growing, or
+    rewritten since the last poll, waits), and
+  * it ends in a %%EOF marker (a PDF whose copy was interrupted never
+    gets one, so it isn't processed half-read).
+
+Then each batch of newly arrived files goes through
+invoice_pipeline.run_batch(), exactly as the Process button would run it
+(watchdogged worker, write-behind, bulk exports split) — just a few
+files at a time, all day.
+
+What's been handled is tracked by content, not name: the SHA-256 of
+every processed file goes into watch_manifest.json in the folder itself,
+so every agent watching the same share folder shares it. A file dropped
+in again, or under another name, is skipped; a corrected invoice saved
+over the old one has a new hash and is processed again. The original
+PDFs stay where they are, as they do after a manual batch.
+
+Two agents can see the same new file in the same poll, so each file is
+claimed before it's processed: an exclusively created
+watch_manifest.json.<sha256>.claim next to the manifest, removed once
+the manifest records the file. Whoever creates it processes the file;
+the other leaves it alone. A claim left behind by an agent that died
+mid-batch is taken over after CLAIM_STALE_SECONDS.
+
+This is polling, not OS file events — nothing to install, and it works
+the same on an SMB share, where change notifications are unreliable.
+
+Used by PDFRenamerGUI's "Watch folder" button; also usable headless:
+
+    python invoice_watch.py <folder> [both|plain|styled] [--interval 5]
+                            [--skip-existing] [--once] [--no-isolate]
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import tempfile
+import threading
+
+import invoice_pipeline
+from invoice_processor import PROFILE_BOTH, PROFILE_LABELS
+
+POLL_SECONDS   = 5.0     # how often the folder is listed
+STABLE_POLLS   = 2       # polls a file's size/mtime must hold still
+EOF_TAIL_BYTES = 1024    # how far from the end %%EOF may sit
+MANIFEST_FILENAME = "watch_manifest.json"
+CLAIM_STALE_SECONDS = 3600  # a claim this old belongs to an agent that's gone
+
+
+def _noop(_msg):
+    pass
+
+
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _looks_complete(path: str, size: int) -> bool:
+    """A PDF's last bytes carry %%EOF; a copy still in flight (or cut off)
+    doesn't have them yet."""
+    try:
+        with open(path, "rb") as f:
+            f.seek(max(0, size - EOF_TAIL_BYTES))
+            return b"%%EOF" in f.read()
+    except OSError:
+        return False
+
+
+# ---------------------------------------------------------------------------
+# Manifest
+# ---------------------------------------------------------------------------
+class Manifest:
+    """{sha256: {"name", "at", "result"}} for every file handled
+    ("processed", or "skipped" by mark_existing), in
+    MANIFEST_FILENAME in the watched folder."""
+
+    def __init__(self, folder: str):
+        self.path = os.path.join(folder, MANIFEST_FILENAME)
+        self.entries = {}
+        self.reload()
+
+    def reload(self):
+        """Pick up what other agents watching the same folder recorded."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f).get("processed", {})
+        except (OSError, ValueError):
+            pass
+
+    def __contains__(self, digest):
+        return digest in self.entries
+
+    def _claim_path(self, digest):
+        return f"{self.path}.{digest}.claim"
+
+    def claim(self, digest: str) -> bool:
+        """Take digest for this agent — False if another agent holds it.
+        O_CREAT|O_EXCL is atomic on a share as well as locally."""
+        path = self._claim_path(digest)
+        for _ in range(2):
+            try:
+                os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return True
+            except FileExistsError:
+                try:
+                    if time.time() - os.stat(path).st_mtime < CLAIM_STALE_SECONDS:
+                        return False
+                    os.remove(path)
+                except OSError:
+                    pass            # released meanwhile — try again
+        return False
+
+    def release(self, digest: str):
+        try:
+            os.remove(self._claim_path(digest))
+        except OSError:
+            pass
+
+    def add(self, digest: str, name: str, result: str):
+        self.entries[digest] = {"name": name, "at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                                "result": result}
+
+    def save(self):
+        # Merge with whatever another agent wrote since our last read, then
+        # replace atomically — never a half-written manifest on the share.
+        # The temp file is this process's own: agents saving at the same
+        # moment mustn't write into each other's
+        ours = self.entries
+        self.reload()
+        self.entries.update(ours)
+        fd, tmp_path = tempfile.mkstemp(prefix=MANIFEST_FILENAME + ".", suffix=".tmp",
+                                        dir=os.path.dirname(self.path))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "processed": self.entries}, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+
+# ---------------------------------------------------------------------------
+# Watcher
+# ---------------------------------------------------------------------------
+class FolderWatcher:
+    """
+    Poll folder and run each batch of newly arrived, fully written PDFs
+    through invoice_pipeline.run_batch().
+
+    log(msg) gets the watcher's and the pipeline's progress lines (from
+    the watcher thread); on_batch(summary) gets each run_batch() result;
+    on_stopped() is called last thing on the watcher thread, once no
+    batch can still be running. batch_options go to run_batch() as they
+    are (resolve_airport, service, isolate, ...).
+    """
+
+    def __init__(self, folder: str, profile: str = PROFILE_BOTH, log=None,
+                 interval: float = POLL_SECONDS, on_batch=None, on_stopped=None,
+                 **batch_options):
+        self.folder = folder
+        self.profile = profile
+        self.log = log or _noop
+        self.interval = interval
+        self.on_batch = on_batch
+        self.on_stopped = on_stopped
+        self.batch_options = batch_options
+        self.manifest = Manifest(folder)
+        self._pending = {}      # name -> ((size, mtime_ns), polls unchanged)
+        self._known = {}        # name -> (size, mtime_ns) already handled
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ── Lifecycle ────────────────────────────────────────────────
+    def start(self, skip_existing: bool = False):
+        """Watch on a background thread. skip_existing: mark_existing()
+        first (on that thread — it hashes every file)."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(skip_existing,), daemon=True)
+        self._thread.start()
+
+    def stop(self, wait: bool = False):
+        """Stop after the batch in progress (if any) finishes."""
+        self._stop.set()
+        if wait and self._thread is not None:
+            self._thread.join()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self, skip_existing):
+        try:
+            if skip_existing:
+                try:
+                    self.log(f"Marked {self.mark_existing()} existing PDF(s) as done")
+                except OSError as e:
+                    self.log(f"✗ Could not mark existing PDFs: {e}")
+            self.log(f"Watching {self.folder} (every {self.interval:g} s)")
+            while not self._stop.is_set():
+                try:
+                    self.poll_once()
+                except Exception as e:
+                    self.log(f"✗ Watch error: {e}")
+                self._stop.wait(self.interval)
+            self.log("Stopped watching")
+        finally:
+            if self.on_stopped:
+                self.on_stopped()
+
+    # ── Scanning ─────────────────────────────────────────────────
+    def _stat(self, name):
+        try:
+            st = os.stat(os.path.join(self.folder, name))
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    def _ready(self) -> list:
+        """Names that have held still for STABLE_POLLS polls, aren't known
+        already, and look complete."""
+        ready = []
+        names = invoice_pipeline.list_invoices(self.folder)
+        for name in list(self._pending):
+            if name not in names:
+                del self._pending[name]
+        for name in names:
+            sig = self._stat(name)
+            if sig is None or self._known.get(name) == sig:
+                continue
+            previous, polls = self._pending.get(name, (None, 0))
+            polls = polls + 1 if sig == previous else 1
+            self._pending[name] = (sig, polls)
+            if polls >= STABLE_POLLS and sig[0] > 0 \
+                    and _looks_complete(os.path.join(self.folder, name), sig[0]):
+                ready.append((name, sig))
+        return ready
+
+    def mark_existing(self) -> int:
+        """Record every PDF already in the folder as handled without
+        processing it (a watch started after the day's manual batch)."""
+        count = 0
+        for name in invoice_pipeline.list_invoices(self.folder):
+            sig = self._stat(name)
+            if sig is None:
+                continue
+            digest = file_sha256(os.path.join(self.folder, name))
+            if digest not in self.manifest:
+                self.manifest.add(digest, name, "skipped")
+                count += 1
+            self._known[name] = sig
+        if count:
+            self.manifest.save()
+        return count
+
+    def unhandled(self) -> list:
+        """PDFs in the folder the manifest doesn't have yet."""
+        self.manifest.reload()
+        return [name for name in invoice_pipeline.list_invoices(self.folder)
+                if file_sha256(os.path.join(self.folder, name)) not in self.manifest]
+
+    def poll_once(self) -> list:
+        """One poll: process whatever is ready. Returns the names processed."""
+        ready = self._ready()
+        if not ready:
+            return []
+        hashed = []
+        for name, sig in ready:
+            del self._pending[name]
+            try:
+                hashed.append((name, sig, file_sha256(os.path.join(self.folder, name))))
+            except OSError:
+                continue            # gone (or locked) again — next poll
+        # Claim first, then read the manifest: an agent that just finished
+        # one of these saved the manifest before releasing its claim, so
+        # either the claim fails or the reload sees the file as done.
+        claimed = {digest for _, _, digest in hashed if self.manifest.claim(digest)}
+        try:
+            self.manifest.reload()
+            batch, batched = [], set()
+            for name, sig, digest in hashed:
+                if digest in self.manifest:
+                    self._known[name] = sig
+                    # Quietly for a file seen before; a second copy under
+                    # a new name is worth a line in the feed
+                    first_name = self.manifest.entries[digest]["name"]
+                    if first_name != name:
+                        self.log(f"Skipped {name} — same file as {first_name}, already processed")
+                elif digest in claimed and digest not in batched:
+                    batch.append((name, sig, digest))
+                    batched.add(digest)
+                # else another agent has it (or it's a second copy in this
+                # batch): it comes round again, and is in the manifest by then
+            if batch:
+                self._run_batch(batch)
+        finally:
+            for digest in claimed:
+                self.manifest.release(digest)
+        return [name for name, _, _ in batch]
+
+    def _run_batch(self, batch):
+        """Process batch ([(name, sig, digest)]) and record it. A file
+        counts as known only once this has finished — if run_batch()
+        raises, nothing is recorded and the files are tried again."""
+        names = [name for name, _, _ in batch]
+        self.log(f"\n{time.strftime('%H:%M:%S')}  New: {', '.join(names)}")
+        try:
+            import updater
+            # Between batches is the safe point for the background
+            # updater, as the Process button's start is — a watch can
+            # run all day
+            reloaded = updater.apply_pending_updates()
+            if reloaded:
+                self.log(f"Using updated logic: {', '.join(reloaded)}")
+            guard = updater.batch_guard()
+        except Exception:
+            from contextlib import nullcontext
+            guard = nullcontext()
+        with guard:
+            summary = invoice_pipeline.run_batch(
+                self.folder, self.profile, log=self.log, files=names, **self.batch_options)
+
+        # A file with a problem is recorded too: it's in errored_invoices/
+        # for a person now, and running it again unchanged won't help —
+        # a corrected copy has a new hash and comes through on its own
+        for name, _, digest in batch:
+            self.manifest.add(digest, name, "processed")
+        self.manifest.save()
+        for name, sig, _ in batch:
+            self._known[name] = sig
+        self.log(f"{time.strftime('%H:%M:%S')}  Done: {summary['successful']} ok, "
+                 f"{summary['failed']} problem(s), {summary['unknown_variant']} unknown variant(s)")
+        if self.on_batch:
+            self.on_batch(summary)
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Process customer invoices as they arrive in a folder.")
+    ap.add_argument("folder")
+    ap.add_argument("profile", nargs="?", default=PROFILE_BOTH, choices=list(PROFILE_LABELS))
+    ap.add_argument("--interval", type=float, default=POLL_SECONDS,
+                    help=f"seconds between polls (default {POLL_SECONDS:g})")
+    ap.add_argument("--skip-existing", action="store_true",
+                    help="record the PDFs already there as handled instead of processing them")
+    ap.add_argument("--once", action="store_true",
+                    help="process what's ready now and exit")
+    ap.add_argument("--no-isolate", action="store_true",
+                    help="process in this process, without the watchdog")
+    args = ap.parse_args()
+
+    watcher = FolderWatcher(args.folder, args.profile, log=print, interval=args.interval,
+                            isolate=not args.no_isolate)
+    if args.once:
+        if args.skip_existing:
+            print(f"Marked {watcher.mark_existing()} existing PDF(s) as done")
+        # A file has to be seen STABLE_POLLS times before it counts
+        for _ in range(STABLE_POLLS - 1):
+            watcher._ready()
+            time.sleep(min(args.interval, 1.0))
+        processed = watcher.poll_once()
+        print(f"{len(processed)} new file(s) processed")
+        sys.exit(0)
+    watcher.start(skip_existing=args.skip_existing)
+    try:
+        while watcher.running:
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        print("\nStopping after the current batch...")
+        watcher.stop(wait=True)
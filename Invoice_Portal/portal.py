@@ -9,31 +9,66 @@ Icons by Flaticon (https://www.flaticon.com):
 
 import os
 import sys
+
+# The invoice batch runs each file in a watchdogged worker process (see
+# file_watchdog.py). In the frozen app those workers are this executable
+# relaunched with multiprocessing's arguments — freeze_support() spots
+# that and runs the worker instead of a second portal. Must come first.
+if __name__ == "__main__":
+    import multiprocessing
+    multiprocessing.freeze_support()
+
+# TW_IMPORT_AUDIT=1 times every import from here on and writes
+# import_audit.txt to the data folder once the window is up (and again
+# each time a screen opens) — see startup_audit.py.
+import startup_audit
+if startup_audit.enabled():
+    startup_audit.install()
+
+# A relaunch while the portal is already open hands its request ("show
+# the window", "--pdf <folder>") to that copy and exits right here —
+# before the updater, Tk, or anything else heavy — so double-clicking
+# again is near-instant and there's only ever one process writing
+# airport_overrides.json. See single_instance.py.
+_INSTANCE = None
+if __name__ == "__main__":
+    import single_instance
+    _INSTANCE = single_instance.claim(sys.argv[1:])
+
 import math
 import tkinter as tk
 from tkinter import messagebox
 
-# Pull the latest parser/generator/airport logic from GitHub before
-# anything else runs, so a fix takes effect without a new .exe. Must run
-# before InvoicePortal is created — everything downstream (invoice
-# processing, the airport screen) imports those modules lazily, inside
-# method bodies, the first time each screen is actually opened, so this
-# just needs to win the race to be first.
+# Put the cached parser/generator/airport logic on sys.path before
+# anything imports it — no network involved, so the window opens right
+# away from whatever was cached last time. The actual GitHub check runs
+# in the background once the window is up (InvoicePortal._start_update),
+# and anything it downloads is swapped in at the next safe point — before
+# a screen opens or a batch starts — never in the middle of one.
+# Everything downstream imports those modules lazily, inside method
+# bodies, so this just needs to win the race to be first.
 _UPDATE_RESULT = None
 try:
     import updater
-    _UPDATE_RESULT = updater.sync()
+    updater.prepare()
 except Exception as e:
     # Never let an update-check problem stop the app from opening at all.
     print(f"[updater] Skipped ({e}) — using bundled files.")
+    updater = None
     _UPDATE_RESULT = {"status": "error", "updated_files": [], "failed_files": [("updater", str(e))]}
 
-try:
-    from PIL import Image, ImageTk, ImageDraw
-except ImportError:
-    root = tk.Tk(); root.withdraw()
-    messagebox.showerror("Missing Dependency", "pip install Pillow")
-    sys.exit(1)
+from app_paths import data_dir as _data_dir
+
+# Pillow is NOT imported here: the card icons are loaded from PNGs cached
+# in the data folder with plain tk.PhotoImage, and PIL is only imported
+# (by _render_icon) the one time a cached PNG is missing or out of date.
+# The screens import their own heavy dependencies (fitz, ReportLab,
+# pandas, openpyxl) when they're opened, never at startup — keep it that
+# way: anything imported at the top of this file is paid for on every
+# launch before the window can appear.
+ICON_CACHE_DIRNAME = "icon_cache"
+# Bump when an icon drawing function changes so cached PNGs are redrawn
+ICON_VERSION = 1
 
 
 # ---------------------------------------------------------------------------
@@ -48,7 +83,8 @@ def _asset(filename):
 # ---------------------------------------------------------------------------
 # Icon drawing
 # ---------------------------------------------------------------------------
-def _make_customer_icon(size=96) -> Image.Image:
+def _make_customer_icon(size=96):
+    from PIL import Image, ImageDraw
     img = Image.new("RGBA", (size, size), (0, 0, 0, 0))
     d = ImageDraw.Draw(img)
     s, c = size, size // 2
@@ -66,7 +102,8 @@ def _make_customer_icon(size=96) -> Image.Image:
     return img
 
 
-def _make_hotel_icon(size=96) -> Image.Image:
+def _make_hotel_icon(size=96):
+    from PIL import Image, ImageDraw
     img = Image.new("RGBA", (size, size), (0, 0, 0, 0))
     d = ImageDraw.Draw(img)
     s = size
@@ -83,10 +120,11 @@ def _make_hotel_icon(size=96) -> Image.Image:
     return img
 
 
-def _make_airport_icon(size=96) -> Image.Image:
+def _make_airport_icon(size=96):
     """Jet silhouette for the Airport Database card, matching the solid
     navy-silhouette + orange-accent style of the customer (star badge)
     and hotel (window grid) icons."""
+    from PIL import Image, ImageDraw
     img = Image.new("RGBA", (size, size), (0, 0, 0, 0))
     d = ImageDraw.Draw(img)
     s = size
@@ -126,17 +164,57 @@ def _make_airport_icon(size=96) -> Image.Image:
     return img
 
 
-def _load_icon(filename, size, fallback_fn):
-    path = _asset(filename)
+
+def _icon_cache_path(filename, size) -> str:
+    """Where the ready-to-show size x size PNG for this icon is cached.
+    The name carries the bundled asset's size + mtime (or "drawn" when
+    there isn't one) and ICON_VERSION, so replacing hotel.png or changing
+    a _make_* function gets a fresh render instead of the stale cache."""
     try:
-        img = Image.open(path).convert("RGBA")
-        import numpy as np
-        if np.array(img).max() == 0:
+        st = os.stat(_asset(filename))
+        stamp = f"{st.st_size}-{int(st.st_mtime)}"
+    except OSError:
+        stamp = "drawn"
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(_data_dir(), ICON_CACHE_DIRNAME,
+                        f"{stem}_{size}_v{ICON_VERSION}_{stamp}.png")
+
+
+def _render_icon(filename, size, fallback_fn, out_path):
+    """Slow path (first launch, or after an asset/icon change): resize
+    the bundled PNG — or draw the fallback if it's missing or blank — with
+    Pillow, and save the result to out_path for every launch after this."""
+    from PIL import Image
+    try:
+        img = Image.open(_asset(filename)).convert("RGBA")
+        if max(band_max for _, band_max in img.getextrema()) == 0:
             raise ValueError("blank image")
         img = img.resize((size, size), Image.LANCZOS)
     except Exception:
         img = fallback_fn(size)
-    return ImageTk.PhotoImage(img)
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    tmp_path = out_path + ".tmp"
+    img.save(tmp_path, format="PNG")
+    os.replace(tmp_path, out_path)
+
+
+def _load_icon(filename, size, fallback_fn):
+    path = _icon_cache_path(filename, size)
+    if not os.path.exists(path):
+        try:
+            _render_icon(filename, size, fallback_fn, path)
+        except ImportError:
+            # No Pillow and nothing cached — the cards still work, just
+            # without their pictures.
+            print("[portal] Pillow not installed — icons skipped (pip install Pillow).")
+            return tk.PhotoImage(width=size, height=size)
+        except OSError as e:
+            # Data folder not writable: render to a temp file instead
+            import tempfile
+            print(f"[portal] Could not cache icon ({e}).")
+            path = os.path.join(tempfile.gettempdir(), os.path.basename(path))
+            _render_icon(filename, size, fallback_fn, path)
+    return tk.PhotoImage(file=path)
 
 
 # ---------------------------------------------------------------------------
@@ -198,15 +276,20 @@ class PortalCard(tk.Frame):
 # Portal
 # ---------------------------------------------------------------------------
 def _update_status_line():
-    """Turns the module-level _UPDATE_RESULT (from the sync() call at
-    startup) into a short status line + color for display on the portal.
+    """Turns the module-level _UPDATE_RESULT (from the background sync
+    started with the window) into a short status line + color for display
+    on the portal.
     Returns (None, None) if there's nothing worth showing."""
     r = _UPDATE_RESULT
     if not r:
         return None, None
     status = r.get("status")
+    if status == "checking":
+        return "Checking for updates…", "#bbbbbb"
     if status == "updated":
         names = ", ".join(r["updated_files"])
+        if r.get("deferred"):
+            return f"✓ Updated: {names} — applies when the current batch finishes", "#2e8b46"
         return f"✓ Updated: {names}", "#2e8b46"
     if status == "up_to_date":
         return "✓ Up to date", "#999999"
@@ -224,7 +307,7 @@ def _update_status_line():
 class InvoicePortal:
     BG = "#fafafa"
 
-    def __init__(self):
+    def __init__(self, instance=None, request=None):
         self.root = tk.Tk()
         self.root.title("Travel Wizards — Invoice Portal")
         self.root.configure(bg=self.BG)
@@ -233,7 +316,31 @@ class InvoicePortal:
         self.main_frame = tk.Frame(self.root, bg=self.BG)
         self.main_frame.pack(fill="both", expand=True)
         self.airport_frame = None
+        self.update_status = None
         self._build()
+        self._start_update()
+        # after(0) fires once mainloop is running and the window is up —
+        # the time-to-window the audit is for.
+        self.root.after(0, lambda: self._audit("window shown"))
+        if instance is not None:
+            # Hand-offs arrive on the listener thread; bounce them onto Tk
+            instance.start(lambda req: self.root.after(0, self._handle_request, req))
+        if request and request.get("action") != "show":
+            self.root.after(0, self._handle_request, request)
+
+    def _handle_request(self, request):
+        """A request from our own command line or from a relaunch that
+        handed off to us (single_instance.py)."""
+        self.root.deiconify()
+        self.root.lift()
+        self.root.focus_force()
+        action = request.get("action")
+        if action == "pdf":
+            self._open_pdf(folder=request.get("folder"))
+        elif action == "hotel":
+            self._open_hotel()
+        elif action == "airports":
+            self._open_airports()
 
     def _build(self):
         # Header
@@ -277,28 +384,78 @@ class InvoicePortal:
         # token, unconfigured) should be visible without having to go dig
         # through update_log.txt to find out why something didn't update.
         status_text, status_color = _update_status_line()
-        if status_text:
-            st = tk.Label(self.main_frame, text=status_text,
-                          font=("Arial", 8), bg=self.BG, fg=status_color)
-            st.pack(side="bottom", pady=(0, 6))
+        self.update_status = tk.Label(self.main_frame, text=status_text or "",
+                                      font=("Arial", 8), bg=self.BG,
+                                      fg=status_color or self.BG)
+        self.update_status.pack(side="bottom", pady=(0, 6))
+
+    def _audit(self, label):
+        if startup_audit.enabled():
+            startup_audit.mark(label)
+            startup_audit.report(data_dir=_data_dir())
+
+    # ------------------------------------------------------------------
+    # Background update
+    # ------------------------------------------------------------------
+    def _start_update(self):
+        global _UPDATE_RESULT
+        if updater is None:
+            return
+        _UPDATE_RESULT = {"status": "checking", "updated_files": [], "failed_files": []}
+        self._refresh_update_status()
+        updater.sync_in_background(
+            on_done=lambda r: self.root.after(0, lambda: self._update_done(r)))
+
+    def _update_done(self, result):
+        global _UPDATE_RESULT
+        _UPDATE_RESULT = result
+        if result.get("status") == "updated":
+            self._apply_updates()
+        self._refresh_update_status()
+
+    def _apply_updates(self):
+        """Safe point: swap in anything the background sync downloaded.
+        Defers (and says so in the status line) while a batch is running."""
+        if updater is None or not updater.has_pending_updates():
+            return
+        updater.apply_pending_updates()
+        if _UPDATE_RESULT:
+            _UPDATE_RESULT["deferred"] = updater.has_pending_updates()
+            self._refresh_update_status()
+
+    def _refresh_update_status(self):
+        if self.update_status is None:
+            return
+        status_text, status_color = _update_status_line()
+        self.update_status.config(text=status_text or "",
+                                  fg=status_color or self.BG)
 
-    def _open_pdf(self):
+    def _open_pdf(self, folder=None):
+        self._apply_updates()
         try:
             from invoice_processor import PDFRenamerGUI
-            PDFRenamerGUI(parent=self.root)
+            app = PDFRenamerGUI(parent=self.root)
+            if folder:
+                app.set_folder(folder)
+            self._audit("opened Customer Invoices")
         except ImportError:
             messagebox.showerror("Not Found",
                                  "invoice_processor.py not found in the same folder.")
 
     def _open_hotel(self):
+        self._apply_updates()
         try:
             from hotel_invoice_processor import HotelInvoiceGUI
             HotelInvoiceGUI(parent=self.root)
+            self._audit("opened Hotel Invoices")
         except ImportError:
             messagebox.showerror("Not Found",
                                  "hotel_invoice_processor.py not found in the same folder.")
 
     def _open_airports(self):
+        if self.airport_frame is not None:
+            return      # already showing (e.g. a second --airports hand-off)
+        self._apply_updates()
         try:
             from airport_manager import AirportManagerGUI
         except ImportError:
@@ -310,6 +467,7 @@ class InvoicePortal:
         self.airport_frame = tk.Frame(self.root, bg="#ffffff")
         self.airport_frame.pack(fill="both", expand=True)
         AirportManagerGUI(container=self.airport_frame, on_back=self._close_airports)
+        self._audit("opened Airport Database")
 
     def _close_airports(self):
         if self.airport_frame is not None:
@@ -344,4 +502,5 @@ def _open_url(url):
 
 # ---------------------------------------------------------------------------
 if __name__ == "__main__":
-    InvoicePortal().run()
\ No newline at end of file
+    InvoicePortal(instance=_INSTANCE,
+                  request=single_instance.request_from_argv(sys.argv[1:])).run()
\ No newline at end of file
@@ -0,0 +1,514 @@
+"""
+processing_service.py — Warm parser + stamper on localhost, for the GUI
+and for scripts.
+
+Every run of a tool pays the same start-up bill before the first invoice:
+importing fitz and ReportLab, building the airport tables, opening
+overlay.pdf and backside.pdf. And the only way our other scripts could
+use the parser was to drive the GUI. This keeps a pool of worker
+processes with all of that already loaded and answers over HTTP on
+127.0.0.1, so a request costs just the parse/render itself.
+
+    python processing_service.py serve [--workers N] [--port P]   # run it
+
+    POST /parse              body: PDF bytes → JSON: format, rename fields,
+                             filename, state_parser data, unknown airports
+    POST /stamp?variant=plain|styled
+                             body: PDF bytes → the stamped PDF (plain =
+                             original + overlay + back page; styled = new
+                             layout + overlay + back page). Suggested
+                             filename in the X-TW-Filename header.
+    GET  /health             workers, jobs in flight, capacity
+
+Requests need the X-TW-Token header from service.json in the data folder
+(written at start-up, alongside the port), so only this user's programs
+can submit jobs. connect() does the discovery for callers:
+
+    import processing_service
+    svc = processing_service.connect()        # None if not running
+    if svc:
+        info = svc.parse("invoice.pdf")      # or svc.parse_bytes(pdf_bytes)
+        svc.stamp("invoice.pdf", "out.pdf", variant="styled")
+
+Backpressure: at most workers + MAX_QUEUED jobs are accepted at once;
+past that the service answers 503 with Retry-After straight away rather
+than letting requests pile up behind a busy pool. Client.call() honours
+that with a short retry.
+
+Each worker is a file_watchdog.IsolatedWorker, as in the batch: a job
+that runs past JOB_TIMEOUT (or over the memory ceiling) gets a 504 and
+its worker is killed and replaced, so a few hung PDFs can't quietly tie
+up the pool while /health still reports room.
+
+The workers import whatever updater.prepare() puts on sys.path when they
+start — restart the service to pick up a newly downloaded parser.
+Airport overrides saved from the GUI are picked up before the next job.
+"""
+
+import os
+import sys
+import json
+import secrets
+import argparse
+import threading
+import queue
+import multiprocessing
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+from invoice_records import Record
+from app_paths import data_dir as _data_dir
+from file_watchdog import IsolatedWorker, WatchdogError
+
+SERVICE_FILENAME = "service.json"
+DEFAULT_PORT = 0             # 0 = any free port; service.json says which
+MAX_QUEUED   = 8             # accepted-but-waiting jobs beyond one per worker
+MAX_BODY_BYTES = 50 * 1024 * 1024
+JOB_TIMEOUT  = 120           # seconds a single job may take
+CONNECT_TIMEOUT = 0.5        # connect()'s health probe — fail fast if not running
+VARIANTS = ("plain", "styled")
+
+
+
+def _service_path() -> str:
+    return os.path.join(_data_dir(), SERVICE_FILENAME)
+
+
+class JobError(Exception):
+    """A job the worker couldn't complete (unreadable PDF, unknown
+    format for a styled stamp, ...) — reported to the client as 422."""
+    pass
+
+
+# ---------------------------------------------------------------------------
+# Worker side — runs in the worker processes
+# ---------------------------------------------------------------------------
+_W = {}     # per-process warm state, filled by _warm()
+
+
+def _warm():
+    """Pay every import and asset load once per worker."""
+    import tempfile
+    try:
+        import updater
+        updater.prepare()
+    except Exception as e:
+        print(f"[service] updater skipped ({e}) — using bundled files.")
+    import fitz                                    # noqa: F401
+    import state_parser                            # noqa: F401
+    import invoice_generator                       # noqa: F401
+    import airport_lookup
+    from invoice_processor import StampAssets
+    _W["assets"] = StampAssets()
+    _W["tmp"] = tempfile.mkdtemp(prefix="tw_service_")
+    _W["overrides_mtime"] = _overrides_mtime(airport_lookup)
+
+
+def _overrides_mtime(airport_lookup):
+    try:
+        return os.stat(airport_lookup.overrides_path()).st_mtime
+    except OSError:
+        return None
+
+
+def _refresh_airports():
+    """Pick up airports the GUI (or another worker's caller) saved since
+    this worker last looked — a stat() per parse, a JSON read only when it
+    changed."""
+    import airport_lookup
+    mtime = _overrides_mtime(airport_lookup)
+    if mtime != _W.get("overrides_mtime"):
+        airport_lookup.reload_overrides()
+        _W["overrides_mtime"] = mtime
+
+
+def _spool(pdf_bytes: bytes, suffix=".pdf") -> str:
+    """state_parser.parse() and the generator work on paths — give them
+    a private temp file in this worker's scratch folder."""
+    import tempfile
+    fd, path = tempfile.mkstemp(suffix=suffix, dir=_W["tmp"])
+    with os.fdopen(fd, "wb") as f:
+        f.write(pdf_bytes)
+    return path
+
+
+def _analyze(path: str, parse: bool = True) -> dict:
+    """Format, header fields and suggested filename from page 0; plus
+    the full parse ("data", "unknown_airports") unless parse=False — a
+    plain stamp needs only the first page, as the batch's plain profile
+    does."""
+    import fitz
+    import state_parser
+    from invoice_processor import detect_format, extract_fields, build_filename
+    from airport_resolver import check_unknown_airports
+
+    try:
+        with fitz.open(path) as doc:
+            text = doc[0].get_text("text") if len(doc) else ""
+    except Exception as e:
+        raise JobError(f"not a readable PDF ({type(e).__name__})")
+    fmt = detect_format(text)
+    result = {"format": fmt, "fields": None, "filename": None}
+    if fmt:
+        agent, invoice_no, last_name = extract_fields(text, fmt)
+        result["fields"] = {"agent": agent, "invoice_no": invoice_no,
+                            "last_name": last_name}
+        if invoice_no and last_name:
+            result["filename"] = build_filename(agent, invoice_no, last_name)
+    if not parse:
+        return result
+    _refresh_airports()
+    result["data"] = state_parser.parse(path)
+    try:
+        result["unknown_airports"] = check_unknown_airports(result["data"])
+    except Exception as e:
+        # A half-parsed flight (no city) shouldn't cost the caller the
+        # rest of the parse — say so in the warnings instead.
+        result["unknown_airports"] = []
+        result["data"].setdefault("warnings", []).append(
+            f"airport check failed: {e}")
+    return result
+
+
+def _parse_job(pdf_bytes: bytes) -> dict:
+    path = _spool(pdf_bytes)
+    try:
+        return _analyze(path)
+    finally:
+        os.remove(path)
+
+
+def _stamp_job(pdf_bytes: bytes, variant: str):
+    """→ (stamped PDF bytes, {"format", "filename"})"""
+    import fitz
+    from invoice_processor import stamp_document
+    from invoice_generator import generate_invoice_pdf
+
+    src = _spool(pdf_bytes)
+    styled = None
+    try:
+        info = _analyze(src, parse=variant == "styled")
+        if not info["format"]:
+            raise JobError("could not detect invoice format")
+        if variant == "styled":
+            styled = src[:-4] + "_styled.pdf"
+            generate_invoice_pdf(info["data"], styled)
+        with fitz.open(styled or src) as doc:
+            if not stamp_document(doc, info["format"], _W["assets"]):
+                raise JobError("empty document")
+            out = doc.tobytes(garbage=1, deflate=True)
+        return out, {"format": info["format"], "filename": info["filename"]}
+    finally:
+        for p in (src, styled):
+            if p and os.path.exists(p):
+                os.remove(p)
+
+
+def _worker_handle(op, args, log):
+    """Runs inside a worker process (see file_watchdog.IsolatedWorker).
+    A JobError comes back as ("rejected", message) — the watchdog turns
+    any other exception into a RuntimeError, and the client should get
+    a 422 for these, not a 500."""
+    if op == "warm":
+        if not _W:
+            _warm()
+        return None
+    try:
+        if op == "parse":
+            return "ok", _parse_job(*args)
+        if op == "stamp":
+            return "ok", _stamp_job(*args)
+    except JobError as e:
+        return "rejected", str(e)
+    raise ValueError(f"unknown op {op!r}")
+
+
+# ---------------------------------------------------------------------------
+# HTTP side — runs in the service's main process
+# ---------------------------------------------------------------------------
+def _json_default(obj):
+    """Parsed segments are invoice_records, not dicts — send them as the
+    dicts they stand in for; anything else odd as its str(), as before."""
+    if isinstance(obj, Record):
+        return obj.to_dict()
+    return str(obj)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "TravelWizardsService/1"
+
+    def log_message(self, fmt, *args):     # keep the console for errors
+        pass
+
+    def _send(self, status, body: bytes, content_type="application/json",
+              headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, status, obj, headers=None):
+        self._send(status, json.dumps(obj, default=_json_default).encode("utf-8"),
+                   headers=headers)
+
+    def _authorized(self) -> bool:
+        return secrets.compare_digest(self.headers.get("X-TW-Token", ""),
+                                      self.server.token)
+
+    def do_GET(self):
+        if urlsplit(self.path).path != "/health":
+            return self._json(404, {"error": "not found"})
+        srv = self.server
+        self._json(200, {"ok": True, "workers": srv.workers,
+                         "in_flight": srv.in_flight,
+                         "capacity": srv.capacity})
+
+    def do_POST(self):
+        parts = urlsplit(self.path)
+        if parts.path not in ("/parse", "/stamp"):
+            return self._json(404, {"error": "not found"})
+        if not self._authorized():
+            return self._json(403, {"error": "bad or missing X-TW-Token"})
+        variant = parse_qs(parts.query).get("variant", ["plain"])[0]
+        if parts.path == "/stamp" and variant not in VARIANTS:
+            return self._json(400, {"error": f"variant must be one of {VARIANTS}"})
+        try:
+            length = int(self.headers.get("Content-Length", "0"))
+        except ValueError:
+            length = -1
+        if length <= 0:
+            return self._json(400, {"error": "PDF body required"})
+        if length > MAX_BODY_BYTES:
+            return self._json(413, {"error": "PDF too large"})
+        body = self.rfile.read(length)
+
+        srv = self.server
+        if not srv.slots.acquire(blocking=False):
+            return self._json(503, {"error": "busy"}, headers={"Retry-After": "1"})
+        with srv.count_lock:
+            srv.in_flight += 1
+        # Queued jobs wait here for a free worker
+        worker = srv.idle.get()
+        try:
+            worker.begin_file()
+            if parts.path == "/parse":
+                status, result = worker.call("parse", (body,))
+            else:
+                status, result = worker.call("stamp", (body, variant))
+            if status == "rejected":
+                return self._json(422, {"error": result})
+            if parts.path == "/parse":
+                return self._json(200, result)
+            pdf, info = result
+            headers = {"X-TW-Format": info["format"] or ""}
+            if info["filename"]:
+                headers["X-TW-Filename"] = info["filename"]
+            return self._send(200, pdf, "application/pdf", headers)
+        except WatchdogError as e:
+            # The worker is already gone; begin_file() starts a fresh one
+            return self._json(504, {"error": str(e)})
+        except Exception as e:
+            return self._json(500, {"error": str(e) if isinstance(e, RuntimeError)
+                                    else f"{type(e).__name__}: {e}"})
+        finally:
+            srv.idle.put(worker)
+            with srv.count_lock:
+                srv.in_flight -= 1
+            srv.slots.release()
+
+
+class ProcessingService(ThreadingHTTPServer):
+    daemon_threads = True
+    # Connections wait in the listen backlog until a handler thread
+    # accepts them; the default of 5 resets bursts of clients before the
+    # 503 backpressure ever gets a chance to answer them.
+    request_queue_size = 64
+
+    def __init__(self, workers: int = None, port: int = DEFAULT_PORT):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.workers  = workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self.capacity = self.workers + MAX_QUEUED
+        self.slots    = threading.BoundedSemaphore(self.capacity)
+        self.count_lock = threading.Lock()
+        self.in_flight = 0
+        self.token = secrets.token_hex(16)
+        self.pool = [IsolatedWorker("processing_service:_worker_handle", JOB_TIMEOUT)
+                     for _ in range(self.workers)]
+        # Workers join the idle queue once warm — started side by side,
+        # so the first request doesn't wait on every import
+        self.idle = queue.Queue()
+        for worker in self.pool:
+            threading.Thread(target=self._warm_worker, args=(worker,), daemon=True).start()
+
+    def _warm_worker(self, worker):
+        try:
+            worker.call("warm", ())
+        except (WatchdogError, RuntimeError) as e:
+            print(f"[service] worker failed to start ({e}) — retrying on first job.")
+        self.idle.put(worker)
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def publish(self):
+        path = _service_path()
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"port": self.port, "token": self.token,
+                       "pid": os.getpid()}, f)
+        os.replace(tmp_path, path)
+
+    def shutdown_all(self):
+        try:
+            os.remove(_service_path())
+        except OSError:
+            pass
+        self.server_close()
+        for worker in self.pool:
+            worker.close()
+
+
+# ---------------------------------------------------------------------------
+# Client side — for the GUI and scripts
+# ---------------------------------------------------------------------------
+class ServiceError(Exception):
+    """The service answered, but with an error (status, message)."""
+
+    def __init__(self, status, message):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+
+
+class Client:
+    def __init__(self, port: int, token: str):
+        self.port = port
+        self.token = token
+
+    def call(self, method, path, body=None, timeout=JOB_TIMEOUT + 5, retries=5):
+        """→ (status, headers, body). Retries a 503 (service busy) after
+        its Retry-After, up to retries times."""
+        import time
+        import http.client
+        for attempt in range(retries + 1):
+            conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=timeout)
+            try:
+                conn.request(method, path, body=body,
+                             headers={"X-TW-Token": self.token,
+                                      "Content-Type": "application/pdf"})
+                resp = conn.getresponse()
+                data = resp.read()
+            finally:
+                conn.close()
+            if resp.status == 503 and attempt < retries:
+                time.sleep(float(resp.headers.get("Retry-After") or 1))
+                continue
+            return resp.status, resp.headers, data
+
+    def _checked(self, method, path, body=None):
+        status, headers, data = self.call(method, path, body)
+        if status != 200:
+            try:
+                message = json.loads(data).get("error", "")
+            except ValueError:
+                message = data[:200].decode("utf-8", "replace")
+            raise ServiceError(status, message)
+        return headers, data
+
+    def health(self) -> dict:
+        return json.loads(self._checked("GET", "/health")[1])
+
+    def parse(self, pdf_path: str) -> dict:
+        with open(pdf_path, "rb") as f:
+            return self.parse_bytes(f.read())
+
+    def parse_bytes(self, pdf_bytes: bytes) -> dict:
+        """parse() for a PDF already in memory — a read-ahead file, or a
+        part split out of a bulk export, which has no path of its own."""
+        return json.loads(self._checked("POST", "/parse", pdf_bytes)[1])
+
+    def stamp(self, pdf_path: str, out_path: str, variant: str = "plain") -> dict:
+        """Write the stamped PDF to out_path; returns {"format", "filename"}
+        (filename = the suggested build_filename() name, or None)."""
+        with open(pdf_path, "rb") as f:
+            headers, data = self._checked("POST", f"/stamp?variant={variant}", f.read())
+        tmp_path = out_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, out_path)
+        return {"format": headers.get("X-TW-Format") or None,
+                "filename": headers.get("X-TW-Filename")}
+
+
+def connect():
+    """A Client for the running service, or None if there isn't one (no
+    service.json, or nothing answering on its port)."""
+    import http.client
+    try:
+        with open(_service_path(), "r", encoding="utf-8") as f:
+            info = json.load(f)
+        conn = http.client.HTTPConnection("127.0.0.1", int(info["port"]),
+                                          timeout=CONNECT_TIMEOUT)
+        try:
+            conn.request("GET", "/health")
+            ok = conn.getresponse().status == 200
+        finally:
+            conn.close()
+    except (OSError, ValueError, KeyError, TypeError, http.client.HTTPException):
+        return None
+    return Client(int(info["port"]), info["token"]) if ok else None
+
+
+# ---------------------------------------------------------------------------
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Travel Wizards processing service")
+    sub = ap.add_subparsers(dest="cmd")
+    serve = sub.add_parser("serve", help="run the service (default)")
+    serve.add_argument("--workers", type=int, default=None)
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    p = sub.add_parser("parse", help="parse a PDF via the running service")
+    p.add_argument("pdf")
+    s = sub.add_parser("stamp", help="stamp a PDF via the running service")
+    s.add_argument("pdf")
+    s.add_argument("out")
+    s.add_argument("--styled", action="store_true")
+    args = ap.parse_args(argv)
+
+    if args.cmd in ("parse", "stamp"):
+        client = connect()
+        if client is None:
+            print("Processing service isn't running — start it with: "
+                  "python processing_service.py serve")
+            return 1
+        try:
+            if args.cmd == "parse":
+                print(json.dumps(client.parse(args.pdf), indent=2))
+            else:
+                info = client.stamp(args.pdf, args.out,
+                                    "styled" if args.styled else "plain")
+                print(f"Wrote {args.out} (suggested name: {info['filename'] or '—'})")
+        except ServiceError as e:
+            print(f"Failed — {e}")
+            return 1
+        return 0
+
+    service = ProcessingService(getattr(args, "workers", None),
+                                getattr(args, "port", DEFAULT_PORT))
+    service.publish()
+    print(f"Processing service on 127.0.0.1:{service.port} "
+          f"({service.workers} workers, {service.capacity} jobs max). Ctrl+C to stop.")
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.shutdown_all()
+    return 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
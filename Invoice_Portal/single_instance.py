@@ -0,0 +1,210 @@
+"""
+single_instance.py — One portal per user; relaunches hand off and exit.
+
+Agents double-click the portal over and over. Every launch used to
+unpack the bundle, run the update check and open another window — and
+every one of those copies then wrote airport_overrides.json on its own.
+
+Now the first launch claims a fixed localhost port (derived from the
+user's data folder, so two Windows users on one machine don't collide)
+and listens on it. A later launch finds the port taken, sends its
+request — "show the window", "open the processor on this folder" — as
+one line of JSON, and exits as soon as the running portal acknowledges
+it, before importing anything heavy or creating a Tk root. Binding is
+the lock: the OS only lets one process own the port, so two launches
+racing each other can't both win.
+
+The port is only reachable from this machine, and requests must carry
+the random token the running instance wrote to instance.json in the
+user's data folder — another local program can't drive the portal
+without being able to read that file.
+
+    claim(argv)           → Instance (we're first) / exits (handed off) /
+                            None (couldn't tell — just run normally)
+    instance.start(handler)   handler(request) called on a worker thread
+
+Requests are dicts: {"action": "show" | "pdf" | "hotel" | "airports",
+"folder": optional path}. request_from_argv() builds one from the command
+line:
+
+    portal.py                      → show
+    portal.py --pdf [folder]       → open the invoice processor
+    portal.py --hotel              → open the hotel processor
+    portal.py --airports           → open the airport database
+"""
+
+import os
+import sys
+import json
+import zlib
+import time
+import socket
+import secrets
+import threading
+
+from app_paths import data_dir as _data_dir
+
+INSTANCE_FILENAME = "instance.json"
+PORT_BASE  = 49400
+PORT_RANGE = 8000
+HANDOFF_TIMEOUT = 2.0     # seconds to wait for the running portal to answer
+MAX_REQUEST_BYTES = 64 * 1024
+ACTIONS = ("show", "pdf", "hotel", "airports")
+
+
+
+def _instance_path() -> str:
+    return os.path.join(_data_dir(), INSTANCE_FILENAME)
+
+
+def _port() -> int:
+    """Stable per-user port: same data folder → same port, every launch."""
+    key = os.path.normcase(os.path.abspath(_data_dir())).encode("utf-8")
+    return PORT_BASE + zlib.crc32(key) % PORT_RANGE
+
+
+def request_from_argv(argv) -> dict:
+    """Command-line arguments → a request dict. Unknown flags are ignored
+    rather than refused — a bad shortcut shouldn't stop the app opening."""
+    request = {"action": "show"}
+    args = list(argv)
+    for i, arg in enumerate(args):
+        flag = arg.lstrip("-").lower()
+        if arg.startswith("--") and flag in ACTIONS:
+            request["action"] = flag
+            if i + 1 < len(args) and not args[i + 1].startswith("--"):
+                request["folder"] = os.path.abspath(args[i + 1])
+            break
+    return request
+
+
+# ---------------------------------------------------------------------------
+# Second launch: hand off
+# ---------------------------------------------------------------------------
+def _read_instance_file():
+    try:
+        with open(_instance_path(), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def hand_off(request: dict, port: int = None) -> bool:
+    """Send request to the running portal. True once it has acknowledged
+    it; False if nothing of ours answered within HANDOFF_TIMEOUT."""
+    port = port or _port()
+    deadline = time.monotonic() + HANDOFF_TIMEOUT
+    # The first instance binds the port a moment before it has written
+    # instance.json — a launch landing in that gap retries briefly
+    # instead of giving up and opening a second window.
+    while time.monotonic() < deadline:
+        info = _read_instance_file()
+        if info and info.get("port") == port:
+            try:
+                with socket.create_connection(("127.0.0.1", port),
+                                              timeout=HANDOFF_TIMEOUT) as conn:
+                    msg = dict(request, token=info.get("token"))
+                    conn.sendall(json.dumps(msg).encode("utf-8") + b"\n")
+                    if conn.makefile("rb").readline().strip() == b"ok":
+                        return True
+            except OSError:
+                pass
+        time.sleep(0.1)
+    return False
+
+
+# ---------------------------------------------------------------------------
+# First launch: listen
+# ---------------------------------------------------------------------------
+class Instance:
+    """The listening side, held by the running portal for its lifetime."""
+
+    def __init__(self, sock, port):
+        self._sock = sock
+        self.port = port
+        self.token = secrets.token_hex(16)
+        self._write_instance_file()
+
+    def _write_instance_file(self):
+        path = _instance_path()
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"port": self.port, "pid": os.getpid(),
+                           "token": self.token}, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[single_instance] Could not write {path} ({e}) — "
+                  "relaunches will open their own window.")
+
+    def start(self, handler):
+        """Accept hand-offs on a daemon thread. handler(request) runs on
+        that thread — GUI callers should bounce it onto Tk with
+        root.after(0, ...)."""
+        threading.Thread(target=self._serve, args=(handler,), daemon=True).start()
+
+    def _serve(self, handler):
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return          # socket closed — app is exiting
+            with conn:
+                try:
+                    conn.settimeout(HANDOFF_TIMEOUT)
+                    line = conn.makefile("rb").readline(MAX_REQUEST_BYTES)
+                    request = json.loads(line)
+                    if not isinstance(request, dict) \
+                            or not secrets.compare_digest(str(request.pop("token", "")),
+                                                          self.token):
+                        continue
+                    if request.get("action") not in ACTIONS:
+                        request = {"action": "show"}
+                    conn.sendall(b"ok\n")
+                except (OSError, ValueError):
+                    continue
+            try:
+                handler(request)
+            except Exception as e:
+                print(f"[single_instance] Hand-off failed ({e}).")
+
+    def close(self):
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
+
+def _bind(port):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    if hasattr(socket, "SO_EXCLUSIVEADDRUSE"):
+        # Windows lets a second socket bind a port another is already
+        # listening on unless the first asks for exclusive use.
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
+    try:
+        sock.bind(("127.0.0.1", port))
+        sock.listen(8)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def claim(argv=()):
+    """
+    Call first thing at launch. Returns an Instance if this is the only
+    portal running. If another portal already owns the port and accepts
+    the hand-off, this process exits here. If the port is taken by
+    something that isn't answering as a portal, returns None — better a
+    second window than no window.
+    """
+    port = _port()
+    try:
+        return Instance(_bind(port), port)
+    except OSError:
+        pass
+    if hand_off(request_from_argv(argv), port):
+        sys.exit(0)
+    print(f"[single_instance] Port {port} is in use by something else — "
+          "running without single-instance hand-off.")
+    return None
@@ -0,0 +1,87 @@
+"""
+startup_audit.py — Where does launch time go?
+
+Off unless TW_IMPORT_AUDIT=1 is set in the environment. When on, every
+module's first import is timed (inclusive of whatever it imports in
+turn, like `python -X importtime` — which a frozen .exe can't be
+launched with), and mark() records named milestones such as "window
+shown". report() writes the slowest imports plus the milestones to
+import_audit.txt in the app's data folder and prints them.
+
+    set TW_IMPORT_AUDIT=1
+    TravelWizards.exe
+    → %APPDATA%/TravelWizards/import_audit.txt
+"""
+
+import os
+import sys
+import time
+import builtins
+
+ENV_VAR = "TW_IMPORT_AUDIT"
+REPORT_FILENAME = "import_audit.txt"
+
+_t0 = time.perf_counter()
+_installed = False
+_costs = {}          # module name -> seconds for its first import (inclusive)
+_order = []          # module names in first-import order
+_marks = []          # (label, seconds since install)
+_real_import = builtins.__import__
+
+
+def enabled() -> bool:
+    return os.environ.get(ENV_VAR, "").strip() not in ("", "0")
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    if level or name in sys.modules:
+        return _real_import(name, globals, locals, fromlist, level)
+    start = time.perf_counter()
+    try:
+        return _real_import(name, globals, locals, fromlist, level)
+    finally:
+        if name not in _costs:
+            _costs[name] = time.perf_counter() - start
+            _order.append(name)
+
+
+def install():
+    """Start timing imports. Call as early as possible — before anything
+    heavy is imported — and only when enabled()."""
+    global _installed, _t0
+    if _installed:
+        return
+    _installed = True
+    _t0 = time.perf_counter()
+    builtins.__import__ = _timed_import
+
+
+def mark(label: str):
+    """Record a milestone (no-op unless install() ran)."""
+    if _installed:
+        _marks.append((label, time.perf_counter() - _t0))
+
+
+def report(top: int = 25, data_dir: str = None) -> str:
+    """Write and return the audit text. Nested imports are included in
+    their parent's time, so the list reads top-down: what the app asked
+    for, and what each of those cost."""
+    if not _installed:
+        return ""
+    lines = ["Milestones (seconds since portal.py started):"]
+    lines += [f"  {t:8.3f}  {label}" for label, t in _marks]
+    lines.append("")
+    lines.append(f"Slowest first imports (inclusive), top {top}:")
+    for name in sorted(_costs, key=_costs.get, reverse=True)[:top]:
+        lines.append(f"  {_costs[name] * 1000:8.1f} ms  {name}")
+    lines.append("")
+    lines.append(f"{len(_order)} modules imported in total.")
+    text = "\n".join(lines)
+    print(text)
+    if data_dir:
+        try:
+            with open(os.path.join(data_dir, REPORT_FILENAME), "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+        except OSError:
+            pass
+    return text
@@ -9,9 +9,17 @@ Handles both TIPITIN and ITIN header formats, plus all content types:
   TICKETS, FINANCIAL, BAGGAGE, NOTICES
 """
 
+import os
 import re
+import time
+import heapq
+import itertools
 import fitz
 
+from invoice_records import (
+    Passenger, Flight, Car, Hotel, Cruise, Package, Tour, Ticket,
+)
+
 # ── States ─────────────────────────────────────────────────────
 HEADER       = "HEADER"
 PASSENGERS   = "PASSENGERS"
@@ -29,6 +37,24 @@ CARRY_ON     = "CARRY_ON"
 NOTICES      = "NOTICES"
 SKIP         = "SKIP"
 
+# Longest line worth running the rules on. The booking system prints at
+# most ~132 columns; a line far past that is a garbled page (text with no
+# line breaks, pages of space padding), and every pattern below costs at
+# least its length per try — so it's reported as unrecognized and
+# skipped instead, and the file lands in errored_invoices/ for a person.
+# The skip list and the "** ... **" / emergency boilerplate filters still
+# run first: a long line they'd have ignored is ignored, not reported.
+#
+# Under that length the rules are also written to stay linear. The usual
+# shape here is "some text, whitespace, then an anchor" — `(.+?)\s+(\d+)
+# \s+NT/S` — and written that way, every split of a long whitespace run
+# between the lazy group and the \s+ gets tried before the match fails:
+# quadratic in the run's length. So the group is written `(\S.*?)(?<=\S)`
+# instead — it starts and ends on a non-space, leaving each whitespace run
+# exactly one way to be matched. The captured text is the same (it was
+# .strip()ped anyway); benchmarks/bench_adversarial.py checks the timing.
+MAX_LINE_LEN = 400
+
 # Lines we intentionally skip (no data loss)
 SKIP_PATTERNS = [
     r'^\s*$',                           # blank
@@ -49,12 +75,12 @@ SKIP_PATTERNS = [
 ]
 
 # ── Detection helpers ──────────────────────────────────────────
-def _is_date_line(line):
+def _is_date_line(line, rx=re):
     """Match: '03 DEC 26 - THURSDAY' or '03 DEC 26    - THURSDAY'"""
-    m = re.match(r'\s*(\d{2} [A-Z]{3} \d{2})\s+- ([A-Z]+)', line)
+    m = rx.match(r'\s*(\d{2} [A-Z]{3} \d{2})\s+- ([A-Z]+)', line)
     return m.groups() if m else None
 
-def _is_tipitin_airline(line):
+def _is_tipitin_airline(line, rx=re):
     """Match: '  UNITED AIRLINES INC.      362   BUS/ FIRST XCPTNS'
        or:    '  DEUTSCHE LUFTHANSA AG    4143   BUSINESS PREMIUM'
        or:    '  COPA 140 PREMIUM ECONOMY'
@@ -65,38 +91,41 @@ def _is_tipitin_airline(line):
     structurally instead: an airline-name-shaped run of text, then a
     2-4 digit flight number, then a class description — no longer
     dependent on guessing every possible corporate suffix in advance."""
-    m = re.match(r'\s+([A-Z][A-Za-z0-9&\.\-\' ]*?)\s+(\d{2,4})\s+([A-Z/].+?)$', line)
+    m = rx.match(r'\s+([A-Z][A-Za-z0-9&\.\-\' ]*?)(?<=\S)\s+(\d{2,4})\s+([A-Z/].+?)$', line)
     if m and not any(kw in line for kw in ['HOTEL', 'RESORT', 'GUARD', 'INSURANCE']):
         return m.groups()
     return None
 
-def _is_itin_airline(line):
+def _is_itin_airline(line, rx=re):
     """Match: '  AIR   KLM            FLT: 605   COACH CLASS  MEAL'
        Airline name may be multiple words ('AIR FRANCE', 'AIR CANADA') —
        matched lazily up to 'FLT:' rather than assuming a single token."""
-    m = re.match(r'\s+AIR\s+(.+?)\s+FLT:\s*(\d+)\s+(.+?)$', line)
+    m = rx.match(r'\s+AIR\s+(\S.*?)(?<=\S)\s+FLT:\s*(\d+)\s+(.+?)$', line)
     return m.groups() if m else None
 
-def _is_hotel_line(line):
+def _is_hotel_line(line, rx=re):
     """Match: '  WESTIN HOTELS AND RESORTS 02 NT/S - OUT 24JUL CONFIRMED'
        or:    '  HOTEL AVENIDA PALACE 01 NT/S - OUT 02JUN CONFIRMED'
        or:    '  HOTEL INDIGO DENVER DOWN 03 NT/S - OUT 22JUL CONFIRMED'"""
-    m = re.match(r'\s*(.+?)\s+(\d+)\s+NT/S\s*-\s*OUT\s+(\S+)\s+(CONFIRMED|WAITLIST)', line)
+    m = rx.match(r'\s*(\S.*?)(?<=\S)\s+(\d+)\s+NT/S\s*-\s*OUT\s+(\S+)\s+(CONFIRMED|WAITLIST)', line)
     return m.groups() if m else None
 
-def _is_hotel_line_alt(line):
+def _is_hotel_line_alt(line, rx=re):
     """Match a second, ITIN-style hotel format with no CONFIRMED/WAITLIST
     suffix and both check-in and check-out dates on the same line:
     '  HOTEL WINE AND BOOKS HOTE 01 NT/S IN-22OCT OUT-23OCT'"""
-    m = re.match(r'\s*HOTEL\s+(.+?)\s+(\d+)\s+NT/S\s+IN-(\S+)\s+OUT-(\S+)', line)
+    m = rx.match(r'\s*HOTEL\s+(\S.*?)(?<=\S)\s+(\d+)\s+NT/S\s+IN-(\S+)\s+OUT-(\S+)', line)
     return m.groups() if m else None
 
-def _should_skip(line):
-    return any(re.search(p, line) for p in SKIP_PATTERNS)
+def _should_skip(line, rx=re):
+    return any(rx.search(p, line) for p in SKIP_PATTERNS)
+
+FORMAT_LINES = 5
+
 
 def _detect_format(lines):
     """Detect ITIN vs TIPITIN from first few lines."""
-    for line in lines[:5]:
+    for line in lines[:FORMAT_LINES]:
         if re.search(r'SALES PERSON:', line):
             return "ITIN"
         if re.search(r'ITIN NO:', line):
@@ -104,18 +133,216 @@ def _detect_format(lines):
     return "UNKNOWN"
 
 
-# ── Main parser ────────────────────────────────────────────────
-def parse(pdf_path: str) -> dict:
-    """Parse any Travel Wizards invoice. Returns structured data + validation warnings."""
-    doc = fitz.open(pdf_path)
-    pages_text = [page.get_text("text") for page in doc]
-    doc.close()
+# ── Rule profiling (opt-in) ────────────────────────────────────
+# Every rule above and in parse_lines() is a regex tried against a line,
+# in order, until one claims it — so "why is this client's invoice slow"
+# and "why did this line land in the wrong place" both come down to which
+# patterns ran, in which state, how often they hit and what they cost.
+# parse(..., profile=True) (or TW_PARSER_PROFILE=1 in the environment,
+# which reaches watchdog worker processes too, since they inherit it)
+# swaps the `re` module parse_lines() calls for a RuleProfiler with the
+# same match()/search(), and the counts come back as data["profile"].
+# Off, parse_lines() calls plain `re`, exactly as before.
+PROFILE_ENV = "TW_PARSER_PROFILE"
+WORST_LINES = 10     # lines kept per profile, ranked by rules tried
+
+
+class RuleProfiler:
+    """Stands in for the `re` module inside parse_lines(), counting
+    attempts / hits / seconds per (state, pattern) and rules tried per
+    line. A rule is counted under the state the line arrived in."""
+
+    def __init__(self, worst_lines: int = WORST_LINES):
+        self.rules = {}       # (state, pattern) -> [attempts, hits, seconds]
+        self.lines = 0
+        self.state = HEADER
+        self._worst_lines = worst_lines
+        self._worst = []      # min-heap of (attempts, seconds, line_num, state, text)
+        self._line = None     # [line_num, state, text, attempts, seconds]
+
+    def begin_line(self, line_num, state, text):
+        self._end_line()
+        self.lines += 1
+        self.state = state
+        self._line = [line_num, state, text, 0, 0.0]
+
+    def _end_line(self):
+        if self._line is None:
+            return
+        line_num, state, text, attempts, seconds = self._line
+        entry = (attempts, seconds, line_num, state, text[:120])
+        if len(self._worst) < self._worst_lines:
+            heapq.heappush(self._worst, entry)
+        elif entry > self._worst[0]:
+            heapq.heapreplace(self._worst, entry)
+        self._line = None
+
+    def _run(self, fn, pattern, string):
+        started = time.perf_counter()
+        m = fn(pattern, string)
+        elapsed = time.perf_counter() - started
+        rec = self.rules.get((self.state, pattern))
+        if rec is None:
+            rec = self.rules[(self.state, pattern)] = [0, 0, 0.0]
+        rec[0] += 1
+        rec[1] += m is not None
+        rec[2] += elapsed
+        if self._line is not None:
+            self._line[3] += 1
+            self._line[4] += elapsed
+        return m
+
+    def match(self, pattern, string):
+        return self._run(re.match, pattern, string)
+
+    def search(self, pattern, string):
+        return self._run(re.search, pattern, string)
+
+    def as_dict(self) -> dict:
+        """Plain lists and numbers — survives the worker's pipe and
+        json.dump() alike."""
+        self._end_line()
+        rules = [{"state": state, "pattern": pattern, "attempts": a, "hits": h, "seconds": s}
+                 for (state, pattern), (a, h, s) in self.rules.items()]
+        worst = [{"line": n, "state": st, "attempts": a, "seconds": s, "text": t}
+                 for a, s, n, st, t in sorted(self._worst, reverse=True)]
+        return {"files": 1, "lines": self.lines,
+                "seconds": sum(r["seconds"] for r in rules),
+                "rules": rules, "worst_lines": worst}
+
+
+def merge_profiles(total: dict, profile: dict, source: str = None) -> dict:
+    """Add one parse's data["profile"] into a batch total (None to start
+    one). source, if given, labels that parse's worst lines."""
+    if total is None:
+        total = {"files": 0, "lines": 0, "seconds": 0.0, "rules": [], "worst_lines": []}
+    by_key = {(r["state"], r["pattern"]): r for r in total["rules"]}
+    for r in profile["rules"]:
+        mine = by_key.get((r["state"], r["pattern"]))
+        if mine is None:
+            mine = by_key[(r["state"], r["pattern"])] = dict(r, attempts=0, hits=0, seconds=0.0)
+            total["rules"].append(mine)
+        mine["attempts"] += r["attempts"]
+        mine["hits"] += r["hits"]
+        mine["seconds"] += r["seconds"]
+    for key in ("files", "lines", "seconds"):
+        total[key] += profile[key]
+    worst = total["worst_lines"] + [dict(w, file=source) if source else w
+                                    for w in profile["worst_lines"]]
+    worst.sort(key=lambda w: (w["attempts"], w["seconds"]), reverse=True)
+    total["worst_lines"] = worst[:WORST_LINES]
+    return total
+
+
+def format_profile(profile: dict, top: int = 20) -> str:
+    """A profile (one parse's or a merged batch's) as a readable report:
+    time per state, the costliest rules, rules that never hit, and the
+    lines that went through the most rules before one claimed them."""
+    out = [f"Parser profile: {profile['files']} file(s), {profile['lines']:,} lines, "
+           f"{profile['seconds'] * 1000:,.1f} ms in rules"]
+
+    per_state = {}
+    for r in profile["rules"]:
+        s = per_state.setdefault(r["state"], [0, 0.0])
+        s[0] += r["attempts"]
+        s[1] += r["seconds"]
+    out.append("\nBy state:                 attempts        ms")
+    for state, (attempts, seconds) in sorted(per_state.items(), key=lambda kv: -kv[1][1]):
+        out.append(f"  {state:<20}{attempts:>12,}{seconds * 1000:>10.1f}")
+
+    def pattern(p):
+        return p if len(p) <= 60 else p[:57] + "..."
+
+    out.append(f"\nCostliest rules (top {top}):")
+    out.append(f"  {'state':<11}{'attempts':>10}{'hits':>8}{'ms':>9}  pattern")
+    for r in sorted(profile["rules"], key=lambda r: -r["seconds"])[:top]:
+        out.append(f"  {r['state']:<11}{r['attempts']:>10,}{r['hits']:>8,}"
+                   f"{r['seconds'] * 1000:>9.2f}  {pattern(r['pattern'])}")
+
+    # Dead = no hit in ANY state; a rule that only hits in some states is
+    # an ordering question, not a pruning one
+    overall = {}
+    for r in profile["rules"]:
+        o = overall.setdefault(r["pattern"], [0, 0])
+        o[0] += r["attempts"]
+        o[1] += r["hits"]
+    dead = [(attempts, p) for p, (attempts, hits) in overall.items() if not hits]
+    if dead:
+        out.append(f"\nNever hit in any state ({len(dead)} rules; most-tried first):")
+        for attempts, p in sorted(dead, reverse=True)[:top]:
+            out.append(f"  {attempts:>10,}  {pattern(p)}")
+
+    if profile["worst_lines"]:
+        out.append("\nMost rules tried before a line was claimed:")
+        for w in profile["worst_lines"]:
+            where = f"{w['file']} " if w.get("file") else ""
+            out.append(f"  {w['attempts']:>4} rules {w['seconds'] * 1e6:>8.0f} µs  "
+                       f"{where}L{w['line']} [{w['state']}] {w['text'][:70]}")
+    return "\n".join(out)
 
-    all_lines = []
-    for page_text in pages_text:
-        all_lines.extend(page_text.split("\n"))
 
-    fmt = _detect_format(all_lines)
+# ── Main parser ────────────────────────────────────────────────
+# The text goes through page by page: parse() hands parse_pages() a
+# generator that calls get_text() on one page only when the parser
+# reaches it, and the state machine below just sees one long run of
+# lines — its state (the open flight, the hotel block, the repeated ITIN
+# header on page 2+) carries over a page break the same as over any
+# other line. So a 60-page group-tour invoice holds one page of text at
+# a time, not the whole document's text (once per page and again as the
+# joined line list). header_only=True stops at the end of the header —
+# passengers, mailing address, booking — without reading the pages past
+# it at all.
+def iter_page_text(doc):
+    """Each page's text of an open fitz document, one at a time."""
+    for page in doc:
+        yield page.get_text("text")
+
+
+def parse(pdf_path: str, pdf_bytes: bytes = None, profile: bool = None,
+          header_only: bool = False) -> dict:
+    """Parse any Travel Wizards invoice. Returns structured data + validation warnings.
+    pdf_bytes: the file's content if the caller already has it in memory
+    (invoice_pipeline's read-ahead) — saves reading it off the share twice.
+    profile: True adds data["profile"] (see RuleProfiler); None follows
+    the TW_PARSER_PROFILE environment variable.
+    header_only: stop once the header is read (see parse_lines)."""
+    if pdf_bytes is not None:
+        doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    else:
+        doc = fitz.open(pdf_path)
+    try:
+        return parse_pages(iter_page_text(doc), profile=profile, header_only=header_only)
+    finally:
+        doc.close()
+
+
+def parse_pages(pages, profile: bool = None, header_only: bool = False) -> dict:
+    """parse_lines() over an iterable of page texts (each one page's
+    get_text() output), consumed lazily — only the current page's lines
+    are held."""
+    def lines():
+        for page_text in pages:
+            yield from page_text.split("\n")
+    return parse_lines(lines(), profile=profile, header_only=header_only)
+
+
+def parse_lines(all_lines, profile: bool = None, header_only: bool = False) -> dict:
+    """The parser proper: the invoice's text lines, in page order, in —
+    the same structured data + warnings parse() returns, out. No PDF
+    involved, so benchmarks/ can feed it synthetic invoices directly.
+    all_lines may be any iterable (a generator is read once, in order).
+    header_only: return as soon as the header is done — format,
+    passengers, mailing address and booking filled in, every segment
+    list empty, data["header_only"] True."""
+    if profile is None:
+        profile = bool(os.environ.get(PROFILE_ENV))
+    profiler = RuleProfiler() if profile else None
+    rx = profiler or re
+    # The format comes from the first few lines; read just those ahead
+    lines = iter(all_lines)
+    head = list(itertools.islice(lines, FORMAT_LINES))
+    fmt = _detect_format(head)
+    all_lines = itertools.chain(head, lines)
 
     data = {
         "format": fmt,
@@ -152,10 +379,14 @@ def parse(pdf_path: str) -> dict:
     header_done = False
 
     for line_num, raw_line in enumerate(all_lines):
+        if header_only and header_done:
+            break
         line = raw_line.rstrip()
+        if profiler is not None:
+            profiler.begin_line(line_num, state, line)
 
         # Skip intentionally ignored lines
-        if _should_skip(line):
+        if _should_skip(line, rx):
             continue
 
         # ── Universal notices — intercepted before any state-specific
@@ -165,19 +396,32 @@ def parse(pdf_path: str) -> dict:
         # ENTIRE line to be "** ... **" — a genuine embedded vendor marker
         # like "14OCT/**BACKROADS**/AMT-3649.00/CF-3436299" never starts
         # the line with **, so this can't collide with that.
-        full_notice = re.match(r'^\s*\*\*\s*(.+?)\s*\*\*\s*$', line)
+        # (line is already rstripped, so a notice ends in "**" — checked
+        # first, since the pattern costs a full pass over a long line)
+        full_notice = line.endswith("**") and \
+            rx.match(r'^\s*\*\*(?:\s*(\S.*?)(?<=\S))?\s*\*\*\s*$', line)
         if full_notice:
-            text = full_notice.group(1).strip()
+            text = (full_notice.group(1) or "").strip()
             if text and text not in data["notices"] and len(text) > 5:
                 data["notices"].append(text)
             continue
-        if re.search(r'AFTER HOURS|EMERGENCY', line):
+        # Two literal searches: the alternation of the two can't use the
+        # fast substring scan, and cost ten times as much on a long line
+        if rx.search(r'AFTER HOURS', line) or rx.search(r'EMERGENCY', line):
+            continue
+
+        # Past the skip and boilerplate filters (a long notice is still
+        # just ignored), a line this long isn't run against the rules
+        if len(line) > MAX_LINE_LEN:
+            data["unrecognized"].append(
+                f"L{line_num}: {line.strip()[:60]}… ({len(line):,} characters — "
+                f"too long to be invoice text, not parsed)")
             continue
 
         # ── Check for state transitions ───────────────────────
 
         # Date line — sets current date, doesn't change state yet
-        date_match = _is_date_line(line)
+        date_match = _is_date_line(line, rx)
         if date_match:
             current_date, current_day = date_match
             header_done = True
@@ -185,21 +429,21 @@ def parse(pdf_path: str) -> dict:
             rest = line[line.find(current_day) + len(current_day):].strip()
             if rest == "TOUR":
                 state = TOUR
-                current_tour = {"date_raw": current_date, "day_name": current_day,
-                                "vendor": None, "amount": None, "confirmation": None,
-                                "details": [], "raw_lines": [line.strip()]}
+                current_tour = Tour(date_raw=current_date, day_name=current_day,
+                                    vendor=None, amount=None, confirmation=None,
+                                    details=[], raw_lines=[line.strip()])
             elif "OTHER ARRANGEMENTS" in rest:
                 state = TOUR
-                current_tour = {"date_raw": current_date, "day_name": current_day,
-                                "vendor": None, "amount": None, "confirmation": None,
-                                "details": [], "raw_lines": [line.strip()]}
+                current_tour = Tour(date_raw=current_date, day_name=current_day,
+                                    vendor=None, amount=None, confirmation=None,
+                                    details=[], raw_lines=[line.strip()])
             elif "CRUISE" in rest:
                 # e.g. "23 OCT 26 - FRIDAY CRUISE CRUISE" — some invoices
                 # trigger a cruise this way instead of a "CRUISE
                 # ARRANGEMENTS" block.
                 state = CRUISE
-                current_cruise = {"date_raw": current_date, "day_name": current_day,
-                                  "details": {}}
+                current_cruise = Cruise(date_raw=current_date, day_name=current_day,
+                                        details={})
             continue
 
         # Segment-type keyword on its OWN line right after a date, rather
@@ -211,16 +455,16 @@ def parse(pdf_path: str) -> dict:
         # — vendor, cost, payment, all of it — would be lost outright.
         if line.strip().upper() in ("TRANSFERS", "TOUR", "OTHER ARRANGEMENTS") and state != TOUR:
             state = TOUR
-            current_tour = {"date_raw": current_date, "day_name": current_day,
-                            "vendor": None, "amount": None, "confirmation": None,
-                            "details": [], "raw_lines": [line.strip()]}
+            current_tour = Tour(date_raw=current_date, day_name=current_day,
+                                vendor=None, amount=None, confirmation=None,
+                                details=[], raw_lines=[line.strip()])
             continue
 
         # Cruise arrangements
-        if re.match(r'\s*CRUISE ARRANGEMENTS', line):
+        if rx.match(r'\s*CRUISE ARRANGEMENTS', line):
             state = CRUISE
-            current_cruise = {"date_raw": current_date, "day_name": current_day,
-                              "details": {}}
+            current_cruise = Cruise(date_raw=current_date, day_name=current_day,
+                                    details={})
             continue
 
         # Car rental line — embedded within a day's bookings alongside
@@ -228,39 +472,39 @@ def parse(pdf_path: str) -> dict:
         # "CAR RALEIGH/DURHAM HERTZ 1 INTERMED 2/4 DR". Previously there was
         # no CAR state at all, so every line of a car rental (pickup/dropoff,
         # rate, confirmation) fell through unrecognized.
-        car_desc = re.match(r'\s*CAR\s+(\S.*)$', line)
+        car_desc = rx.match(r'\s*CAR\s+(\S.*)$', line)
         if car_desc:
             if current_flight:
                 data["flights"].append(current_flight)
                 current_flight = None
             if current_car:
                 data["cars"].append(current_car)
-            current_car = {"date_raw": current_date, "day_name": current_day,
-                           "description": car_desc.group(1).strip(),
-                           "details": []}
+            current_car = Car(date_raw=current_date, day_name=current_day,
+                              description=car_desc.group(1).strip(),
+                              details=[])
             state = CAR
             continue
 
         # Package arrangements
-        if re.match(r'\s*PACKAGE ARRANGEMENTS', line):
+        if rx.match(r'\s*PACKAGE ARRANGEMENTS', line):
             state = PACKAGE
-            current_package = {"date_raw": current_date, "day_name": current_day,
-                               "details": {}}
+            current_package = Package(date_raw=current_date, day_name=current_day,
+                                      details={})
             continue
 
         # Standalone TOUR or OTHER ARRANGEMENTS line (after a date line)
-        if re.match(r'^\s*TOUR\s*$', line) or re.match(r'^\s*OTHER ARRANGEMENTS\s*$', line):
+        if rx.match(r'^\s*TOUR\s*$', line) or rx.match(r'^\s*OTHER ARRANGEMENTS\s*$', line):
             # Save previous tour if any
             if current_tour and current_tour.get("vendor"):
                 data["tours"].append(current_tour)
-            current_tour = {"date_raw": current_date, "day_name": current_day,
-                            "vendor": None, "amount": None, "confirmation": None,
-                            "details": []}
+            current_tour = Tour(date_raw=current_date, day_name=current_day,
+                                vendor=None, amount=None, confirmation=None,
+                                details=[])
             state = TOUR
             continue
 
         # Airline line (TIPITIN format)
-        tipitin_air = _is_tipitin_airline(line)
+        tipitin_air = _is_tipitin_airline(line, rx)
         if tipitin_air:
             if current_flight:
                 data["flights"].append(current_flight)
@@ -268,25 +512,25 @@ def parse(pdf_path: str) -> dict:
                 data["cars"].append(current_car)
                 current_car = None
             airline, fnum, cabin = tipitin_air
-            current_flight = {
-                "date_raw": current_date, "day_name": current_day,
-                "airline": airline.strip(), "flight_number": fnum,
-                "cabin_class": cabin.strip(), "operated_by": None,
-                "departure_city": None, "departure_time": None,
-                "arrival_city": None, "arrival_time": None,
-                "arrives_next_day": None, "duration": None,
-                "nonstop": False, "confirmed": False,
-                "baggage_allowance": None, "seats": [],
-                "meals": None, "dep_terminal": None, "arr_terminal": None,
-                "airline_locator_carrier": None, "airline_locator_code": None,
-                "wheelchair": False,
-            }
+            current_flight = Flight(
+                date_raw=current_date, day_name=current_day,
+                airline=airline.strip(), flight_number=fnum,
+                cabin_class=cabin.strip(), operated_by=None,
+                departure_city=None, departure_time=None,
+                arrival_city=None, arrival_time=None,
+                arrives_next_day=None, duration=None,
+                nonstop=False, confirmed=False,
+                baggage_allowance=None, seats=[],
+                meals=None, dep_terminal=None, arr_terminal=None,
+                airline_locator_carrier=None, airline_locator_code=None,
+                wheelchair=False,
+            )
             state = FLIGHT
             header_done = True
             continue
 
         # Airline line (ITIN format)
-        itin_air = _is_itin_airline(line)
+        itin_air = _is_itin_airline(line, rx)
         if itin_air:
             if current_flight:
                 data["flights"].append(current_flight)
@@ -295,29 +539,29 @@ def parse(pdf_path: str) -> dict:
                 current_car = None
             airline, fnum, cabin_meal = itin_air
             # Split cabin and meal
-            parts = re.match(r'(.+?)\s{2,}(\S+)$', cabin_meal)
+            parts = rx.match(r'(.+?)(?<=\S)\s{2,}(\S+)$', cabin_meal)
             cabin = parts.group(1).strip() if parts else cabin_meal
             meals = parts.group(2).strip() if parts else None
-            current_flight = {
-                "date_raw": current_date, "day_name": current_day,
-                "airline": airline.strip(), "flight_number": fnum,
-                "cabin_class": cabin, "operated_by": None,
-                "departure_city": None, "departure_time": None,
-                "arrival_city": None, "arrival_time": None,
-                "arrives_next_day": None, "duration": None,
-                "nonstop": False, "confirmed": True,
-                "baggage_allowance": None, "seats": [],
-                "meals": meals, "dep_terminal": None, "arr_terminal": None,
-                "airline_locator_carrier": None, "airline_locator_code": None,
-                "wheelchair": False,
-            }
+            current_flight = Flight(
+                date_raw=current_date, day_name=current_day,
+                airline=airline.strip(), flight_number=fnum,
+                cabin_class=cabin, operated_by=None,
+                departure_city=None, departure_time=None,
+                arrival_city=None, arrival_time=None,
+                arrives_next_day=None, duration=None,
+                nonstop=False, confirmed=True,
+                baggage_allowance=None, seats=[],
+                meals=meals, dep_terminal=None, arr_terminal=None,
+                airline_locator_carrier=None, airline_locator_code=None,
+                wheelchair=False,
+            )
             state = FLIGHT
             header_done = True
             continue
 
         # Hotel line
-        hotel_match = _is_hotel_line(line)
-        hotel_match_alt = None if hotel_match else _is_hotel_line_alt(line)
+        hotel_match = _is_hotel_line(line, rx)
+        hotel_match_alt = None if hotel_match else _is_hotel_line_alt(line, rx)
         if hotel_match or hotel_match_alt:
             if current_hotel:
                 data["hotels"].append(current_hotel)
@@ -330,21 +574,21 @@ def parse(pdf_path: str) -> dict:
             else:
                 chain, nights, checkin, checkout = hotel_match_alt
                 status = None
-            current_hotel = {
-                "chain": chain.strip(), "nights": int(nights),
-                "checkin_date": checkin, "checkout_date": checkout, "status": status,
-                "name": None, "address": None, "city": None,
-                "phone": None, "fax": None, "rate_currency": None,
-                "rate_amount": None, "confirmation": None,
-                "guarantee": None, "approx_total": None,
-                "cancel_policy": None, "notes": [], "room_info": None,
-            }
+            current_hotel = Hotel(
+                chain=chain.strip(), nights=int(nights),
+                checkin_date=checkin, checkout_date=checkout, status=status,
+                name=None, address=None, city=None,
+                phone=None, fax=None, rate_currency=None,
+                rate_amount=None, confirmation=None,
+                guarantee=None, approx_total=None,
+                cancel_policy=None, notes=[], room_info=None,
+            )
             state = HOTEL
             header_done = True
             continue
 
         # Ticket section
-        if re.match(r'\s*TICKET NUMBER/S:', line):
+        if rx.match(r'\s*TICKET NUMBER/S:', line):
             if current_flight:
                 data["flights"].append(current_flight)
                 current_flight = None
@@ -355,17 +599,17 @@ def parse(pdf_path: str) -> dict:
             continue
 
         # Baggage
-        if re.match(r'BAGGAGE ALLOWANCE', line):
+        if rx.match(r'BAGGAGE ALLOWANCE', line):
             state = BAGGAGE
             continue
 
         # Carry on
-        if re.match(r'CARRY ON ALLOWANCE', line):
+        if rx.match(r'CARRY ON ALLOWANCE', line):
             state = CARRY_ON
             continue
 
         # Financial markers
-        if re.match(r'AIR FARE USD|^\s*SUB TOTAL', line) and state != FINANCIAL:
+        if rx.match(r'AIR FARE USD|^\s*SUB TOTAL', line) and state != FINANCIAL:
             state = FINANCIAL
             # Don't continue — process this line below
 
@@ -378,7 +622,7 @@ def parse(pdf_path: str) -> dict:
             # LASTNAME/FIRSTNAME shape ("M" as last name, "/M NAME" as first),
             # which is what previously caused it to be captured as a third
             # passenger.
-            if re.match(r'^\s*M/M\s+', line):
+            if rx.match(r'^\s*M/M\s+', line):
                 data["mailing_address"].append(line.strip())
                 continue
 
@@ -388,20 +632,20 @@ def parse(pdf_path: str) -> dict:
             # full, not just match "LIN" and silently fail (which used to
             # send the whole line into mailing_address instead, and drop the
             # passenger entirely).
-            pax = re.match(r'^\s*([A-Z]+(?:\s[A-Z]+)?)/([A-Z][A-Z ]+)$', line)
+            pax = rx.match(r'^\s*([A-Z]+(?:\s[A-Z]+)?)/([A-Z][A-Z ]+)$', line)
             if pax:
                 last, first_mid = pax.group(1), pax.group(2).strip()
                 parts = first_mid.split()
-                data["passengers"].append({
-                    "last_name": last,
-                    "first_name": parts[0] if parts else "",
-                    "middle_name": " ".join(parts[1:]) if len(parts) > 1 else "",
-                    "full_slash": f"{last}/{first_mid}",
-                })
+                data["passengers"].append(Passenger(
+                    last_name=last,
+                    first_name=parts[0] if parts else "",
+                    middle_name=" ".join(parts[1:]) if len(parts) > 1 else "",
+                    full_slash=f"{last}/{first_mid}",
+                ))
                 continue
 
             # ITIN header: SALES PERSON line
-            sp = re.match(r'SALES PERSON:\s*(\S+)\s+ITIN\s*/\s*INVOICE NO\.?\s+(\d+).*?DATE:(.+?)$', line)
+            sp = rx.match(r'SALES PERSON:\s*(\S+)\s+ITIN\s*/\s*INVOICE NO\.?\s+(\d+).*?DATE:(.+?)$', line)
             if sp:
                 data["booking"]["sales_person"] = sp.group(1)
                 data["booking"]["itin_no"] = sp.group(2)
@@ -409,26 +653,26 @@ def parse(pdf_path: str) -> dict:
                 continue
 
             # CUSTOMER NBR
-            cn = re.match(r'CUSTOMER NBR:\s*(\S+)', line)
+            cn = rx.match(r'CUSTOMER NBR:\s*(\S+)', line)
             if cn:
                 data["booking"]["customer_nbr"] = cn.group(1)
                 continue
 
             # TIPITIN booking line
-            bk = re.search(r'ITIN NO:\s*(\d+)', line)
+            bk = rx.search(r'ITIN NO:\s*(\d+)', line)
             if bk:
                 data["booking"]["itin_no"] = bk.group(1)
-                rec = re.search(r'RECORD LOCATOR:\s*(\S+)', line)
+                rec = rx.search(r'RECORD LOCATOR:\s*(\S+)', line)
                 if rec:
                     data["booking"]["record_locator"] = rec.group(1)
-                dt = re.search(r'DATE:\s*(.+?)$', line)
+                dt = rx.search(r'DATE:\s*(.+?)$', line)
                 if dt:
                     data["booking"]["date"] = dt.group(1).strip()
                 header_done = True
                 continue
 
             # TO: address block (ITIN format)
-            if re.match(r'\s*TO:\s', line):
+            if rx.match(r'\s*TO:\s', line):
                 addr = line.replace("TO:", "").strip()
                 if addr:
                     data["mailing_address"].append(addr)
@@ -437,21 +681,21 @@ def parse(pdf_path: str) -> dict:
 
             # FOR: passenger block (ITIN format) — same suffix/two-word
             # last-name allowance as the TIPITIN passenger regex above.
-            pax_for = re.match(r'\s*(?:FOR:\s*)?([A-Z]+(?:\s[A-Z]+)?)/([A-Z][A-Z ]+)$', line)
-            if pax_for and "FOR:" in line or (data["passengers"] and re.match(r'\s+[A-Z]+/[A-Z]', line)):
+            pax_for = rx.match(r'\s*(?:FOR:\s*)?([A-Z]+(?:\s[A-Z]+)?)/([A-Z][A-Z ]+)$', line)
+            if pax_for and "FOR:" in line or (data["passengers"] and rx.match(r'\s+[A-Z]+/[A-Z]', line)):
                 last, first_mid = pax_for.group(1), pax_for.group(2).strip()
                 parts = first_mid.split()
-                data["passengers"].append({
-                    "last_name": last,
-                    "first_name": parts[0] if parts else "",
-                    "middle_name": " ".join(parts[1:]) if len(parts) > 1 else "",
-                    "full_slash": f"{last}/{first_mid}",
-                })
+                data["passengers"].append(Passenger(
+                    last_name=last,
+                    first_name=parts[0] if parts else "",
+                    middle_name=" ".join(parts[1:]) if len(parts) > 1 else "",
+                    full_slash=f"{last}/{first_mid}",
+                ))
                 continue
 
             # Mailing address lines (plain text between passengers and booking)
             stripped = line.strip()
-            if stripped and not re.match(r'^\s*$', line):
+            if stripped and not rx.match(r'^\s*$', line):
                 data["mailing_address"].append(stripped)
                 continue
 
@@ -459,7 +703,7 @@ def parse(pdf_path: str) -> dict:
             # Departure — spacing before the time varies by invoice (single
             # vs double space); the lazy .+? backtracks correctly either way
             # since it keeps expanding until it finds a real time-like suffix.
-            dep = re.search(r'LV:\s+(.+?)\s+(\d+[AP])', line)
+            dep = rx.search(r'LV:\s+(\S.*?)(?<=\S)\s+(\d+[AP])', line)
             if dep:
                 current_flight["departure_city"] = dep.group(1).strip()
                 current_flight["departure_time"] = dep.group(2)
@@ -470,7 +714,7 @@ def parse(pdf_path: str) -> dict:
                 continue
 
             # Arrival (TIPITIN: ARR:, ITIN: AR:)
-            arr = re.search(r'AR[R]?:\s+(.+?)\s+(\d+[AP])', line)
+            arr = rx.search(r'AR[R]?:\s+(\S.*?)(?<=\S)\s+(\d+[AP])', line)
             if arr:
                 current_flight["arrival_city"] = arr.group(1).strip()
                 current_flight["arrival_time"] = arr.group(2)
@@ -478,37 +722,37 @@ def parse(pdf_path: str) -> dict:
                     current_flight["confirmed"] = True
                 if "NON-STOP" in line or "NONSTOP" in line:
                     current_flight["nonstop"] = True
-                nxt = re.search(r'ARRIVES-\s*(\d+ [A-Z]+)', line)
+                nxt = rx.search(r'ARRIVES-\s*(\d+ [A-Z]+)', line)
                 if nxt:
                     current_flight["arrives_next_day"] = nxt.group(1)
                 continue
 
             # Duration (both formats)
-            dur = re.search(r'(?:FLIGHT TIME -|ELAPSED TIME-)\s*(.+?)(?:\s{2,}|$)', line)
+            dur = rx.search(r'(?:FLIGHT TIME -|ELAPSED TIME-)\s*(.+?)(?:\s{2,}|$)', line)
             if dur:
                 current_flight["duration"] = dur.group(1).strip()
-                bag = re.search(r'BAGGAGE ALLOWANCE - (\S+)', line)
+                bag = rx.search(r'BAGGAGE ALLOWANCE - (\S+)', line)
                 if bag:
                     current_flight["baggage_allowance"] = bag.group(1)
                 continue
 
             # Equipment (ITIN)
-            eq = re.match(r'\s+EQUIP-(\S+)', line)
+            eq = rx.match(r'\s+EQUIP-(\S+)', line)
             if eq:
                 current_flight["equipment"] = eq.group(1)
-                dur2 = re.search(r'ELAPSED TIME-\s*(.+?)$', line)
+                dur2 = rx.search(r'ELAPSED TIME-\s*(.+?)$', line)
                 if dur2:
                     current_flight["duration"] = dur2.group(1).strip()
                 continue
 
             # Operated by
-            op = re.search(r'OPERATED BY-(.+)', line)
+            op = rx.search(r'OPERATED BY-(.+)', line)
             if op:
                 current_flight["operated_by"] = op.group(1).strip()
                 continue
 
             # Seats (TIPITIN: SEAT ASSIGNED xxx NON SMOKING)
-            seat = re.search(r'SEAT ASSIGNED\s+(\S+)', line)
+            seat = rx.search(r'SEAT ASSIGNED\s+(\S+)', line)
             if seat:
                 current_flight["seats"].append(seat.group(1))
                 if "CONFIRMED" in line:
@@ -516,37 +760,37 @@ def parse(pdf_path: str) -> dict:
                 continue
 
             # Continuation seat line
-            cont_seat = re.match(r'^\s{10,}(\S+)\s+NON SMOKING', line)
+            cont_seat = rx.match(r'^\s{10,}(\S+)\s+NON SMOKING', line)
             if cont_seat:
                 current_flight["seats"].append(cont_seat.group(1))
                 continue
 
             # Continuation seat without NON SMOKING (Forbes: "04F" alone)
-            cont_seat2 = re.match(r'^\s{10,}(\d+[A-Z])\s*$', line)
+            cont_seat2 = rx.match(r'^\s{10,}(\d+[A-Z])\s*$', line)
             if cont_seat2:
                 current_flight["seats"].append(cont_seat2.group(1))
                 continue
 
             # Seats (ITIN: RESERVED SEATS SEAT- 3E 3F)
-            rseat = re.search(r'RESERVED SEATS\s+SEAT-\s*(.+?)$', line)
+            rseat = rx.search(r'RESERVED SEATS\s+SEAT-\s*(.+?)$', line)
             if rseat:
                 seats_str = rseat.group(1).strip()
                 if seats_str:
                     current_flight["seats"].extend(seats_str.split())
                 continue
             # RESERVED SEATS alone (no seat numbers)
-            if re.match(r'\s+RESERVED SEATS\s*$', line):
+            if rx.match(r'\s+RESERVED SEATS\s*$', line):
                 continue
 
             # Meals
-            meal = re.search(r'MEALS SERVED\s+(.+?)$', line)
+            meal = rx.search(r'MEALS SERVED\s+(.+?)$', line)
             if meal:
                 current_flight["meals"] = meal.group(1).strip()
                 continue
 
             # Terminals
-            dep_t = re.search(r'DEPART - (TERMINAL\s+\S+)', line)
-            arr_t = re.search(r'ARRIVE - (TERMINAL\s+\S+)', line)
+            dep_t = rx.search(r'DEPART - (TERMINAL\s+\S+)', line)
+            arr_t = rx.search(r'ARRIVE - (TERMINAL\s+\S+)', line)
             if dep_t:
                 current_flight["dep_terminal"] = dep_t.group(1).strip()
             if arr_t:
@@ -555,21 +799,21 @@ def parse(pdf_path: str) -> dict:
                 continue
 
             # Airline locator (TIPITIN)
-            loc = re.search(r'AIRLINE LOCATOR:\s*(\S+)\s*-(\S+)', line)
+            loc = rx.search(r'AIRLINE LOCATOR:\s*(\S+)\s*-(\S+)', line)
             if loc:
                 current_flight["airline_locator_carrier"] = loc.group(1)
                 current_flight["airline_locator_code"] = loc.group(2)
                 continue
 
             # Airline confirmation (ITIN)
-            conf = re.search(r'AIRLINE CONFIRMATION:\s*(\S+)\s*-(\S+)', line)
+            conf = rx.search(r'AIRLINE CONFIRMATION:\s*(\S+)\s*-(\S+)', line)
             if conf:
                 current_flight["airline_locator_carrier"] = conf.group(1)
                 current_flight["airline_locator_code"] = conf.group(2)
                 continue
 
             # Frequent flyer
-            ff = re.search(r'FREQ FLYER:\s*(.+?)\s+([A-Z]{2})\s{2,}(\S+)', line)
+            ff = rx.search(r'FREQ FLYER:\s*(\S.*?)(?<=\S)\s+([A-Z]{2})\s{2,}(\S+)', line)
             if ff:
                 entry = {"passenger": ff.group(1).strip(),
                          "airline": ff.group(2), "number": ff.group(3)}
@@ -578,12 +822,12 @@ def parse(pdf_path: str) -> dict:
                 continue
 
             # Wheelchair
-            if re.search(r'WHEELCHAIR', line):
+            if rx.search(r'WHEELCHAIR', line):
                 current_flight["wheelchair"] = True
                 continue
 
             # Service fees
-            sf = re.search(r'SERVICE FEES?\s+USD\s+([\d.]+)', line)
+            sf = rx.search(r'SERVICE FEES?\s+USD\s+([\d.]+)', line)
             if sf:
                 data["service_fee"] = sf.group(1)
                 state = NOTICES  # usually followed by notices
@@ -595,20 +839,20 @@ def parse(pdf_path: str) -> dict:
             # rather than lost. Skips lines that are clearly just a
             # label with nothing after it (nothing worth keeping).
             stripped = line.strip()
-            if stripped and not re.match(r'^[A-Z ]+:$', stripped):
+            if stripped and not rx.match(r'^[A-Z ]+:$', stripped):
                 current_flight.setdefault("notes", []).append(stripped)
                 continue
 
         elif state == CAR and current_car:
             # Pickup — "PICK UP-20AUG RALEIGH-DURHAM INTL AP"
-            pu = re.match(r'\s*PICK UP-(\S+)\s+(.+)$', line)
+            pu = rx.match(r'\s*PICK UP-(\S+)\s+(.+)$', line)
             if pu:
                 current_car["pickup_date"] = pu.group(1)
                 current_car["pickup_location"] = pu.group(2).strip()
                 continue
 
             # Dropoff — "DROP-22AUG" (location isn't always repeated)
-            do = re.match(r'\s*DROP-(\S+)\s*(.*)$', line)
+            do = rx.match(r'\s*DROP-(\S+)\s*(.*)$', line)
             if do:
                 current_car["dropoff_date"] = do.group(1)
                 if do.group(2).strip():
@@ -616,13 +860,13 @@ def parse(pdf_path: str) -> dict:
                 continue
 
             # Rate — "RATE- 49.52 WEEKEND GUARANTEED EXTRA DAY-49.52"
-            rt = re.search(r'RATE-\s*([\d.]+)', line)
+            rt = rx.search(r'RATE-\s*([\d.]+)', line)
             if rt:
                 current_car["rate"] = rt.group(1)
                 continue
 
             # Confirmation — "CONFIRMATION-L673EAD06B9 GOLD"
-            cf = re.match(r'\s*CONFIRMATION-(\S+)\s*(.*)$', line)
+            cf = rx.match(r'\s*CONFIRMATION-(\S+)\s*(.*)$', line)
             if cf:
                 current_car["confirmation"] = cf.group(1)
                 continue
@@ -638,14 +882,14 @@ def parse(pdf_path: str) -> dict:
 
         elif state == HOTEL and current_hotel:
             # Hotel name + guarantee
-            nm = re.search(r'^\s*(.+?)\s{2,}GUARANTEE-(.+?)$', line)
+            nm = rx.search(r'^\s*(\S.*?)(?<=\S)\s{2,}GUARANTEE-(.+?)$', line)
             if nm:
                 current_hotel["name"] = nm.group(1).strip()
                 current_hotel["guarantee"] = nm.group(2).strip()
                 continue
 
             # Address + rate
-            addr_rate = re.search(r'^\s+(.+?)\s{2,}RATE-\s*(\S+)\s+([\d.]+)', line)
+            addr_rate = rx.search(r'^\s+(\S.*?)(?<=\S)\s{2,}RATE-\s*(\S+)\s+([\d.]+)', line)
             if addr_rate:
                 current_hotel["address"] = addr_rate.group(1).strip()
                 current_hotel["rate_currency"] = addr_rate.group(2)
@@ -653,7 +897,7 @@ def parse(pdf_path: str) -> dict:
                 continue
 
             # Address + rate (amount then currency, e.g. "RATE- 383.00EUR PER NIGHT")
-            addr_rate_alt = re.search(r'^\s+(.+?)\s+RATE-\s*([\d.]+)([A-Z]{3})\s+PER NIGHT', line)
+            addr_rate_alt = rx.search(r'^\s+(\S.*?)(?<=\S)\s+RATE-\s*([\d.]+)([A-Z]{3})\s+PER NIGHT', line)
             if addr_rate_alt:
                 current_hotel["address"] = addr_rate_alt.group(1).strip()
                 current_hotel["rate_amount"] = addr_rate_alt.group(2)
@@ -665,26 +909,26 @@ def parse(pdf_path: str) -> dict:
             # left blank rather than guessed, since the invoice genuinely
             # doesn't say (and the local currency at a foreign property may
             # not be USD).
-            addr_rate_nocur = re.search(r'^\s+(.+?)\s+RATE-\s*([\d.]+)\s+PER NIGHT', line)
+            addr_rate_nocur = rx.search(r'^\s+(\S.*?)(?<=\S)\s+RATE-\s*([\d.]+)\s+PER NIGHT', line)
             if addr_rate_nocur:
                 current_hotel["address"] = addr_rate_nocur.group(1).strip()
                 current_hotel["rate_amount"] = addr_rate_nocur.group(2)
                 continue
 
             # Simple address line (hotels without chain prefix)
-            if re.match(r'^\s+\d+\s+', line) and not current_hotel.get("address"):
+            if rx.match(r'^\s+\d+\s+', line) and not current_hotel.get("address"):
                 current_hotel["address"] = line.strip()
                 continue
 
             # City line
-            city = re.match(r'^\s+([A-Z].*?(?:CA|FL|AZ|US|UK|AU))\s', line)
+            city = rx.match(r'^\s+([A-Z].*?(?:CA|FL|AZ|US|UK|AU))\s', line)
             if city and not current_hotel.get("city"):
                 current_hotel["city"] = city.group(1).strip()
                 continue
 
             # Phone/fax
-            phone = re.search(r'PHONE NO-(.+?)$', line)
-            fax = re.search(r'FAX NO-(.+?)\s{2,}', line)
+            phone = rx.search(r'PHONE NO-(.+?)$', line)
+            fax = rx.search(r'FAX NO-(.+?)\s{2,}', line)
             if phone:
                 current_hotel["phone"] = phone.group(1).strip()
             if fax:
@@ -694,8 +938,8 @@ def parse(pdf_path: str) -> dict:
 
             # Phone/fax without the "NO-" wording, e.g. "PHONE 351-222-443750
             # HOTEL FAX-351-222-443750"
-            phone_alt = re.search(r'(?<!HOTEL )PHONE\s+([\d\-+ ]+?)(?:\s{2,}|\s+HOTEL FAX|$)', line)
-            fax_alt = re.search(r'FAX-([\d\-+ ]+)', line)
+            phone_alt = rx.search(r'(?<!HOTEL )PHONE\s+([\d\-+ ]+?)(?:\s{2,}|\s+HOTEL FAX|$)', line)
+            fax_alt = rx.search(r'FAX-([\d\-+ ]+)', line)
             if phone_alt and not current_hotel.get("phone"):
                 current_hotel["phone"] = phone_alt.group(1).strip()
             if fax_alt and not current_hotel.get("fax"):
@@ -704,46 +948,46 @@ def parse(pdf_path: str) -> dict:
                 continue
 
             # Phone number without PHONE NO- prefix (e.g. Kurzrock "351 213 218 100")
-            simple_phone = re.match(r'^\s+(\d[\d\s-]+\d)\s{2,}RATE', line)
+            simple_phone = rx.match(r'^\s+(\d[\d\s-]+\d)\s{2,}RATE', line)
             if simple_phone:
                 current_hotel["phone"] = simple_phone.group(1).strip()
-                rate = re.search(r'RATE-\s*(\S+)\s+([\d.]+)', line)
+                rate = rx.search(r'RATE-\s*(\S+)\s+([\d.]+)', line)
                 if rate:
                     current_hotel["rate_currency"] = rate.group(1)
                     current_hotel["rate_amount"] = rate.group(2)
                 continue
 
             # Confirmation
-            cf = re.search(r'CONFIRMATION-(\S+)', line)
+            cf = rx.search(r'CONFIRMATION-(\S+)', line)
             if cf:
                 current_hotel["confirmation"] = cf.group(1)
                 continue
 
             # Confirmation, alternate abbreviated label seen in some invoices
             # ("CONF0-47725SG002999" instead of "CONFIRMATION-...")
-            cf_alt = re.match(r'\s*CONF[O0]?-(\S+)', line)
+            cf_alt = rx.match(r'\s*CONF[O0]?-(\S+)', line)
             if cf_alt and not current_hotel.get("confirmation"):
                 current_hotel["confirmation"] = cf_alt.group(1)
                 continue
 
             # Approx total
-            ttl = re.search(r'APPROX TTL.*?([\d.]+)(\w+)', line)
+            ttl = rx.search(r'APPROX TTL.*?(?<![\d.])([\d.]+)(\w+)', line)
             if ttl:
                 current_hotel["approx_total"] = f"{ttl.group(1)}{ttl.group(2)}"
                 continue
 
             # Cancel policy / notes
-            if re.search(r'CXL:|CANCEL|AAA', line):
+            if rx.search(r'CXL:|CANCEL|AAA', line):
                 current_hotel["notes"].append(line.strip())
                 continue
 
             # Room info
-            if re.match(r'^\s+\d+\s+BC-', line):
+            if rx.match(r'^\s+\d+\s+BC-', line):
                 current_hotel["room_info"] = line.strip()
                 continue
 
             # Rate status, guarantee on separate line
-            if re.search(r'RATESTATUS', line):
+            if rx.search(r'RATESTATUS', line):
                 continue
 
             # Generic catch-all — anything else inside a recognized HOTEL
@@ -761,10 +1005,10 @@ def parse(pdf_path: str) -> dict:
             d = current_cruise["details"]
 
             # Cruise vendor line: **PRINCESS CRUISES**/CF-MJ8X7W
-            vendor = re.search(r'\*\*(.+?)\*\*', line)
+            vendor = rx.search(r'\*\*(.+?)\*\*', line)
             if vendor:
                 d["vendor"] = vendor.group(1).strip()
-                cf = re.search(r'CF-(\S+)', line)
+                cf = rx.search(r'CF-(\S+)', line)
                 if cf:
                     d["confirmation"] = cf.group(1)
                 continue
@@ -772,25 +1016,25 @@ def parse(pdf_path: str) -> dict:
             # Total cost — TIPITIN style ("TOTAL COST USD 3673.90") or
             # dot-filled with no currency prefix ("TOTAL COST OF CRUISE.....
             # 10896.00")
-            tc = re.search(r'TOTAL COST\s+USD\s+([\d.]+)', line)
+            tc = rx.search(r'TOTAL COST\s+USD\s+([\d.]+)', line)
             if not tc:
-                tc = re.search(r'TOTAL COST(?:\s+OF\s+\S+)?\.{2,}\s*([\d.]+)', line)
+                tc = rx.search(r'TOTAL COST(?:\s+OF\s+\S+)?\.{2,}\s*([\d.]+)', line)
             if tc:
                 d["total_cost"] = tc.group(1)
                 continue
 
             # Payment already applied, e.g. "30JUN2026 PAYMENT BY VISA  USD  3673.90-"
-            pay = re.search(r'(\d{2}[A-Z]{3}(?:\d{2,4})?)\s+PAYMENT BY\s*(.*?)\s+USD\s+([\d.]+)-', line)
+            pay = rx.search(r'(\d{2}[A-Z]{3}(?:\d{2,4})?)\s+PAYMENT BY\s*(\S.*?)?(?<=\S)\s+USD\s+([\d.]+)-', line)
             if pay:
                 d.setdefault("payments", []).append({
-                    "date": pay.group(1), "method": pay.group(2).strip(),
+                    "date": pay.group(1), "method": (pay.group(2) or "").strip(),
                     "amount": pay.group(3),
                 })
                 continue
 
             # ITIN-style payment with no date and no "USD" —
             # "CREDIT CARD TO PROVIDER 10896.00-"
-            pay2 = re.search(r'CREDIT CARD TO PROVIDER\s+([\d.]+)-', line)
+            pay2 = rx.search(r'CREDIT CARD TO PROVIDER\s+([\d.]+)-', line)
             if pay2:
                 d.setdefault("payments", []).append({
                     "date": None, "method": "Credit Card",
@@ -799,7 +1043,7 @@ def parse(pdf_path: str) -> dict:
                 continue
 
             # Remaining balance, e.g. "BALANCE OF 2899.00 DUE 08JUL2026"
-            bal = re.search(r'BALANCE OF\s+([\d.]+)\s+DUE\s+(\S+)', line)
+            bal = rx.search(r'BALANCE OF\s+([\d.]+)\s+DUE\s+(\S+)', line)
             if bal:
                 d["balance_due"] = bal.group(1)
                 d["balance_due_date"] = bal.group(2)
@@ -823,7 +1067,7 @@ def parse(pdf_path: str) -> dict:
                 (r'RETURN\s*:\s*(\S+)', "return_date"),
                 (r'ADULT:\s*([\d.]+)\s*X\s*(\d+)', "per_person"),
             ]:
-                m = re.search(pattern, line)
+                m = rx.search(pattern, line)
                 if m:
                     d[key] = m.group(1).strip() if m.lastindex == 1 else m.groups()
                     matched_field = True
@@ -837,7 +1081,7 @@ def parse(pdf_path: str) -> dict:
             # the same way against bare numbers and financial lines.
             stripped = line.strip()
             if stripped:
-                looks_like_title = (re.match(r'^[A-Za-z]', stripped)
+                looks_like_title = (rx.match(r'^[A-Za-z]', stripped)
                                      and not stripped.upper().startswith("FARE"))
                 if not d.get("vendor") and looks_like_title:
                     d["vendor"] = stripped
@@ -859,13 +1103,13 @@ def parse(pdf_path: str) -> dict:
             current_tour.setdefault("raw_lines", []).append(line.strip())
 
             # Tour vendor line: **POSITANO CAR SERVICE**/AMT-550.00/CF-GAETA
-            vendor = re.search(r'\*\*(.+?)\*\*', line)
+            vendor = rx.search(r'\*\*(.+?)\*\*', line)
             if vendor:
                 current_tour["vendor"] = vendor.group(1).strip()
-                amt = re.search(r'AMT-([\d.]+)', line)
+                amt = rx.search(r'AMT-([\d.]+)', line)
                 if amt:
                     current_tour["amount"] = amt.group(1)
-                cf = re.search(r'CF-(\S+)', line)
+                cf = rx.search(r'CF-(\S+)', line)
                 if cf:
                     current_tour["confirmation"] = cf.group(1)
                 continue
@@ -873,26 +1117,26 @@ def parse(pdf_path: str) -> dict:
             # Total cost of the tour/package — TIPITIN style ("TOTAL COST
             # USD 3649.00") or ITIN style, dot-filled with no currency
             # prefix ("TOTAL COST OF TOUR.............. 503.47").
-            tc = re.search(r'TOTAL COST\s+USD\s+([\d.]+)', line)
+            tc = rx.search(r'TOTAL COST\s+USD\s+([\d.]+)', line)
             if not tc:
-                tc = re.search(r'TOTAL COST(?:\s+OF\s+\S+)?\.{2,}\s*([\d.]+)', line)
+                tc = rx.search(r'TOTAL COST(?:\s+OF\s+\S+)?\.{2,}\s*([\d.]+)', line)
             if tc:
                 current_tour["total_cost"] = tc.group(1)
                 continue
 
             # Payment already applied, e.g. "12JUN PAYMENT BY VISA  USD  750.00-"
             # (may or may not name a method between "PAYMENT BY" and the amount)
-            pay = re.search(r'(\d{2}[A-Z]{3})\s+PAYMENT BY\s*(.*?)\s+USD\s+([\d.]+)-', line)
+            pay = rx.search(r'(\d{2}[A-Z]{3})\s+PAYMENT BY\s*(\S.*?)?(?<=\S)\s+USD\s+([\d.]+)-', line)
             if pay:
                 current_tour.setdefault("payments", []).append({
-                    "date": pay.group(1), "method": pay.group(2).strip(),
+                    "date": pay.group(1), "method": (pay.group(2) or "").strip(),
                     "amount": pay.group(3),
                 })
                 continue
 
             # ITIN-style payment with no date and no "USD" —
             # "CREDIT CARD TO PROVIDER 503.47-"
-            pay2 = re.search(r'CREDIT CARD TO PROVIDER\s+([\d.]+)-', line)
+            pay2 = rx.search(r'CREDIT CARD TO PROVIDER\s+([\d.]+)-', line)
             if pay2:
                 current_tour.setdefault("payments", []).append({
                     "date": None, "method": "Credit Card",
@@ -902,7 +1146,7 @@ def parse(pdf_path: str) -> dict:
 
             # Remaining balance, e.g. "BALANCE OF 2899.00 DUE 08JUL2026" — this is
             # the authoritative "what's actually still owed" figure.
-            bal = re.search(r'BALANCE OF\s+([\d.]+)\s+DUE\s+(\S+)', line)
+            bal = rx.search(r'BALANCE OF\s+([\d.]+)\s+DUE\s+(\S+)', line)
             if bal:
                 current_tour["balance_due"] = bal.group(1)
                 current_tour["balance_due_date"] = bal.group(2)
@@ -912,7 +1156,7 @@ def parse(pdf_path: str) -> dict:
             # rather than reflecting payments already made — it's redundant/misleading
             # next to BALANCE OF, so we only keep the date (as a fallback if there's
             # no BALANCE OF line) and drop the confusing repeated amount.
-            td = re.search(r'TOTAL DUE:\s*[\d.]+\s+BY\s+(\S+)', line)
+            td = rx.search(r'TOTAL DUE:\s*[\d.]+\s+BY\s+(\S+)', line)
             if td:
                 current_tour.setdefault("balance_due_date", td.group(1))
                 continue
@@ -920,13 +1164,13 @@ def parse(pdf_path: str) -> dict:
             # "TYPE OF PKG: BACKROADS BELIZE & GUATEMALA MULTI ADVENTURE" — this
             # describes what the booking actually is (not always "transportation"),
             # so it's captured as its own field rather than dumped into details.
-            ty = re.search(r'TYPE OF PKG:\s*(.+)', line)
+            ty = rx.search(r'TYPE OF PKG:\s*(.+)', line)
             if ty:
                 current_tour["type"] = ty.group(1).strip()
                 continue
 
             # Tour detail lines
-            if re.search(r'PICK UP|DROP OFF', line):
+            if rx.search(r'PICK UP|DROP OFF', line):
                 current_tour["details"].append(line.strip())
                 continue
 
@@ -945,7 +1189,7 @@ def parse(pdf_path: str) -> dict:
             # nothing from inside a recognized TOUR block is ever silently
             # dropped, even if we can't confidently label it.
             if stripped:
-                looks_like_title = (re.match(r'^[A-Za-z]', stripped)
+                looks_like_title = (rx.match(r'^[A-Za-z]', stripped)
                                      and not stripped.upper().startswith("FARE"))
                 if not current_tour.get("vendor") and looks_like_title:
                     current_tour["vendor"] = stripped
@@ -956,35 +1200,35 @@ def parse(pdf_path: str) -> dict:
         elif state == PACKAGE and current_package:
             d = current_package["details"]
 
-            vendor = re.search(r'\*\*(.+?)\*\*', line)
+            vendor = rx.search(r'\*\*(.+?)\*\*', line)
             if vendor:
                 d["vendor"] = vendor.group(1).strip()
-                amt = re.search(r'AMT-([\d.]+)', line)
+                amt = rx.search(r'AMT-([\d.]+)', line)
                 if amt:
                     d["amount"] = amt.group(1)
-                cf = re.search(r'CF-(\S+)', line)
+                cf = rx.search(r'CF-(\S+)', line)
                 if cf:
                     d["confirmation"] = cf.group(1)
                 continue
 
             # Total cost of the package, e.g. "TOTAL COST   USD  5621.38"
-            tc = re.search(r'TOTAL COST\s+USD\s+([\d.]+)', line)
+            tc = rx.search(r'TOTAL COST\s+USD\s+([\d.]+)', line)
             if tc:
                 d["total_cost"] = tc.group(1)
                 continue
 
             # Payment already applied — collected as a list so multiple payments
             # (e.g. a deposit plus a final payment) don't overwrite each other.
-            pay = re.search(r'(\d{2}[A-Z]{3})\s+PAYMENT BY\s*(.*?)\s+USD\s+([\d.]+)-', line)
+            pay = rx.search(r'(\d{2}[A-Z]{3})\s+PAYMENT BY\s*(\S.*?)?(?<=\S)\s+USD\s+([\d.]+)-', line)
             if pay:
                 d.setdefault("payments", []).append({
-                    "date": pay.group(1), "method": pay.group(2).strip(),
+                    "date": pay.group(1), "method": (pay.group(2) or "").strip(),
                     "amount": pay.group(3),
                 })
                 continue
 
             # Remaining balance, e.g. "BALANCE OF 2899.00 DUE 08JUL2026"
-            bal = re.search(r'BALANCE OF\s+([\d.]+)\s+DUE\s+(\S+)', line)
+            bal = rx.search(r'BALANCE OF\s+([\d.]+)\s+DUE\s+(\S+)', line)
             if bal:
                 d["balance_due"] = bal.group(1)
                 d["balance_due_date"] = bal.group(2)
@@ -993,12 +1237,12 @@ def parse(pdf_path: str) -> dict:
             # "TOTAL DUE: X BY DATE" repeats TOTAL COST under a due date rather than
             # reflecting payments made — redundant next to BALANCE OF, so only the
             # date is kept (as a fallback), and the confusing repeated amount is dropped.
-            td = re.search(r'TOTAL DUE:\s*[\d.]+\s+BY\s+(\S+)', line)
+            td = rx.search(r'TOTAL DUE:\s*[\d.]+\s+BY\s+(\S+)', line)
             if td:
                 d.setdefault("balance_due_date", td.group(1))
                 continue
 
-            ty = re.search(r'TYPE OF PKG:\s*(.+)', line)
+            ty = rx.search(r'TYPE OF PKG:\s*(.+)', line)
             if ty:
                 d["type"] = ty.group(1).strip()
                 continue
@@ -1022,14 +1266,14 @@ def parse(pdf_path: str) -> dict:
             # used to force the regex to steal the ticket number's last
             # digit to satisfy it, silently truncating real ticket numbers
             # instead of just leaving the method blank.
-            tkt = re.search(r'([A-Z]+(?:\s[A-Z]+)?/[A-Z ]+?)\s+(\d{10,}(?:-\d+)?)\s*(?:(\S+\s*\S*?)\s+)?USD\s+([\d.]+)', line)
+            tkt = rx.search(r'(?<![A-Z])([A-Z]+(?:\s[A-Z]+)?/(?:[A-Z ]*?[A-Z])?)\s+(\d{10,}(?:-\d+)?)\s*(?:(\S+(?:\s+\S+)?)\s+)?USD\s+([\d.]+)', line)
             if tkt:
-                data["tickets"].append({
-                    "passenger": tkt.group(1).strip(),
-                    "ticket_number": tkt.group(2),
-                    "payment_method": (tkt.group(3) or "").strip(),
-                    "amount_usd": tkt.group(4),
-                })
+                data["tickets"].append(Ticket(
+                    passenger=tkt.group(1).strip(),
+                    ticket_number=tkt.group(2),
+                    payment_method=(tkt.group(3) or "").strip(),
+                    amount_usd=tkt.group(4),
+                ))
                 continue
 
             # ITIN: AIR TICKET/S  7401640949  AX CARD  3898.44
@@ -1044,28 +1288,28 @@ def parse(pdf_path: str) -> dict:
             # correctly leaves the method group as None rather than either
             # failing to match at all (losing the ticket) or misreading the
             # amount itself as the method.
-            itkt = re.search(r'AIR TICKET/S\s+(\d+(?:-\d+)?)\s+(?:([A-Z][A-Z ]*?)\s+)?([\d.]+)\s*$', line)
+            itkt = rx.search(r'AIR TICKET/S\s+(\d+(?:-\d+)?)\s+(?:([A-Z][A-Z ]*?)(?<=\S)\s+)?([\d.]+)\s*$', line)
             if itkt:
-                data["tickets"].append({
-                    "passenger": "",
-                    "ticket_number": itkt.group(1),
-                    "payment_method": (itkt.group(2) or "").strip(),
-                    "amount_usd": itkt.group(3),
-                })
+                data["tickets"].append(Ticket(
+                    passenger="",
+                    ticket_number=itkt.group(1),
+                    payment_method=(itkt.group(2) or "").strip(),
+                    amount_usd=itkt.group(3),
+                ))
                 continue
 
             # Exchanged ticket
-            if re.search(r'EXCHANGED FOR TICKET', line):
+            if rx.search(r'EXCHANGED FOR TICKET', line):
                 continue  # next line has the number
 
             # Exchange ticket number on continuation line
-            exch_num = re.match(r'\s+(\d{10,})', line)
+            exch_num = rx.match(r'\s+(\d{10,})', line)
             if exch_num:
                 data["exchanged_ticket"] = exch_num.group(1)
                 continue
 
             # Financial line encountered while in tickets
-            if re.match(r'AIR FARE USD|^\s*SUB TOTAL', line):
+            if rx.match(r'AIR FARE USD|^\s*SUB TOTAL', line):
                 state = FINANCIAL
                 # fall through to FINANCIAL processing below
 
@@ -1085,7 +1329,7 @@ def parse(pdf_path: str) -> dict:
                 (r'AMOUNT DUE\s+(?:USD\s+)?([\d.]+)(-)?', "amount_due"),
                 (r'TOTAL AMOUNT\s+([\d.]+)(-)?', "amount_due"),
             ]:
-                m = re.search(pattern, line)
+                m = rx.search(pattern, line)
                 if m:
                     value = m.group(1)
                     if m.group(2):
@@ -1093,19 +1337,19 @@ def parse(pdf_path: str) -> dict:
                     data["financial"][key] = value
                     break
             # Fare per person (ITIN)
-            fare = re.search(r'FARE\.+\s*([\d.]+)', line)
+            fare = rx.search(r'FARE\.+\s*([\d.]+)', line)
             if fare:
                 data["financial"]["fare_per_person"] = fare.group(1)
             continue
 
         elif state == BAGGAGE:
-            route = re.match(r'\s*([A-Z0-9]{2} [A-Z]{3,6})\s+(\d+PC)', line)
+            route = rx.match(r'\s*([A-Z0-9]{2} [A-Z]{3,6})\s+(\d+PC)', line)
             if route:
                 data["baggage"].append({
                     "route": route.group(1), "count": route.group(2), "bags": []
                 })
                 continue
-            bag = re.search(r'BAG (\d+) - (.+)', line)
+            bag = rx.search(r'BAG (\d+) - (.+)', line)
             if bag and data["baggage"]:
                 data["baggage"][-1]["bags"].append({
                     "bag_num": bag.group(1), "info": bag.group(2).strip()
@@ -1113,13 +1357,13 @@ def parse(pdf_path: str) -> dict:
                 continue
 
         elif state == CARRY_ON:
-            route = re.match(r'\s*([A-Z0-9]{2} [A-Z]{3,6})\s+(\d+PC)', line)
+            route = rx.match(r'\s*([A-Z0-9]{2} [A-Z]{3,6})\s+(\d+PC)', line)
             if route:
                 data["carry_on"].append({
                     "route": route.group(1), "count": route.group(2), "bags": []
                 })
                 continue
-            bag = re.search(r'BAG (\d+) - (.+)', line)
+            bag = rx.search(r'BAG (\d+) - (.+)', line)
             if bag and data["carry_on"]:
                 data["carry_on"][-1]["bags"].append({
                     "bag_num": bag.group(1), "info": bag.group(2).strip()
@@ -1127,48 +1371,48 @@ def parse(pdf_path: str) -> dict:
                 continue
 
         # ── Notices (can appear in any state) ─────────────────
-        notice = re.match(r'\s*\*\*\s*(.+?)\s*\*\*', line)
+        notice = rx.match(r'\s*\*\*(?:\s*(\S.*?)(?<=\S))?\s*\*\*', line)
         if notice:
-            text = notice.group(1).strip()
+            text = (notice.group(1) or "").strip()
             if text and text not in data["notices"] and len(text) > 5:
                 data["notices"].append(text)
             continue
 
         # Service fee (can appear in various states)
-        sf = re.search(r'SERVICE FEES?\s+USD\s+([\d.]+)', line)
+        sf = rx.search(r'SERVICE FEES?\s+USD\s+([\d.]+)', line)
         if sf:
             data["service_fee"] = sf.group(1)
             continue
 
         # Passport / restriction / baggage discount notices
-        if re.search(r'PASSPORT|NON.?REFUNDABLE|PENALTY.*CHANGE|BAGGAGE DISCOUNTS MAY|ONLINE CHECKIN/FORM OF PAYMENT', line):
+        if rx.search(r'PASSPORT|NON.?REFUNDABLE|PENALTY(?:(?!PENALTY).)*CHANGE|BAGGAGE DISCOUNTS MAY|ONLINE CHECKIN/FORM OF PAYMENT', line):
             stripped = line.strip()
             if stripped and stripped not in data["notices"]:
                 data["notices"].append(stripped)
             continue
 
         # FARE lines (ITIN format)
-        fare_line = re.search(r'FARE\.+\s*([\d.]+)', line)
+        fare_line = rx.search(r'FARE\.+\s*([\d.]+)', line)
         if fare_line:
             data["financial"]["fare_per_person"] = fare_line.group(1)
             # Capture fare note if present
-            note = re.search(r'PER PERSON\s*-?\s*(.+?)$', line)
+            note = rx.search(r'PER PERSON\s*-?\s*(.+?)$', line)
             if note:
                 data["financial"]["fare_note"] = note.group(1).strip()
             continue
 
         # ROUNDTRIP FARE note
-        rt = re.search(r'ROUNDTRIP FARE:\s*(.+?)$', line)
+        rt = rx.search(r'ROUNDTRIP FARE:\s*(.+?)$', line)
         if rt:
             data["financial"]["fare_note"] = rt.group(1).strip()
             continue
 
         # Standalone total amount (just a number on its own line)
-        if re.match(r'^\s+[\d.]+\s*$', line) and state in (TICKETS, FINANCIAL):
+        if rx.match(r'^\s+[\d.]+\s*$', line) and state in (TICKETS, FINANCIAL):
             continue  # total line, already captured elsewhere
 
         # Insurance lines
-        if re.search(r'ALLIANZ|TRAVEL GUARD|POLICY TYPE|INSURED TRIP|PREMIUM BASED|PAYMENT BY CREDIT CARD|INSURANCE COVERAGE|SICKNESS.BAGGAGE|TRIP CANCELLATION|PAYMENT BY CHECK', line):
+        if rx.search(r'ALLIANZ|TRAVEL GUARD|POLICY TYPE|INSURED TRIP|PREMIUM BASED|PAYMENT BY CREDIT CARD|INSURANCE COVERAGE|SICKNESS.BAGGAGE|TRIP CANCELLATION|PAYMENT BY CHECK', line):
             data["insurance"].append(line.strip())
             continue
 
@@ -1176,14 +1420,14 @@ def parse(pdf_path: str) -> dict:
         stripped = line.strip()
         if stripped and header_done:
             # Skip repeat header lines on page 2+ (ITIN format repeats header)
-            if re.search(r'SALES PERSON:|CUSTOMER NBR:', line):
+            if rx.search(r'SALES PERSON:|CUSTOMER NBR:', line):
                 continue
-            if re.match(r'\s*TO:\s', line):
+            if rx.match(r'\s*TO:\s', line):
                 continue
-            if re.match(r'\s*FOR:\s', line):
+            if rx.match(r'\s*FOR:\s', line):
                 continue
             # Skip passenger lines that appear in repeated headers
-            if re.match(r'\s+[A-Z]+/[A-Z]', line) and any(
+            if rx.match(r'\s+[A-Z]+/[A-Z]', line) and any(
                 p["full_slash"] in line for p in data["passengers"]
             ):
                 continue
@@ -1195,10 +1439,18 @@ def parse(pdf_path: str) -> dict:
             # carries no actual content — nothing was lost by not capturing
             # it, so it shouldn't count as an unrecognized/unknown-content
             # line.
-            if re.match(r'^[A-Z0-9 /\-]+:$', stripped):
+            if rx.match(r'^[A-Z0-9 /\-]+:$', stripped):
                 continue
             data["unrecognized"].append(f"L{line_num}: {stripped}")
 
+    if header_only:
+        # Whatever segment the last header line opened is left unread
+        data["header_only"] = True
+        data["warnings"] = _validate(data)
+        if profiler is not None:
+            data["profile"] = profiler.as_dict()
+        return data
+
     # ── Flush pending items ───────────────────────────────────
     if current_flight:
         data["flights"].append(current_flight)
@@ -1226,6 +1478,8 @@ def parse(pdf_path: str) -> dict:
 
     # ── Validate must-haves ───────────────────────────────────
     data["warnings"] = _validate(data)
+    if profiler is not None:
+        data["profile"] = profiler.as_dict()
 
     return data
 
@@ -1281,12 +1535,14 @@ if __name__ == "__main__":
     import json
     import sys
 
-    path = sys.argv[1] if len(sys.argv) > 1 else None
+    args = [a for a in sys.argv[1:] if a not in ("--profile", "--header-only")]
+    path = args[0] if args else None
     if not path:
-        print("Usage: python state_parser.py <invoice.pdf>")
+        print("Usage: python state_parser.py <invoice.pdf> [--profile] [--header-only]")
         sys.exit(1)
 
-    result = parse(path)
+    result = parse(path, profile=True if "--profile" in sys.argv else None,
+                   header_only="--header-only" in sys.argv)
 
     # Print summary
     print(f"Format: {result['format']}")
@@ -1310,4 +1566,8 @@ if __name__ == "__main__":
     if result["unrecognized"]:
         print(f"\n? UNRECOGNIZED LINES ({len(result['unrecognized'])}):")
         for u in result["unrecognized"][:20]:
-            print(f"  {u}")
\ No newline at end of file
+            print(f"  {u}")
+
+    if result.get("profile"):
+        print()
+        print(format_profile(result["profile"]))
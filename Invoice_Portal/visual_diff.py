@@ -0,0 +1,286 @@
+"""
+visual_diff.py — Did the overlay hide anything on the original invoice?
+
+The plain copy is the original PDF with overlay.pdf stamped on top (and
+backside.pdf appended). Anything the stamp covers that had ink on the
+original — a line of itinerary, a total, a confirmation number — is
+content the customer never sees. This rasterizes both pages in
+grayscale and flags pixels that were dark on the original and differ on
+the stamped copy; content the overlay ADDS on white paper (the logo,
+the footer) is expected and ignored.
+
+Used two ways:
+  * CompareViewer's Diff toggle tints hidden content red on the
+    processed page (highlight_ppm).
+  * score_folder() scores every original/plain pair in a processed
+    folder so reviewers only open the ones that come back flagged. A
+    bulk export the batch split into invoices is scored invoice by
+    invoice, against each part's plain copy:
+
+        python visual_diff.py <source_folder>
+"""
+
+import os
+import sys
+import json
+
+import numpy as np
+
+try:
+    import fitz
+except ImportError as e:
+    print(f"Missing dependency: {e}")
+    print("pip install PyMuPDF")
+    sys.exit(1)
+
+
+DIFF_ZOOM   = 1.0   # 72 dpi — plenty to see a covered line of 8pt text
+INK_LEVEL   = 200   # gray below this on the original counts as content
+TOLERANCE   = 48    # gray-level change that counts as "different"
+BLOCK       = 4     # hidden pixels are counted in BLOCK x BLOCK cells...
+BLOCK_MIN   = 3     # ...a cell needs this many to count (anti-alias noise)
+FLAG_BLOCKS = 2     # a page with at least this many hidden cells is flagged
+
+HIGHLIGHT_RGB = np.array([230, 0, 0], dtype=np.float32)
+
+PLAIN_FOLDER   = "processed_invoices_plain"
+REPORT_FILENAME = "visual_diff_report.json"
+
+
+# ---------------------------------------------------------------------------
+# Rasterizing
+# ---------------------------------------------------------------------------
+def _pixmap_array(page, zoom, colorspace):
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom),
+                          colorspace=colorspace, alpha=False)
+    arr = np.frombuffer(pix.samples, dtype=np.uint8)
+    # Rows can be padded past width * n — reshape by stride, then crop
+    arr = arr.reshape(pix.height, pix.stride)[:, :pix.width * pix.n]
+    return arr.reshape(pix.height, pix.width, pix.n) if pix.n > 1 \
+           else arr.reshape(pix.height, pix.width)
+
+
+def page_gray(page, zoom=DIFF_ZOOM):
+    return _pixmap_array(page, zoom, fitz.csGRAY)
+
+
+# ---------------------------------------------------------------------------
+# Masks
+# ---------------------------------------------------------------------------
+def _same_shape(a, b):
+    """Crop both to their common size — a stamped page can come out one
+    pixel taller or wider from rounding."""
+    h = min(a.shape[0], b.shape[0])
+    w = min(a.shape[1], b.shape[1])
+    return a[:h, :w], b[:h, :w]
+
+
+def hidden_mask(orig_gray, proc_gray):
+    """True where the original had ink and the processed page differs."""
+    o, p = _same_shape(orig_gray, proc_gray)
+    diff = np.abs(o.astype(np.int16) - p.astype(np.int16)) > TOLERANCE
+    return (o < INK_LEVEL) & diff
+
+
+def _blocks(mask):
+    """BLOCK x BLOCK cell counts of a boolean mask, as a 2-D int array."""
+    h = mask.shape[0] - mask.shape[0] % BLOCK
+    w = mask.shape[1] - mask.shape[1] % BLOCK
+    m = mask[:h, :w].reshape(h // BLOCK, BLOCK, w // BLOCK, BLOCK)
+    return m.sum(axis=(1, 3))
+
+
+def score_page(orig_page, proc_page, zoom=DIFF_ZOOM) -> dict:
+    o = page_gray(orig_page, zoom)
+    p = page_gray(proc_page, zoom)
+    hidden = _blocks(hidden_mask(o, p)) >= BLOCK_MIN
+    ink    = _blocks(o < INK_LEVEL) >= BLOCK_MIN
+    n_hidden = int(hidden.sum())
+    result = {"hidden_blocks": n_hidden, "ink_blocks": int(ink.sum())}
+    if n_hidden:
+        rows, cols = np.nonzero(hidden)
+        scale = BLOCK / zoom     # cells → PDF points
+        result["bbox"] = [round(float(cols.min()) * scale, 1),
+                          round(float(rows.min()) * scale, 1),
+                          round(float(cols.max() + 1) * scale, 1),
+                          round(float(rows.max() + 1) * scale, 1)]
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Highlighted render (CompareViewer's Diff toggle)
+# ---------------------------------------------------------------------------
+def highlight_ppm(orig_doc, proc_doc, page_num, zoom):
+    """
+    The processed page at zoom as (ppm_bytes, w, h) — the same shape
+    compare_view caches — with content hidden by the stamp tinted red.
+    Pages past the end of the original (the backside) come back as-is.
+    """
+    proc_page = proc_doc[page_num]
+    rgb = _pixmap_array(proc_page, zoom, fitz.csRGB)
+    if page_num < len(orig_doc):
+        mask = hidden_mask(page_gray(orig_doc[page_num], zoom),
+                           page_gray(proc_page, zoom))
+        # Grow each hidden cell to the whole cell so thin strokes show
+        cells = _blocks(mask) >= BLOCK_MIN
+        grown = np.repeat(np.repeat(cells, BLOCK, axis=0), BLOCK, axis=1)
+        full = np.zeros(rgb.shape[:2], dtype=bool)
+        full[:grown.shape[0], :grown.shape[1]] = grown[:full.shape[0], :full.shape[1]]
+        if full.any():
+            rgb = rgb.copy()
+            rgb[full] = (rgb[full] * 0.35 + HIGHLIGHT_RGB * 0.65).astype(np.uint8)
+    h, w = rgb.shape[:2]
+    header = f"P6\n{w} {h}\n255\n".encode("ascii")
+    return header + np.ascontiguousarray(rgb).tobytes(), w, h
+
+
+# ---------------------------------------------------------------------------
+# Headless scoring
+# ---------------------------------------------------------------------------
+def score_pair(orig_path, proc_path, zoom=DIFF_ZOOM, first=0, last=None) -> dict:
+    """Score every page of orig_path against the same page of proc_path.
+    flagged is True if any page has FLAG_BLOCKS or more hidden cells, or
+    the processed copy is missing pages. first/last (0-based, inclusive)
+    score just those pages of orig_path — one invoice of a bulk export —
+    against proc_path from its first page; page numbers in the result
+    are the original's."""
+    result = {"original": orig_path, "processed": proc_path,
+              "pages": [], "hidden_blocks": 0, "flagged": False, "reason": ""}
+    with fitz.open(orig_path) as orig, fitz.open(proc_path) as proc:
+        if last is None:
+            last = len(orig) - 1
+        count = last - first + 1
+        if first or last != len(orig) - 1:
+            result["original_pages"] = [first + 1, last + 1]
+        if len(proc) < count:
+            result["flagged"] = True
+            result["reason"] = (f"processed copy has {len(proc)} page(s), "
+                                f"original has {count}")
+        for i in range(min(count, len(proc))):
+            page = score_page(orig[first + i], proc[i], zoom)
+            page["page"] = first + i + 1
+            result["pages"].append(page)
+            result["hidden_blocks"] += page["hidden_blocks"]
+            if page["hidden_blocks"] >= FLAG_BLOCKS and not result["flagged"]:
+                result["flagged"] = True
+                result["reason"] = f"content hidden on page {first + i + 1}"
+    return result
+
+
+def _invoices(src):
+    """[(first_page, last_page, text of first_page, plain name when not
+    renamed)] — one entry for an ordinary PDF, one per invoice for a bulk
+    export, found the way invoice_pipeline splits it."""
+    from invoice_splitter import may_hold_several, iter_ranges, part_name
+
+    name = os.path.basename(src)
+    with fitz.open(src) as doc:
+        if not len(doc):
+            return [(0, -1, "", name)]
+        text = doc[0].get_text("text")
+        ranges = list(iter_ranges(doc)) if may_hold_several(doc, text) else []
+        if len(ranges) < 2:
+            return [(0, len(doc) - 1, text, name)]
+        return [(first, last, doc[first].get_text("text"),
+                 part_name(name, index, invoice_no))
+                for index, (first, last, invoice_no) in enumerate(ranges, 1)]
+
+
+def _plain_candidates(text, fallback_name, plain_dir):
+    """
+    Names process_pdfs() could have given the plain copy of the invoice
+    whose first page reads text: the build_filename() name (plus its
+    " (2)", " (3)" collision variants), or fallback_name (the original
+    filename, or a split invoice's part name) when the fields couldn't
+    be extracted.
+    """
+    from invoice_processor import detect_format, extract_fields, build_filename
+
+    fmt = detect_format(text)
+    names = []
+    if fmt:
+        agent, invoice_no, last_name = extract_fields(text, fmt)
+        if invoice_no and last_name:
+            name = build_filename(agent, invoice_no, last_name)
+            base, ext = os.path.splitext(name)
+            names.append(name)
+            counter = 2
+            while os.path.exists(os.path.join(plain_dir, f"{base} ({counter}){ext}")):
+                names.append(f"{base} ({counter}){ext}")
+                counter += 1
+    names.append(fallback_name)
+    return [os.path.join(plain_dir, n) for n in names
+            if os.path.exists(os.path.join(plain_dir, n))]
+
+
+def score_folder(source_folder, plain_dir=None, zoom=DIFF_ZOOM,
+                 progress=None) -> list:
+    """
+    Score every original PDF in source_folder against its plain copy.
+    When a name collided during processing ("... (2).pdf"), the candidate
+    with the fewest hidden cells is the real pair — a wrong pairing
+    differs almost everywhere. progress(done, total, name) is optional.
+
+    Returns one score_pair() dict per original, or per invoice of a
+    split bulk export (with "original_pages"); one with no plain copy
+    comes back flagged with reason "no plain copy found".
+    """
+    plain_dir = plain_dir or os.path.join(source_folder, PLAIN_FOLDER)
+    originals = sorted(f for f in os.listdir(source_folder)
+                       if f.lower().endswith(".pdf")
+                       and os.path.isfile(os.path.join(source_folder, f)))
+    results = []
+    for done, name in enumerate(originals, 1):
+        src = os.path.join(source_folder, name)
+        try:
+            invoices = _invoices(src)
+            for first, last, text, fallback in invoices:
+                candidates = _plain_candidates(text, fallback, plain_dir)
+                if not candidates:
+                    result = {"original": src, "processed": None, "pages": [],
+                              "hidden_blocks": 0, "flagged": True,
+                              "reason": "no plain copy found"}
+                    if len(invoices) > 1:
+                        result["original_pages"] = [first + 1, last + 1]
+                    results.append(result)
+                else:
+                    scored = [score_pair(src, c, zoom, first, last) for c in candidates]
+                    results.append(min(scored, key=lambda r: (r["flagged"],
+                                                              r["hidden_blocks"])))
+        except Exception as e:
+            results.append({"original": src, "processed": None, "pages": [],
+                            "hidden_blocks": 0, "flagged": True,
+                            "reason": f"could not score: {e}"})
+        if progress:
+            progress(done, len(originals), name)
+    return results
+
+
+def write_report(results, path):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"flagged": sum(1 for r in results if r["flagged"]),
+                   "total": len(results), "results": results}, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python visual_diff.py <source_folder> [plain_folder]")
+        sys.exit(1)
+    source = sys.argv[1]
+    plain  = sys.argv[2] if len(sys.argv) > 2 else None
+    results = score_folder(source, plain)
+    flagged = [r for r in results if r["flagged"]]
+    for r in flagged:
+        pages = r.get("original_pages")
+        where = f" (pages {pages[0]}-{pages[1]})" if pages else ""
+        print(f"FLAG  {os.path.basename(r['original'])}{where}: {r['reason']}")
+    report = os.path.join(plain or os.path.join(source, PLAIN_FOLDER),
+                          REPORT_FILENAME)
+    try:
+        write_report(results, report)
+        print(f"\n{len(flagged)} of {len(results)} flagged — report: {report}")
+    except OSError as e:
+        print(f"\n{len(flagged)} of {len(results)} flagged (report not saved: {e})")
+    sys.exit(1 if flagged else 0)